@@ -0,0 +1,53 @@
+"""
+Micro-benchmark: per-call overhead of connect-per-call vs pooled connections.
+Usage: python benchmarks/bench_connections.py [iterations]
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import database
+
+
+def legacy_get_creator_by_id(creator_id: int) -> dict:
+    """The pre-pool pattern: connect, create tables, check columns, query, close."""
+    conn = sqlite3.connect(str(database.DB_PATH))
+    conn.row_factory = sqlite3.Row
+    database.create_tables(conn)
+    conn.execute("PRAGMA table_info(videos)").fetchall()
+    try:
+        row = conn.execute("SELECT * FROM creators WHERE id = ?", (creator_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def bench(label: str, fn, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / iterations * 1e6:9.1f} us/call")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = Path(tmp) / "bench.db"
+        creator_id = database.add_creator('youtube', 'bench', 'https://youtube.com/@bench')
+
+        before = bench("connect-per-call (legacy)", lambda: legacy_get_creator_by_id(creator_id), iterations)
+        after = bench("pooled transaction()", lambda: database.get_creator_by_id.uncached(creator_id), iterations)
+        print(f"speedup: {before / after:.1f}x")
+        bench("query cache hit", lambda: database.get_creator_by_id(creator_id), iterations)
+
+        database.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Keyset pagination latency: first vs deep pages on 1k and 1M video libraries.
+Usage: python benchmarks/bench_feed_pagination.py [large_rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import database
+from bench_feed_queries import build
+
+
+def page_latencies(pages: int, page_size: int = 25, platform: str = None) -> list:
+    """Walk the feed and return ms per page."""
+    timings, cursor = [], None
+    for _ in range(pages):
+        start = time.perf_counter()
+        rows, cursor = database.get_outlier_page.uncached(
+            min_score=1.0, page_size=page_size, platform=platform, cursor=cursor
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        if cursor is None:
+            break
+    return timings
+
+
+def main():
+    large = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    for rows in (1_000, large):
+        with tempfile.TemporaryDirectory() as tmp:
+            database.DB_PATH = Path(tmp) / "bench.db"
+            build(rows, creators=max(10, rows // 1000))
+            for platform in (None, 'instagram'):
+                timings = page_latencies(pages=20, platform=platform)
+                print(
+                    f"{rows:>9,} videos  platform={platform or 'all':<9}"
+                    f"  page 1: {timings[0]:6.2f} ms"
+                    f"  page {len(timings)}: {timings[-1]:6.2f} ms"
+                    f"  mean: {sum(timings) / len(timings):6.2f} ms"
+                )
+            database.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
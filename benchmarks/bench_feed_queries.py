@@ -0,0 +1,85 @@
+"""
+Feed query timings on a synthetic database, with and without the feed indexes.
+Usage: python benchmarks/bench_feed_queries.py [rows] [creators]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import database
+
+FEED_INDEXES = [
+    'idx_videos_outlier_score', 'idx_videos_creator_score',
+    'idx_videos_creator_synced', 'idx_creators_platform',
+]
+
+
+def build(rows: int, creators: int):
+    rng = random.Random(42)
+    with database.transaction(write=True) as conn:
+        conn.executemany(
+            "INSERT INTO creators (platform, username, url) VALUES (?, ?, ?)",
+            [(rng.choice(['youtube', 'instagram']), f"creator{i}", f"https://example.com/{i}")
+             for i in range(creators)]
+        )
+        conn.executemany(
+            """INSERT INTO videos (creator_id, platform_video_id, title, view_count, outlier_score)
+               VALUES (?, ?, ?, ?, ?)""",
+            ((rng.randint(1, creators), f"v{i}", f"Video {i}", rng.randint(0, 10**6),
+              round(rng.lognormvariate(0, 0.8), 2))
+             for i in range(rows))
+        )
+    with database.transaction() as conn:
+        conn.execute("ANALYZE")
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_queries(label: str, creators: int):
+    rng = random.Random(7)
+    results = {
+        'get_all_outliers(2.0, 100)': timed(lambda: database.get_all_outliers.uncached(min_score=2.0, limit=100)),
+        'get_videos_for_creator(50)': timed(lambda: database.get_videos_for_creator.uncached(rng.randint(1, creators))),
+        'get_all_creators()': timed(database.get_all_creators.uncached, repeat=2),
+    }
+    for name, ms in results.items():
+        print(f"{label:<14} {name:<30} {ms:10.2f} ms")
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    creators = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = Path(tmp) / "bench.db"
+        start = time.perf_counter()
+        build(rows, creators)
+        print(f"built {rows:,} videos / {creators:,} creators in {time.perf_counter() - start:.1f}s\n")
+
+        indexed = run_queries("indexed", creators)
+
+        with database.transaction(write=True) as conn:
+            for name in FEED_INDEXES:
+                conn.execute(f"DROP INDEX {name}")
+        unindexed = run_queries("no indexes", creators)
+
+        print()
+        for name in indexed:
+            print(f"{name:<30} {unindexed[name] / indexed[name]:8.1f}x faster with indexes")
+
+        database.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
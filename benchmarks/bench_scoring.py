@@ -0,0 +1,64 @@
+"""
+Outlier scoring throughput: the old per-creator Python loop vs the
+vectorized scoring module, then a full-library rescore_creators() in SQLite.
+Usage: python benchmarks/bench_scoring.py [rows] [creators]
+"""
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import database
+from bench_feed_queries import build
+from scoring import METHODS, compute_scores
+
+
+def python_mean_scores(views, groups) -> list:
+    """The pre-vectorized approach: one pass per creator over Python lists."""
+    by_creator = defaultdict(list)
+    for i, group in enumerate(groups):
+        by_creator[group].append(i)
+    scores = [0.0] * len(views)
+    for rows in by_creator.values():
+        positive = [views[i] for i in rows if views[i] > 0]
+        avg = sum(positive) / len(positive) if positive else 0
+        for i in rows:
+            scores[i] = round(views[i] / avg, 2) if avg else 0
+    return scores
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    creators = int(sys.argv[2]) if len(sys.argv) > 2 else max(10, rows // 1000)
+
+    rng = np.random.default_rng(42)
+    views = rng.lognormal(8, 2, rows).round()
+    groups = rng.integers(0, creators, rows)
+
+    _, baseline = timed(lambda: python_mean_scores(views.tolist(), groups.tolist()))
+    print(f"{rows:,} rows, {creators:,} creators")
+    print(f"{'python loop (mean)':<24} {baseline * 1000:9.1f} ms")
+    for method in METHODS:
+        _, elapsed = timed(lambda: compute_scores(views, groups=groups, method=method))
+        print(f"{'numpy ' + method:<24} {elapsed * 1000:9.1f} ms  ({baseline / elapsed:5.1f}x)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = Path(tmp) / "bench.db"
+        build(rows, creators=creators)
+        changed, elapsed = timed(lambda: database.rescore_creators(method='median'))
+        print(f"{'rescore_creators() db':<24} {elapsed * 1000:9.1f} ms  ({changed:,} rows updated)")
+        database.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
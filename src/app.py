@@ -216,10 +216,19 @@ if not is_authed:
 # Import app modules after auth check
 from scraper import YouTubeScraper, InstagramScraper, AssemblyAITranscriber
 from remix_engine import Remixer
+import scheduler
+import transcription_pipeline
+import worker as job_worker
+from worker import Worker
+from transcript_cache import transcript_cache
+from http_client import http_stats
+from channel_cache import channel_cache
 from database import (
     add_creator, remove_creator, get_all_creators, get_creator_by_id,
-    upsert_videos, get_videos_for_creator, get_all_outliers, get_video_by_id,
-    save_transcript, save_remix, parse_youtube_url, parse_instagram_url, parse_creator_url
+    get_top_videos_by_creator, get_remixes_for_video,
+    get_all_outliers, get_feed_stats, get_outlier_page, get_video_by_id, get_videos_needing_transcripts,
+    get_transcription_job_stats, enqueue_job, retry_job, get_job, get_jobs, get_job_stats,
+    parse_youtube_url, parse_instagram_url, parse_creator_url
 )
 
 # ============================================
@@ -566,7 +575,7 @@ if 'current_view' not in st.session_state:
 if 'selected_video_id' not in st.session_state:
     st.session_state.selected_video_id = None
 if 'scraper' not in st.session_state:
-    st.session_state.scraper = YouTubeScraper()
+    st.session_state.scraper = YouTubeScraper(transcript_cache=transcript_cache, channel_cache=channel_cache)
 
 # Initialize Instagram scraper if API token available
 def get_instagram_scraper(manual_token: str = None):
@@ -602,13 +611,33 @@ def get_assemblyai_transcriber():
     try:
         api_key = st.secrets.get("ASSEMBLYAI_API_KEY", "") or os.getenv("ASSEMBLYAI_API_KEY", "")
         if api_key:
-            return AssemblyAITranscriber(api_key)
+            return AssemblyAITranscriber(api_key, transcript_cache=transcript_cache)
     except Exception:
         api_key = os.getenv("ASSEMBLYAI_API_KEY", "")
         if api_key:
-            return AssemblyAITranscriber(api_key)
+            return AssemblyAITranscriber(api_key, transcript_cache=transcript_cache)
     return None
 
+# Syncs, transcriptions and remixes run as jobs (worker.py): the app only
+# enqueues them and shows their status, so a slow scraper never blocks the
+# page and a refresh doesn't cancel anything. The embedded worker thread
+# covers deployments without a standalone `python src/worker.py`.
+EMBEDDED_WORKER = os.getenv("CONTENT_ENGINE_EMBEDDED_WORKER", "1") != "0"
+JOB_ICONS = {'queued': "⏳", 'running': "⚙️", 'done': "✅", 'dead': "❌"}
+
+def job_label(job: dict) -> str:
+    """Short description of a job for the status panel."""
+    payload = job['payload']
+    if job['kind'] == 'sync_creators':
+        ids = payload['creator_ids']
+        creator = get_creator_by_id(ids[0]) if len(ids) == 1 else None
+        return f"Sync {creator['display_name']}" if creator else f"Sync {len(ids)} creators"
+    if job['kind'] == 'sync_due':
+        return "Sync due creators"
+    if job['kind'] == 'transcribe':
+        return f"Transcribe {len(payload['video_ids'])} video(s)"
+    return f"Remix video {payload.get('video_id')}"
+
 # ============================================
 # SIDEBAR - API KEYS & SETTINGS
 # ============================================
@@ -712,6 +741,41 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    # Background pre-transcription status
+    jobs = get_transcription_job_stats()
+    if any(jobs[status] for status in ('queued', 'running', 'done', 'failed')):
+        running = " · running" if transcription_pipeline.is_running() else ""
+        st.caption(
+            f"🎙️ Transcripts: {jobs['done']} ready, {jobs['queued'] + jobs['running']} queued, "
+            f"{jobs['failed']} failed · ${jobs['cost_usd']:.2f} spent{running}"
+        )
+    # Background job queue (worker.py)
+    job_stats = get_job_stats()
+    if any(job_stats.values()):
+        worker_note = "" if EMBEDDED_WORKER else " · standalone worker"
+        st.caption(
+            f"⚙️ Jobs: {job_stats['running']} running, {job_stats['queued']} queued, "
+            f"{job_stats['dead']} failed{worker_note}"
+        )
+        for job in get_jobs(statuses=['running', 'queued', 'dead'], limit=5):
+            st.caption(f"{JOB_ICONS[job['status']]} {job_label(job)}")
+        if st.button("↻ Refresh jobs", use_container_width=True):
+            st.rerun()
+    cache = transcript_cache.stats()
+    if cache['entries'] or cache['hits'] or cache['misses']:
+        st.caption(
+            f"💾 Transcript cache: {cache['entries']} cached · "
+            f"{cache['hits']} hits / {cache['misses']} misses"
+        )
+    for provider, http in http_stats().items():
+        latency = http['latency']
+        if latency['count']:
+            circuit = " · ⚠️ circuit open" if http['circuit'] != 'closed' else ""
+            st.caption(
+                f"🌐 {provider}: {http['requests']} calls · p50 {latency['p50']:.2f}s · "
+                f"p95 {latency['p95']:.2f}s · {http['retries']} retries{circuit}"
+            )
+
     st.markdown("---")
 
     # Footer with link to rsla.io
@@ -730,67 +794,99 @@ with st.sidebar:
 # MAIN CONTENT
 # ============================================
 
+def ensure_job_worker():
+    """Start the embedded job worker, or hand it API keys entered since it started."""
+    running = job_worker.background_worker if job_worker.is_running() else None
+    services = {}
+    if running is None or running.instagram_scraper is None:
+        services['instagram_scraper'] = get_instagram_scraper()
+    if running is None or running.transcriber is None:
+        services['transcriber'] = get_assemblyai_transcriber()
+    if (running is None or running.remixer is None) and anthropic_key:
+        services['remixer'] = Remixer(anthropic_key)
+    if running is not None:
+        running.provide(**services)
+    else:
+        job_worker.start_background(Worker(youtube_scraper=st.session_state.scraper, **services))
+
+if EMBEDDED_WORKER:
+    ensure_job_worker()
+
+def queue_job(kind: str, payload: dict, dedupe_key: str, label: str) -> int:
+    """Enqueue a job for the worker and remember it for this session."""
+    job_id = enqueue_job(kind, payload, dedupe_key=dedupe_key)
+    st.session_state.setdefault('jobs', {})[dedupe_key] = job_id
+    st.toast(f"⏳ Queued: {label}")
+    return job_id
+
+def session_job(dedupe_key: str) -> dict:
+    """The latest job this session queued under dedupe_key, or None."""
+    job_id = st.session_state.get('jobs', {}).get(dedupe_key)
+    return get_job(job_id) if job_id else None
+
+def show_job_status(job: dict):
+    """
+    Inline status for a job this session queued: sync jobs show per-creator
+    progress while running and their report when done; dead jobs get a
+    retry button.
+    """
+    if job['status'] in ('queued', 'running'):
+        st.info(f"{JOB_ICONS[job['status']]} {job_label(job)}: {job['status']} in the background. "
+                "Refresh to check on it.")
+        progress = job['progress']
+        if progress:
+            st.progress(progress['done'] / progress['total'],
+                        text=f"{'❌' if progress['error'] else '✅'} {progress['creator']} "
+                             f"({progress['done']}/{progress['total']})")
+        st.button("↻ Refresh", key=f"refresh_job_{job['id']}")
+    elif job['status'] == 'done' and job['kind'] in ('sync_creators', 'sync_due'):
+        show_sync_report(job['result'])
+    elif job['status'] == 'dead':
+        st.error(f"❌ {job_label(job)} failed: {job['error']}")
+        if st.button("🔁 Retry", key=f"retry_job_{job['id']}"):
+            retry_job(job['id'])
+            st.rerun()
+
+def show_sync_report(result: dict):
+    """Summary of a finished sync job, with every failed or empty creator."""
+    if 'due' in result and not result['due']:
+        st.info("Every creator is up to date; nothing is due yet")
+        return
+    counts = result['counts']
+    total = result['synced'] + len(result['failed']) + len(result['empty'])
+    up_to_date = f" {result['up_to_date']} already up to date." if result['up_to_date'] else ""
+    st.success(
+        f"Synced {result['synced']} of {total} creators! "
+        f"{counts['inserted']} new, {counts['updated']} updated.{up_to_date}"
+    )
+    for failure in result['failed']:
+        st.error(f"❌ {failure}")
+    for name in result['empty']:
+        st.warning(f"⚠️ No videos found for {name}")
+    if result.get('deferred'):
+        st.caption(f"⏭️ {result['deferred']} more due creators left for the next run")
+
 def sync_creator(creator_id: int, limit: int = 30):
-    """Sync videos for a creator (YouTube or Instagram)."""
+    """Queue a sync of one creator (YouTube or Instagram)."""
     creator = get_creator_by_id(creator_id)
     if not creator:
         st.error("Creator not found")
-        return False
-
-    platform = creator.get('platform', 'youtube').lower()
-
-    with st.spinner(f"Syncing {creator['display_name']} ({platform})..."):
-        if platform == 'instagram':
-            # Use Instagram scraper (Apify)
-            try:
-                ig_scraper = get_instagram_scraper()
-                if not ig_scraper:
-                    st.error("❌ Apify API token required for Instagram. Add it in the sidebar or configure in Streamlit secrets.")
-                    return False
-
-                st.info(f"📡 Fetching reels from @{creator['username']}...")
-                videos = ig_scraper.get_reels(creator['username'], limit=limit)
-
-                if videos:
-                    st.info(f"✅ Got {len(videos)} reels, calculating outliers...")
-                    analyzed = ig_scraper.calculate_outliers(videos)
-                    upsert_videos(creator_id, analyzed)
-                    st.success(f"✅ Synced {len(videos)} reels from @{creator['username']}")
-                    return True
-                else:
-                    st.warning(f"⚠️ No reels found for @{creator['username']}. Check if the username is correct.")
-                    return False
-            except Exception as e:
-                st.error(f"❌ Instagram sync error: {str(e)}")
-                return False
-        else:
-            # Use YouTube scraper
-            try:
-                scraper = st.session_state.scraper
-                videos = scraper.get_channel_videos(creator['url'], limit=limit)
-                if videos:
-                    analyzed = scraper.calculate_outliers(videos)
-                    upsert_videos(creator_id, analyzed)
-                    st.success(f"✅ Synced {len(videos)} videos from {creator['display_name']}")
-                    return True
-                else:
-                    st.warning(f"⚠️ No videos found for {creator['display_name']}")
-                    return False
-            except Exception as e:
-                st.error(f"❌ YouTube sync error: {str(e)}")
-                return False
+        return
+    queue_job('sync_creators', {'creator_ids': [creator_id], 'limit': limit},
+              f"sync:{creator_id}", f"sync {creator['display_name']}")
 
 def sync_all_creators():
-    """Sync all creators in watchlist."""
+    """Queue a concurrent sync of the whole watchlist."""
     creators = get_all_creators()
-    progress = st.progress(0)
-
-    for i, creator in enumerate(creators):
-        sync_creator(creator['id'])
-        progress.progress((i + 1) / len(creators))
+    if not creators:
+        st.info("Your watchlist is empty")
+        return
+    queue_job('sync_creators', {'creator_ids': [c['id'] for c in creators]},
+              "sync:all", f"sync {len(creators)} creators")
 
-    progress.empty()
-    st.success(f"Synced {len(creators)} creators!")
+def sync_due_creators():
+    """Queue a sync of the creators the scheduler says are due, up to the per-run budget."""
+    queue_job('sync_due', {'budget': scheduler.DEFAULT_BUDGET}, "sync:due", "sync due creators")
 
 # ============================================
 # VIEW: OUTLIER FEED
@@ -803,16 +899,13 @@ if st.session_state.current_view == 'outliers':
     st.caption("Top performing videos across your watchlist")
 
     # Quick stats row
-    creators = get_all_creators()
-    all_vids = get_all_outliers(min_score=1.0, limit=1000)
-    yt_vids = [v for v in all_vids if v.get('platform', '').lower() == 'youtube']
-    ig_vids = [v for v in all_vids if v.get('platform', '').lower() == 'instagram']
+    stats = get_feed_stats(min_score=1.0)
 
     st.markdown(f"""
     <div style="display: flex; gap: 12px; margin: 16px 0 24px 0;">
-        <span class="stat-badge">👥 {len(creators)} creators</span>
-        <span class="stat-badge">📹 {len(all_vids)} videos</span>
-        <span class="stat-badge pulse">✨ {len([v for v in all_vids if v['outlier_score'] >= 3])} hot outliers</span>
+        <span class="stat-badge">👥 {stats['creators']} creators</span>
+        <span class="stat-badge">📹 {stats['videos']} videos</span>
+        <span class="stat-badge pulse">✨ {stats['hot_outliers']} hot outliers</span>
     </div>
     """, unsafe_allow_html=True)
 
@@ -825,28 +918,47 @@ if st.session_state.current_view == 'outliers':
     )
 
     # Controls
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
     with col1:
         min_score = st.slider("Minimum Outlier Score", 1.0, 5.0, 2.0, 0.5)
     with col2:
-        limit = st.selectbox("Show", [25, 50, 100], index=0)
+        rank_by = st.selectbox("Rank by", ["Outlier score", "Velocity"],
+                               help="Velocity: views per hour, from recent syncs or since upload")
+        order = 'velocity' if rank_by == "Velocity" else 'score'
     with col3:
+        limit = st.selectbox("Per page", [25, 50, 100], index=0)
+    with col4:
         st.markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
         if st.button("🔄 Sync All", use_container_width=True):
             sync_all_creators()
             st.rerun()
+        if st.button("⏱️ Sync Due", use_container_width=True,
+                     help=f"Only creators due for a refresh (up to {scheduler.DEFAULT_BUDGET} per run)"):
+            sync_due_creators()
+            st.rerun()
 
-    st.markdown("---")
+    for sync_key in ("sync:all", "sync:due"):
+        sync_job = session_job(sync_key)
+        if sync_job:
+            show_job_status(sync_job)
 
-    # Get outliers and filter by platform
-    outliers = get_all_outliers(min_score=min_score, limit=limit * 2)  # Fetch more to filter
+    st.markdown("---")
 
-    if platform_filter == "YouTube":
-        outliers = [v for v in outliers if v.get('platform', '').lower() == 'youtube'][:limit]
-    elif platform_filter == "Instagram":
-        outliers = [v for v in outliers if v.get('platform', '').lower() == 'instagram'][:limit]
-    else:
-        outliers = outliers[:limit]
+    # Keyset pagination: only the current page is fetched and rendered.
+    # feed_cursors holds the cursor each visited page started from.
+    feed_key = (platform_filter, min_score, limit, order)
+    if st.session_state.get('feed_key') != feed_key:
+        st.session_state.feed_key = feed_key
+        st.session_state.feed_cursors = [None]
+    feed_cursors = st.session_state.feed_cursors
+
+    outliers, next_cursor = get_outlier_page(
+        min_score=min_score,
+        page_size=limit,
+        platform=platform_filter,
+        cursor=feed_cursors[-1],
+        order=order
+    )
 
     if not outliers:
         st.markdown("""
@@ -898,6 +1010,8 @@ if st.session_state.current_view == 'outliers':
                     ">{score}x</span>
                     <span style="color: #888;">•</span>
                     <span style="color: #ccc;">{video.get('view_count', 0):,} views</span>
+                    {f'<span style="color: #888;">{video["views_per_hour"]:,.0f}/hr</span>' if video.get('views_per_hour') else ''}
+                    {f'<span style="color: #888;">{video["like_count"]:,} likes • {video.get("comment_count") or 0:,} comments</span>' if video.get('like_count') else ''}
                     {f'<span style="background: rgba(255,255,255,0.1); padding: 2px 8px; border-radius: 4px; font-size: 11px; color: {score_color};">{score_label}</span>' if score_label else ''}
                 </div>
                 """, unsafe_allow_html=True)
@@ -912,6 +1026,23 @@ if st.session_state.current_view == 'outliers':
             if i < len(outliers) - 1:
                 st.markdown("<hr style='border-color: rgba(255,255,255,0.05); margin: 16px 0;'>", unsafe_allow_html=True)
 
+        # Pager
+        st.markdown("---")
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if len(feed_cursors) > 1 and st.button("← Previous", use_container_width=True):
+                feed_cursors.pop()
+                st.rerun()
+        with col_page:
+            st.markdown(
+                f"<div style='text-align: center; color: #888; padding-top: 8px;'>Page {len(feed_cursors)}</div>",
+                unsafe_allow_html=True
+            )
+        with col_next:
+            if next_cursor and st.button("Next →", use_container_width=True):
+                feed_cursors.append(next_cursor)
+                st.rerun()
+
 # ============================================
 # VIEW: WATCHLIST
 # ============================================
@@ -965,6 +1096,11 @@ elif st.session_state.current_view == 'watchlist':
         if add_btn and new_url:
             # Use the unified parser
             platform, username, clean_url = parse_creator_url(new_url)
+            if platform == 'youtube' and username == 'unknown':
+                # Video URL: store the channel it belongs to (resolved once, then cached)
+                channel_id = st.session_state.scraper.resolve_channel_id(new_url.strip())
+                if channel_id:
+                    username, clean_url = channel_id, f"https://www.youtube.com/channel/{channel_id}"
             creator_id = add_creator(platform, username, clean_url, display_name or username)
 
             if creator_id:
@@ -985,6 +1121,9 @@ elif st.session_state.current_view == 'watchlist':
         </div>
         """, unsafe_allow_html=True)
     else:
+        # Top 5 per creator for the whole watchlist in one query
+        top_videos = get_top_videos_by_creator(per_creator=5)
+
         for creator in creators:
             st.markdown(f"""
             <div style="
@@ -1008,6 +1147,9 @@ elif st.session_state.current_view == 'watchlist':
             with col2:
                 if creator.get('last_synced'):
                     st.caption(f"🕐 {creator['last_synced'][:10]}")
+                    if creator.get('next_sync_at'):
+                        due_in = (creator['next_sync_at'] - time.time()) / 3600
+                        st.caption(f"⏭️ due in {due_in:.0f}h" if due_in > 0 else "⏭️ due now")
                 else:
                     st.caption("⏳ Never synced")
 
@@ -1021,8 +1163,12 @@ elif st.session_state.current_view == 'watchlist':
                     remove_creator(creator['id'])
                     st.rerun()
 
+            sync_job = session_job(f"sync:{creator['id']}")
+            if sync_job:
+                show_job_status(sync_job)
+
             # Show top videos for this creator
-            videos = get_videos_for_creator(creator['id'], limit=5)
+            videos = top_videos.get(creator['id'], [])
             if videos:
                 with st.expander(f"📊 Top {len(videos)} videos"):
                     for v in videos:
@@ -1054,6 +1200,21 @@ elif st.session_state.current_view == 'remix':
     </div>
     """, unsafe_allow_html=True)
 
+    # Batch transcription for Instagram outliers (one poller for every job)
+    if assemblyai_key:
+        with st.expander("🎙️ Batch transcribe Instagram outliers"):
+            batch_size = st.number_input("Top outliers without transcripts", 1, 200, 50, 10)
+            if st.button("🎙️ Transcribe batch", use_container_width=True):
+                pending = get_videos_needing_transcripts(platform='instagram', limit=int(batch_size))
+                if not pending:
+                    st.info("Every Instagram outlier already has a transcript")
+                else:
+                    queue_job('transcribe', {'video_ids': [v['id'] for v in pending]},
+                              "transcribe:batch", f"transcribe {len(pending)} reels")
+            batch_job = session_job("transcribe:batch")
+            if batch_job:
+                show_job_status(batch_job)
+
     # Video selection
     col1, col2 = st.columns([2, 1])
 
@@ -1127,30 +1288,24 @@ elif st.session_state.current_view == 'remix':
                 # Determine transcription method based on platform
                 is_instagram = video.get('platform', '').lower() == 'instagram'
 
+                transcribe_key = f"transcribe:{video['id']}"
                 if is_instagram:
                     btn_label = "🔄 Re-transcribe" if has_error else "🎙️ Transcribe with AssemblyAI"
                     if not assemblyai_key:
                         st.warning("⚠️ AssemblyAI API key required for Instagram transcription.")
                     elif st.button(btn_label, type="primary", use_container_width=True):
-                        transcriber = get_assemblyai_transcriber()
-                        if transcriber:
-                            with st.spinner("Transcribing with AssemblyAI... (may take 30-60s)"):
-                                # Instagram videos need direct video URL
-                                video_url = video.get('video_url') or video.get('url')
-                                transcript = transcriber.transcribe_url(video_url)
-                                save_transcript(video['id'], transcript)
-                                st.rerun()
-                        else:
-                            st.error("AssemblyAI transcriber not available")
+                        queue_job('transcribe', {'video_ids': [video['id']]}, transcribe_key,
+                                  "AssemblyAI transcription (may take 30-60s)")
+                        st.rerun()
                 else:
                     # YouTube - use free transcript API
                     btn_label = "🔄 Re-fetch Transcript" if has_error else "📥 Fetch Transcript"
                     if st.button(btn_label, type="primary", use_container_width=True):
-                        scraper = st.session_state.scraper
-                        with st.spinner("Fetching transcript..."):
-                            transcript = scraper.get_transcript(video['url'])
-                            save_transcript(video['id'], transcript)
-                            st.rerun()
+                        queue_job('transcribe', {'video_ids': [video['id']]}, transcribe_key, "fetch transcript")
+                        st.rerun()
+                transcribe_job = session_job(transcribe_key)
+                if transcribe_job:
+                    show_job_status(transcribe_job)
 
         with col_remix:
             st.markdown("""
@@ -1160,17 +1315,23 @@ elif st.session_state.current_view == 'remix':
             </div>
             """, unsafe_allow_html=True)
 
-            transcript_to_remix = video.get('transcript') or st.session_state.get('direct_transcript')
+            # The remix job reads the stored transcript, so a pasted URL's transcript doesn't count here
+            transcript_to_remix = transcript_text and not has_error
 
             if transcript_to_remix and anthropic_key:
+                remix_key = f"remix:{video['id']}"
                 if st.button("🪄 Remix in My Voice", type="primary", use_container_width=True):
-                    with st.spinner("✨ Claude is writing in your voice..."):
-                        remixer = Remixer(anthropic_key)
-                        remixed = remixer.remix_content(transcript_to_remix)
-                        st.session_state.remixed_content = remixed
+                    queue_job('remix', {'video_id': video['id']}, remix_key, "Claude is writing in your voice")
+                    st.rerun()
 
-                        if video:
-                            save_remix(video['id'], remixed)
+                remix_job = session_job(remix_key)
+                if remix_job:
+                    show_job_status(remix_job)
+                    if remix_job['status'] == 'done':
+                        remixes = get_remixes_for_video(video['id'])
+                        latest = next((r for r in remixes if r['id'] == remix_job['result']['remix_id']), None)
+                        if latest:
+                            st.session_state.remixed_content = latest['remixed_content']
 
                 if 'remixed_content' in st.session_state:
                     st.text_area(
@@ -1190,13 +1351,8 @@ elif st.session_state.current_view == 'remix':
                         )
                     with col_download:
                         if st.button("🔄 Regenerate", use_container_width=True):
-                            with st.spinner("✨ Regenerating..."):
-                                remixer = Remixer(anthropic_key)
-                                remixed = remixer.remix_content(transcript_to_remix)
-                                st.session_state.remixed_content = remixed
-                                if video:
-                                    save_remix(video['id'], remixed)
-                                st.rerun()
+                            queue_job('remix', {'video_id': video['id']}, remix_key, "regenerating")
+                            st.rerun()
             elif not anthropic_key:
                 st.markdown("""
                 <div style="
@@ -0,0 +1,56 @@
+"""
+Single-flight background runs.
+
+Enrichment, pre-transcription and the embedded job worker each run on a
+daemon thread, at most one at a time per process, so a Streamlit rerun or
+a second sync finishing doesn't start another copy. The last run's return
+value is kept for the UI.
+"""
+import threading
+
+
+class BackgroundRun:
+    """
+    Runs a function on a daemon thread unless a previous run is still going.
+
+    Args:
+        name: Shown in log lines ("<name> finished: ...")
+        thread_name: Name of the thread
+    """
+
+    def __init__(self, name: str, thread_name: str):
+        self.name = name
+        self.thread_name = thread_name
+        self.last_report = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, fn, *args, **kwargs) -> bool:
+        """Call fn(*args, **kwargs) on a daemon thread. False (and nothing started) if already running."""
+        if not self._lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self.last_report = fn(*args, **kwargs)
+                if self.last_report is not None:
+                    print(f"{self.name} finished: {self.last_report}")
+            except Exception as e:
+                print(f"{self.name} failed: {e}")
+            finally:
+                self._lock.release()
+
+        self._thread = threading.Thread(target=run, name=self.thread_name, daemon=True)
+        self._thread.start()
+        return True
+
+    def is_running(self) -> bool:
+        """True while a run is in progress."""
+        return self._lock.locked()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the current run (if any) ends. False if it is still running after timeout."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running()
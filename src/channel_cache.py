@@ -0,0 +1,75 @@
+"""
+Persistent YouTube channel resolution cache.
+
+Maps the ways a channel gets referenced (video URLs, @handles, /c/ and
+/user/ names) to its canonical channel ID. Resolving a watch?v= URL takes
+a full yt-dlp metadata extraction, so with the cache that happens once per
+video instead of on every add and sync.
+"""
+import threading
+
+from database import get_channel_id_for_aliases, save_channel_aliases
+from transcript_cache import normalize_key
+
+
+def channel_alias(url: str) -> str:
+    """
+    Cache key for a YouTube URL:
+    /channel/UC... -> channel:UC..., /@Handle -> @handle, /c/Name -> c:name,
+    /user/Name -> user:name, video URLs -> video:ID. None for anything else.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    for marker, prefix in (('/channel/', 'channel:'), ('/@', '@'), ('/c/', 'c:'), ('/user/', 'user:')):
+        if marker in url:
+            name = url.split(marker)[1].split('/')[0].split('?')[0]
+            if not name:
+                return None
+            return prefix + (name if marker == '/channel/' else name.lower())
+
+    key = normalize_key(url)
+    if key and key.startswith('youtube:'):
+        return "video:" + key[len('youtube:'):]
+    return None
+
+
+class ChannelCache:
+    """Database-backed alias -> channel ID map with hit/miss counters for this process."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> str:
+        """Channel ID for a channel/handle/video URL, or None if not resolved yet."""
+        alias = channel_alias(url)
+        if alias is None:
+            return None
+        if alias.startswith('channel:'):
+            # Only a real channel ID; a case-folded 'uc...' would 404 on the feed
+            channel_id = alias[len('channel:'):]
+            return channel_id if channel_id.startswith('UC') else None
+
+        channel_id = get_channel_id_for_aliases([alias])
+        with self._lock:
+            if channel_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return channel_id
+
+    def put(self, channel_id: str, *urls):
+        """Remember that every URL refers to channel_id."""
+        aliases = {channel_alias(url) for url in urls} - {None}
+        aliases.discard(f"channel:{channel_id}")
+        if channel_id and aliases:
+            save_channel_aliases(channel_id, sorted(aliases))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+channel_cache = ChannelCache()
@@ -4,36 +4,258 @@ Stores watchlist creators and synced videos.
 """
 import sqlite3
 import json
-from datetime import datetime
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
 from pathlib import Path
+import numpy as np
+
+from query_cache import query_cache, cached_query
+from scoring import (
+    compute_scores, grouped_view_stats, baseline_from_stats, recent_in_group, INCREMENTAL_METHODS,
+    DEFAULT_METHOD, BASELINE_WINDOW
+)
 
 DB_PATH = Path(__file__).parent.parent / "data" / "content_engine.db"
 
-def get_connection():
-    """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+# Idle connections kept per database file. Streamlit runs each rerun on a
+# fresh thread, so a pool outlives threads where thread-locals would not.
+POOL_SIZE = 8
+
+# Storage profile applied to every connection. WAL lets feed reads run while
+# a sync is writing; override any value via env or configure_storage().
+STORAGE_PROFILE = {
+    'journal_mode': os.getenv("CONTENT_ENGINE_JOURNAL_MODE", "WAL"),
+    'synchronous': os.getenv("CONTENT_ENGINE_SYNCHRONOUS", "NORMAL"),
+    'mmap_size': int(os.getenv("CONTENT_ENGINE_MMAP_SIZE", 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv("CONTENT_ENGINE_CACHE_SIZE", -64000)),  # negative = KiB
+    'busy_timeout': int(os.getenv("CONTENT_ENGINE_BUSY_TIMEOUT_MS", 15000)),
+}
+
+
+def configure_storage(**overrides):
+    """Update STORAGE_PROFILE and drop pooled connections so it takes effect."""
+    unknown = set(overrides) - set(STORAGE_PROFILE)
+    if unknown:
+        raise ValueError(f"Unknown storage settings: {', '.join(sorted(unknown))}")
+    STORAGE_PROFILE.update(overrides)
+    close_all_connections()
+
+
+class WriteQueue:
+    """
+    FIFO single-writer queue. Writers in this process are admitted one at a
+    time in arrival order, so they line up instead of racing for the SQLite
+    write lock; busy_timeout covers writers in other processes.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._serving:
+                self._cond.wait()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._serving += 1
+                self._cond.notify_all()
+
+
+_write_queue = WriteQueue()
+
+
+class ConnectionPool:
+    """Small LIFO pool of long-lived connections to one database file."""
+
+    def __init__(self, db_path: str, max_idle: int = POOL_SIZE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _open_connection(self.db_path)
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def data_version(self) -> int:
+        """
+        PRAGMA data_version on a dedicated connection: it changes whenever
+        any other connection, in this or another process, commits.
+        """
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = _open_connection(self.db_path)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        with self._watcher_lock:
+            if self._watcher is not None:
+                idle.append(self._watcher)
+                self._watcher = None
+        for conn in idle:
+            conn.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+
+def _sql_log1p(value):
+    return math.log1p(value) if value is not None and value > -1 else None
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Open a raw connection with the storage profile applied. Transactions are managed explicitly."""
+    profile = STORAGE_PROFILE
+    conn = sqlite3.connect(
+        db_path,
+        timeout=profile['busy_timeout'] / 1000,
+        isolation_level=None,
+        check_same_thread=False
+    )
     conn.row_factory = sqlite3.Row
-    create_tables(conn)
-    migrate_database(conn)
+    # For log-space baselines in SQL (creator_baselines rescoring)
+    conn.create_function("log1p", 1, _sql_log1p, deterministic=True)
+    # Unix time of an upload_date in either stored format (sync scheduling)
+    conn.create_function("upload_ts", 1, lambda value: _upload_timestamp(value), deterministic=True)
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
     return conn
 
 
-def migrate_database(conn):
-    """Run database migrations for schema updates."""
-    cursor = conn.cursor()
+def _get_pool() -> ConnectionPool:
+    """Get the pool for DB_PATH, running schema setup once per process."""
+    db_path = str(DB_PATH)
+    pool = _pools.get(db_path)
+    if pool is not None:
+        return pool
 
-    # Check if video_url column exists in videos table
-    cursor.execute("PRAGMA table_info(videos)")
-    columns = [col[1] for col in cursor.fetchall()]
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            pool = ConnectionPool(db_path)
+            conn = pool.acquire()
+            try:
+                # journal_mode is persistent per database file
+                conn.execute(f"PRAGMA journal_mode = {STORAGE_PROFILE['journal_mode']}")
+                migrate_database(conn)
+            finally:
+                pool.release(conn)
+            _pools[db_path] = pool
+    return pool
 
-    if 'video_url' not in columns:
+
+def close_all_connections():
+    """Close every pooled connection (tests, shutdown, switching DB_PATH)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+    query_cache.clear()
+
+
+@contextmanager
+def transaction(write: bool = False):
+    """
+    Borrow a pooled connection and run the block in one transaction.
+    Commits on success, rolls back on error. Nested calls on the same
+    thread join the outer transaction instead of opening a new one.
+
+    Write transactions wait their turn in the single-writer queue and take
+    the SQLite write lock up front (BEGIN IMMEDIATE), so they never fail
+    half-way with "database is locked". Finishing one invalidates the
+    query cache.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        if write and not _local.write:
+            raise RuntimeError("Cannot start a write inside a read-only transaction")
+        yield conn
+        return
+
+    pool = _get_pool()
+    with (_write_queue.slot() if write else nullcontext()):
+        conn = pool.acquire()
+        _local.conn = conn
+        _local.write = write
         try:
-            cursor.execute("ALTER TABLE videos ADD COLUMN video_url TEXT")
-            conn.commit()
-            print("Migration: Added video_url column to videos table")
-        except sqlite3.OperationalError:
-            pass  # Column might already exist
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            _local.conn = None
+            pool.release(conn)
+            if write:
+                # Also on rollback: reads inside the block may have cached
+                # rows that were never committed
+                query_cache.bump()
+
+
+def get_connection():
+    """Get a standalone database connection (schema is set up once per process)."""
+    _get_pool()
+    return _open_connection(str(DB_PATH))
+
+
+def migrate_database(conn):
+    """
+    Apply pending schema migrations, in order, in a single transaction.
+    The applied version is tracked in PRAGMA user_version, so once a
+    database is current this is one PRAGMA read per process.
+    """
+    latest = MIGRATIONS[-1][0]
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= latest:
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock in case another process migrated first
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, description, migrate in MIGRATIONS:
+            if number <= version:
+                continue
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            print(f"Migration {number}: {description}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
 
 def create_tables(conn):
     """Create database tables if they don't exist."""
@@ -87,7 +309,280 @@ def create_tables(conn):
         )
     """)
 
-    conn.commit()
+def _add_video_url_column(conn):
+    """Databases created before Instagram support lack videos.video_url."""
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(videos)")]
+    if 'video_url' not in columns:
+        conn.execute("ALTER TABLE videos ADD COLUMN video_url TEXT")
+
+def _create_feed_indexes(conn):
+    """Secondary indexes for the feed, watchlist and remix queries."""
+    cursor = conn.cursor()
+
+    # Feed indexes: the outlier feed walks videos by score, the watchlist
+    # reads one creator's videos by score, and platform filters join creators.
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_outlier_score
+        ON videos(outlier_score DESC, id DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_creator_score
+        ON videos(creator_id, outlier_score DESC)
+    """)
+    # Covers the watchlist's per-creator COUNT / MAX(synced_at) without table reads
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_creator_synced
+        ON videos(creator_id, synced_at)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_creators_platform
+        ON creators(platform, id)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_remixes_video
+        ON remixes(video_id, created_at DESC)
+    """)
+
+def _create_transcription_jobs(conn):
+    """Persisted queue for background pre-transcription (transcription_pipeline.py)."""
+    # status: queued -> running -> done | failed (or back to queued for a retry)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcription_jobs (
+            video_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'queued',
+            priority REAL NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            cost_usd REAL NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (video_id) REFERENCES videos(id)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transcription_jobs_queue
+        ON transcription_jobs(status, priority DESC)
+    """)
+
+def _create_transcript_cache(conn):
+    """Content-addressed transcript cache (transcript_cache.py)."""
+    # One row per distinct transcript, keyed by the sha256 of its text
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcript_blobs (
+            content_hash TEXT PRIMARY KEY,
+            transcript TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Any number of lookup keys (video ID, media URL) per transcript
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transcript_keys (
+            cache_key TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            FOREIGN KEY (content_hash) REFERENCES transcript_blobs(content_hash)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transcript_keys_hash
+        ON transcript_keys(content_hash)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transcript_blobs_used
+        ON transcript_blobs(last_used_at)
+    """)
+
+def _create_youtube_feeds(conn):
+    """Per-creator upload feed state for the sync pre-check."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS youtube_feeds (
+            creator_id INTEGER PRIMARY KEY,
+            channel_id TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            checked_at TIMESTAMP,
+            refreshed_at TIMESTAMP,
+            FOREIGN KEY (creator_id) REFERENCES creators(id)
+        )
+    """)
+
+def _create_channel_aliases(conn):
+    """Video URL / handle -> canonical YouTube channel ID (channel_cache.py)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS channel_aliases (
+            alias TEXT PRIMARY KEY,
+            channel_id TEXT NOT NULL,
+            resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def _create_video_enrichment(conn):
+    """Per-video full-metadata results (enrichment.py), keyed by platform video ID."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS video_enrichment (
+            platform_video_id TEXT PRIMARY KEY,
+            like_count INTEGER,
+            comment_count INTEGER,
+            enriched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def _create_creator_baselines(conn):
+    """
+    Per-creator view statistics over the creator's most recent uploads
+    (positive view counts only, see scoring.BASELINE_WINDOW), kept up to
+    date by bulk_upsert_videos so scores are against the creator's stored
+    history rather than the latest fetch. Creators synced before this get
+    theirs from rescore_stale_creators.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS creator_baselines (
+            creator_id INTEGER PRIMARY KEY,
+            video_count INTEGER NOT NULL DEFAULT 0,
+            view_sum REAL NOT NULL DEFAULT 0,
+            log_sum REAL NOT NULL DEFAULT 0,
+            log_sq_sum REAL NOT NULL DEFAULT 0,
+            method TEXT,
+            baseline REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (creator_id) REFERENCES creators(id)
+        )
+    """)
+
+def _create_video_metrics(conn):
+    """
+    Append-only view/like/comment history (one row per change, unix-second
+    timestamps, no rowid) and videos.views_per_hour for the velocity feed.
+    Existing videos get one snapshot as of their last sync; their
+    views_per_hour is filled in by backfill_velocity.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS video_metrics (
+            video_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            views INTEGER,
+            likes INTEGER,
+            comments INTEGER,
+            PRIMARY KEY (video_id, ts)
+        ) WITHOUT ROWID
+    """)
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(videos)")]
+    if 'views_per_hour' not in columns:
+        conn.execute("ALTER TABLE videos ADD COLUMN views_per_hour REAL DEFAULT 0")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_velocity
+        ON videos(views_per_hour DESC, id DESC)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO video_metrics (video_id, ts, views, likes, comments)
+        SELECT id, CAST(strftime('%s', COALESCE(synced_at, CURRENT_TIMESTAMP)) AS INTEGER),
+               view_count, like_count, comment_count
+        FROM videos
+    """)
+
+def _add_sync_schedule(conn):
+    """
+    creators.next_sync_at / sync_interval (unix seconds) for scheduler.py.
+    Creators synced before get a daily interval until their next sync
+    replans them; never-synced ones stay NULL (due now).
+    """
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(creators)")]
+    if 'next_sync_at' not in columns:
+        conn.execute("ALTER TABLE creators ADD COLUMN next_sync_at INTEGER")
+    if 'sync_interval' not in columns:
+        conn.execute("ALTER TABLE creators ADD COLUMN sync_interval INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_creators_next_sync ON creators(next_sync_at)")
+    conn.execute("""
+        UPDATE creators
+        SET sync_interval = 86400,
+            next_sync_at = CAST(strftime('%s', last_synced) AS INTEGER) + 86400
+        WHERE last_synced IS NOT NULL AND next_sync_at IS NULL
+    """)
+
+def _add_velocity_backfill_flag(conn):
+    """
+    videos.velocity_pending marks rows backfill_velocity still has to
+    compute (velocity 0 since migration 10, with views and an upload date).
+    Cleared once computed, so videos whose velocity really is 0 aren't
+    picked up again; syncs keep the rows they write current.
+    """
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(videos)")]
+    if 'velocity_pending' not in columns:
+        conn.execute("ALTER TABLE videos ADD COLUMN velocity_pending INTEGER DEFAULT 0")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_velocity_pending
+        ON videos(id) WHERE velocity_pending = 1
+    """)
+    conn.execute("""
+        UPDATE videos SET velocity_pending = 1
+        WHERE views_per_hour = 0 AND view_count > 0 AND upload_date IS NOT NULL
+    """)
+
+def _create_jobs(conn):
+    """
+    Persisted job queue for worker.py (sync, transcription, remix).
+    status: queued -> running -> done | dead, or back to queued for a retry.
+    A running job's lease_until (unix seconds) is extended while it runs;
+    once it lapses the job can be claimed again. dedupe_key is unique among
+    queued and running jobs.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL DEFAULT '{}',
+            dedupe_key TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            run_after INTEGER NOT NULL,
+            lease_until INTEGER,
+            worker TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, run_after)")
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_key
+        ON jobs(dedupe_key) WHERE status IN ('queued', 'running')
+    """)
+
+def _add_job_progress(conn):
+    """jobs.progress: JSON the running handler reports as it goes (set_job_progress)."""
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(jobs)")]
+    if 'progress' not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+
+# Ordered schema migrations: (user_version, description, function).
+# Append new entries; never edit or renumber ones that have shipped.
+MIGRATIONS = [
+    (1, "create base tables", create_tables),
+    (2, "add videos.video_url", _add_video_url_column),
+    (3, "add feed indexes", _create_feed_indexes),
+    (4, "add transcription_jobs", _create_transcription_jobs),
+    (5, "add transcript cache", _create_transcript_cache),
+    (6, "add youtube_feeds", _create_youtube_feeds),
+    (7, "add channel_aliases", _create_channel_aliases),
+    (8, "add video_enrichment", _create_video_enrichment),
+    (9, "add creator_baselines", _create_creator_baselines),
+    (10, "add video_metrics", _create_video_metrics),
+    (11, "add creator sync schedule", _add_sync_schedule),
+    (12, "add jobs", _create_jobs),
+    (13, "add videos.velocity_pending", _add_velocity_backfill_flag),
+    (14, "add jobs.progress", _add_job_progress),
+]
+
+def _data_version() -> tuple:
+    """Changes when the database is written from another process (e.g. worker.py)."""
+    return str(DB_PATH), _get_pool().data_version()
+
+# Read functions below are served from the shared query cache until the
+# next write transaction, in this process or another; see query_cache.py.
+_cached = cached_query(scope=lambda: str(DB_PATH), version=_data_version)
 
 # ============================================
 # CREATOR OPERATIONS
@@ -95,47 +590,46 @@ def create_tables(conn):
 
 def add_creator(platform: str, username: str, url: str, display_name: str = None) -> int:
     """Add a creator to watchlist. Returns creator ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
-            INSERT INTO creators (platform, username, url, display_name)
-            VALUES (?, ?, ?, ?)
-        """, (platform.lower(), username.lower(), url, display_name or username))
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.IntegrityError:
-        # Already exists, return existing ID
-        cursor.execute("""
-            SELECT id FROM creators WHERE platform = ? AND username = ?
-        """, (platform.lower(), username.lower()))
-        row = cursor.fetchone()
-        return row['id'] if row else None
-    finally:
-        conn.close()
+    with transaction(write=True) as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO creators (platform, username, url, display_name)
+                VALUES (?, ?, ?, ?)
+            """, (platform.lower(), username.lower(), url, display_name or username))
+            return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Already exists, return existing ID
+            cursor.execute("""
+                SELECT id FROM creators WHERE platform = ? AND username = ?
+            """, (platform.lower(), username.lower()))
+            row = cursor.fetchone()
+            return row['id'] if row else None
 
 def remove_creator(creator_id: int) -> bool:
     """Remove creator and their videos from watchlist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
+    with transaction(write=True) as conn:
+        cursor = conn.cursor()
         # Delete videos first (foreign key)
+        cursor.execute("""
+            DELETE FROM transcription_jobs
+            WHERE video_id IN (SELECT id FROM videos WHERE creator_id = ?)
+        """, (creator_id,))
+        cursor.execute("""
+            DELETE FROM video_metrics
+            WHERE video_id IN (SELECT id FROM videos WHERE creator_id = ?)
+        """, (creator_id,))
         cursor.execute("DELETE FROM videos WHERE creator_id = ?", (creator_id,))
+        cursor.execute("DELETE FROM youtube_feeds WHERE creator_id = ?", (creator_id,))
+        cursor.execute("DELETE FROM creator_baselines WHERE creator_id = ?", (creator_id,))
         cursor.execute("DELETE FROM creators WHERE id = ?", (creator_id,))
-        conn.commit()
         return cursor.rowcount > 0
-    finally:
-        conn.close()
 
+@_cached
 def get_all_creators() -> list:
     """Get all creators in watchlist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction() as conn:
+        cursor = conn.execute("""
             SELECT c.*,
                    COUNT(v.id) as video_count,
                    MAX(v.synced_at) as latest_video_sync
@@ -145,140 +639,1189 @@ def get_all_creators() -> list:
             ORDER BY c.added_at DESC
         """)
         return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
 
+@_cached
 def get_creator_by_id(creator_id: int) -> dict:
     """Get single creator by ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("SELECT * FROM creators WHERE id = ?", (creator_id,))
-        row = cursor.fetchone()
+    with transaction() as conn:
+        row = conn.execute("SELECT * FROM creators WHERE id = ?", (creator_id,)).fetchone()
         return dict(row) if row else None
-    finally:
-        conn.close()
 
 def update_creator_sync_time(creator_id: int):
     """Update last_synced timestamp for creator."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction(write=True) as conn:
+        conn.execute("""
             UPDATE creators SET last_synced = CURRENT_TIMESTAMP WHERE id = ?
         """, (creator_id,))
-        conn.commit()
-    finally:
-        conn.close()
+
+def get_due_creators(now: int, limit: int = None, default_interval: int = 86400) -> list:
+    """
+    Creators whose next_sync_at has passed, never-scheduled ones first,
+    then by how overdue they are relative to their interval (default_interval
+    for creators without one, e.g. deferred before their first sync). Not
+    cached: the result depends on the clock.
+    """
+    with transaction() as conn:
+        rows = conn.execute("""
+            SELECT * FROM creators
+            WHERE next_sync_at IS NULL OR next_sync_at <= ?
+            ORDER BY next_sync_at IS NOT NULL,
+                     (? - next_sync_at) * 1.0 / MAX(COALESCE(sync_interval, ?), 1) DESC,
+                     id
+            LIMIT ?
+        """, (now, now, default_interval, -1 if limit is None else limit))
+        return [dict(row) for row in rows.fetchall()]
+
+def count_due_creators(now: int) -> int:
+    """Number of creators get_due_creators would return without a limit."""
+    with transaction() as conn:
+        return conn.execute("""
+            SELECT COUNT(*) FROM creators WHERE next_sync_at IS NULL OR next_sync_at <= ?
+        """, (now,)).fetchone()[0]
+
+def get_sync_signals(creator_ids: list, upload_window: int, now: int) -> dict:
+    """
+    Inputs for scheduling, per creator: {creator_id: {'last_synced' (unix
+    or None), 'recent_uploads' (in the last upload_window seconds),
+    'latest_upload' (unix or None), 'dated_videos', 'top_velocity'}}.
+    """
+    signals = {}
+    with transaction() as conn:
+        for start in range(0, len(creator_ids), 500):
+            chunk = creator_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(f"""
+                SELECT c.id, CAST(strftime('%s', c.last_synced) AS INTEGER) AS last_synced,
+                       COALESCE(SUM(u.uploaded >= ?), 0) AS recent_uploads,
+                       MAX(u.uploaded) AS latest_upload,
+                       COUNT(u.uploaded) AS dated_videos,
+                       COALESCE(MAX(u.views_per_hour), 0) AS top_velocity
+                FROM creators c
+                LEFT JOIN (
+                    SELECT creator_id, upload_ts(upload_date) AS uploaded, views_per_hour
+                    FROM videos WHERE creator_id IN ({placeholders})
+                ) u ON u.creator_id = c.id
+                WHERE c.id IN ({placeholders})
+                GROUP BY c.id
+            """, (now - upload_window, *chunk, *chunk)).fetchall()
+            for row in rows:
+                signals[row['id']] = {key: row[key] for key in row.keys() if key != 'id'}
+    return signals
+
+def set_sync_schedule(schedule: dict):
+    """
+    Store {creator_id: (next_sync_at, sync_interval)}; an interval of None
+    keeps the stored one.
+    """
+    with transaction(write=True) as conn:
+        conn.executemany("""
+            UPDATE creators SET next_sync_at = ?, sync_interval = COALESCE(?, sync_interval) WHERE id = ?
+        """, [(next_sync_at, interval, creator_id)
+              for creator_id, (next_sync_at, interval) in schedule.items()])
+
+def get_youtube_feed(creator_id: int, refresh_interval: int) -> dict:
+    """
+    Upload feed state for a creator, or None. 'refresh_due' is true when the
+    last full extraction is older than refresh_interval seconds (or never ran).
+    Not cached: refresh_due depends on the clock.
+    """
+    with transaction() as conn:
+        row = conn.execute("""
+            SELECT *, (refreshed_at IS NULL OR refreshed_at < datetime('now', ?)) as refresh_due
+            FROM youtube_feeds WHERE creator_id = ?
+        """, (f"-{int(refresh_interval)} seconds", creator_id)).fetchone()
+        return dict(row, refresh_due=bool(row['refresh_due'])) if row else None
+
+def update_youtube_feed(creator_id: int, channel_id: str = None, etag: str = None,
+                        last_modified: str = None, checked: bool = False, refreshed: bool = False):
+    """
+    Record upload feed state. channel_id is kept when None; the validators
+    (etag, last_modified) are replaced when checked=True. refreshed marks a
+    full yt-dlp extraction.
+    """
+    with transaction(write=True) as conn:
+        conn.execute("""
+            INSERT INTO youtube_feeds (creator_id, channel_id, etag, last_modified, checked_at, refreshed_at)
+            VALUES (?, ?, ?, ?,
+                    CASE WHEN ? THEN CURRENT_TIMESTAMP END,
+                    CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+            ON CONFLICT(creator_id) DO UPDATE SET
+                channel_id = COALESCE(excluded.channel_id, channel_id),
+                etag = CASE WHEN ? THEN excluded.etag ELSE etag END,
+                last_modified = CASE WHEN ? THEN excluded.last_modified ELSE last_modified END,
+                checked_at = COALESCE(excluded.checked_at, checked_at),
+                refreshed_at = COALESCE(excluded.refreshed_at, refreshed_at)
+        """, (creator_id, channel_id, etag, last_modified, checked, refreshed, checked, checked))
+
+@_cached
+def get_channel_id_for_aliases(aliases: list) -> str:
+    """Channel ID cached under any of aliases, or None."""
+    if not aliases:
+        return None
+    with transaction() as conn:
+        row = conn.execute(f"""
+            SELECT channel_id FROM channel_aliases WHERE alias IN ({",".join("?" * len(aliases))}) LIMIT 1
+        """, aliases).fetchone()
+        return row['channel_id'] if row else None
+
+def save_channel_aliases(channel_id: str, aliases: list):
+    """Point aliases at a channel ID."""
+    with transaction(write=True) as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO channel_aliases (alias, channel_id) VALUES (?, ?)
+        """, [(alias, channel_id) for alias in aliases])
 
 # ============================================
 # VIDEO OPERATIONS
 # ============================================
 
-def upsert_videos(creator_id: int, videos: list):
-    """Insert or update videos for a creator."""
-    conn = get_connection()
+UPSERT_VIDEO_SQL = """
+    INSERT INTO videos (
+        creator_id, platform_video_id, title, url, video_url, view_count,
+        like_count, comment_count, duration, upload_date,
+        thumbnail, outlier_score, synced_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(creator_id, platform_video_id) DO UPDATE SET
+        view_count = excluded.view_count,
+        like_count = COALESCE(excluded.like_count, videos.like_count),
+        comment_count = COALESCE(excluded.comment_count, videos.comment_count),
+        outlier_score = excluded.outlier_score,
+        video_url = COALESCE(excluded.video_url, videos.video_url),
+        synced_at = CURRENT_TIMESTAMP
+"""
+
+def _video_row(creator_id: int, video: dict) -> tuple:
+    """Map a scraped video dict onto UPSERT_VIDEO_SQL parameters."""
+    return (
+        creator_id,
+        video.get('id') or video.get('platform_video_id'),
+        video.get('title'),
+        video.get('url'),
+        video.get('video_url'),  # Direct video URL for transcription (Instagram)
+        video.get('view_count', 0),
+        # None = not in this fetch (e.g. flat YouTube listings): keeps the stored/enriched value
+        video.get('like_count'),
+        video.get('comment_count'),
+        video.get('duration'),
+        video.get('upload_date'),
+        video.get('thumbnail'),
+        video.get('outlier_score', 0)
+    )
+
+def _is_unchanged(existing: sqlite3.Row, row: tuple) -> bool:
+    """True if an upsert of row would leave the stored video as it is."""
+    return (
+        existing['view_count'] == row[5]
+        and (row[6] is None or existing['like_count'] == row[6])
+        and (row[7] is None or existing['comment_count'] == row[7])
+        and existing['outlier_score'] == row[11]
+        and (row[4] is None or existing['video_url'] == row[4])
+    )
+
+def _metrics_changed(existing: sqlite3.Row, row: tuple) -> bool:
+    """True if the upsert changes views, likes or comments (None keeps the stored value)."""
+    return (
+        existing['view_count'] != row[5]
+        or (row[6] is not None and existing['like_count'] != row[6])
+        or (row[7] is not None and existing['comment_count'] != row[7])
+    )
+
+def _refresh_baselines(conn, creator_ids: list):
+    """
+    Recompute creators' creator_baselines sums in SQL over their
+    BASELINE_WINDOW most recent uploads with views (all of them if 0).
+    The method and baseline columns are filled in when they are scored.
+    """
+    conn.executemany("""
+        INSERT INTO creator_baselines (creator_id, video_count, view_sum, log_sum, log_sq_sum)
+        SELECT :creator_id, COUNT(*), COALESCE(SUM(view_count), 0), COALESCE(SUM(log_views), 0),
+               COALESCE(SUM(log_views * log_views), 0)
+        FROM (
+            SELECT view_count, log1p(view_count) AS log_views FROM videos
+            WHERE creator_id = :creator_id AND view_count > 0
+            ORDER BY COALESCE(CAST(REPLACE(upload_date, '-', '') AS INTEGER), 0) DESC, id DESC
+            LIMIT :window
+        )
+        WHERE true
+        ON CONFLICT(creator_id) DO UPDATE SET
+            video_count = excluded.video_count,
+            view_sum = excluded.view_sum,
+            log_sum = excluded.log_sum,
+            log_sq_sum = excluded.log_sq_sum,
+            updated_at = CURRENT_TIMESTAMP
+    """, [{'creator_id': creator_id, 'window': BASELINE_WINDOW or -1} for creator_id in creator_ids])
+
+def bulk_upsert_videos(batches, rescore: bool = False) -> dict:
+    """
+    Insert or update videos for many creators in a single transaction.
+    The creator_baselines statistics of creators whose view counts changed
+    are recomputed over their rolling window, a video_metrics snapshot is
+    added for every video whose views, likes or comments changed, and
+    views_per_hour is recomputed for every video in the batch.
+
+    Args:
+        batches: {creator_id: [video, ...]} or an iterable of (creator_id, videos)
+        rescore: Ignore the batch's own outlier_score and score the written
+                 creators against their stored history (whole-library scores
+                 only change for creators that got new rows)
+
+    Returns:
+        Counts of rows {'inserted': n, 'updated': n, 'unchanged': n}
+    """
+    if isinstance(batches, dict):
+        batches = batches.items()
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    rows = []
+    synced_creators = []
+    # Creators whose baseline may have moved
+    changed_views = set()
+    snapshots = []
+    batch_keys = {}
+    now = int(time.time())
+
+    with transaction(write=True) as conn:
+        for creator_id, videos in batches:
+            synced_creators.append((creator_id,))
+
+            existing = {
+                r['platform_video_id']: r for r in conn.execute("""
+                    SELECT platform_video_id, view_count, like_count, comment_count,
+                           outlier_score, video_url
+                    FROM videos WHERE creator_id = ?
+                """, (creator_id,))
+            }
+
+            # Last occurrence wins if a batch repeats a video
+            batch_rows = {}
+            for video in videos:
+                row = _video_row(creator_id, video)
+                batch_rows[row[1]] = row
+
+            batch_keys[creator_id] = list(batch_rows)
+            for video_id, row in batch_rows.items():
+                current = existing.get(video_id)
+                if rescore:
+                    # Scored below; keep the stored score until then
+                    row = row[:11] + (current['outlier_score'] if current else 0,)
+                if current is None:
+                    counts['inserted'] += 1
+                elif _is_unchanged(current, row):
+                    counts['unchanged'] += 1
+                    continue
+                else:
+                    counts['updated'] += 1
+                rows.append(row)
+                if current is None or _metrics_changed(current, row):
+                    snapshots.append((now, creator_id, video_id))
+
+                if (current['view_count'] if current else None) != row[5]:
+                    changed_views.add(creator_id)
+
+        conn.executemany(UPSERT_VIDEO_SQL, rows)
+        conn.executemany("""
+            UPDATE creators SET last_synced = CURRENT_TIMESTAMP WHERE id = ?
+        """, synced_creators)
+        _refresh_baselines(conn, list(changed_views))
+        conn.executemany("""
+            INSERT OR REPLACE INTO video_metrics (video_id, ts, views, likes, comments)
+            SELECT id, ?, view_count, like_count, comment_count
+            FROM videos WHERE creator_id = ? AND platform_video_id = ?
+        """, snapshots)
+
+        video_ids = []
+        for creator_id, keys in batch_keys.items():
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                video_ids += [row[0] for row in conn.execute(f"""
+                    SELECT id FROM videos
+                    WHERE creator_id = ? AND platform_video_id IN ({','.join('?' * len(chunk))})
+                """, (creator_id, *chunk))]
+        _update_velocity(conn, video_ids, now)
+
+        if rescore and changed_views:
+            _score_against_baselines(conn, list(changed_views))
+
+    return counts
+
+def upsert_videos(creator_id: int, videos: list, rescore: bool = False) -> dict:
+    """Insert or update videos for a creator. Returns bulk_upsert_videos counts."""
+    return bulk_upsert_videos({creator_id: videos}, rescore=rescore)
+
+def _score_against_baselines(conn, creator_ids: list, method: str = None) -> int:
+    """
+    Rescore creators' videos from their stored creator_baselines, in SQL,
+    without reading the videos back. Methods that need every view count
+    (median, percentiles) fall back to _rescore for just these creators.
+    Returns the number of videos whose score changed.
+    """
+    method = method or DEFAULT_METHOD
+    if method not in INCREMENTAL_METHODS:
+        return _rescore(conn, creator_ids, method)
+
+    updated = 0
+    for creator_id in creator_ids:
+        stats = conn.execute("""
+            SELECT video_count, view_sum, log_sum, log_sq_sum FROM creator_baselines WHERE creator_id = ?
+        """, (creator_id,)).fetchone()
+        center, spread, baseline = baseline_from_stats(*(stats or (0, 0, 0, 0)), method=method)
+        if center is None or (method == 'log_zscore' and not spread):
+            score = "0"
+        elif method == 'mean':
+            score = "CASE WHEN view_count > 0 THEN ROUND(view_count / :center, 2) ELSE 0 END"
+        else:
+            score = "CASE WHEN view_count > 0 THEN ROUND((log1p(view_count) - :center) / :spread, 2) ELSE 0 END"
+        updated += conn.execute(f"""
+            UPDATE videos SET outlier_score = {score}
+            WHERE creator_id = :creator_id AND outlier_score IS NOT {score}
+        """, {'creator_id': creator_id, 'center': center, 'spread': spread}).rowcount
+        conn.execute("""
+            UPDATE creator_baselines SET method = ?, baseline = ? WHERE creator_id = ?
+        """, (method, baseline, creator_id))
+    return updated
+
+# Indexes on outlier_score, and how many changed scores make rebuilding them cheaper
+SCORE_INDEXES = ('idx_videos_outlier_score', 'idx_videos_creator_score')
+BULK_RESCORE_ROWS = 100_000
+
+def rescore_creators(creator_ids: list = None, method: str = None) -> int:
+    """
+    Recompute outlier_score for stored videos against each creator's own
+    baseline (scoring.compute_scores over the creator's BASELINE_WINDOW most
+    recent uploads; zero-view rows don't count toward it),
+    for the given creators or, with creator_ids=None, the whole library in
+    one vectorized pass. Rebuilds the creators' creator_baselines from their
+    videos too. Syncs keep scores current through
+    bulk_upsert_videos(rescore=True); rescore_stale_creators catches up
+    after the scoring method changes.
+
+    Returns:
+        Number of videos whose score changed
+    """
+    if creator_ids is not None and not creator_ids:
+        return 0
+    with transaction(write=True) as conn:
+        return _rescore(conn, creator_ids, method)
+
+def rescore_stale_creators(method: str = None) -> int:
+    """
+    Rescore creators whose stored scores aren't from their baseline under
+    method (DEFAULT_METHOD if None): no creator_baselines row yet (stored
+    before baselines existed), or last scored with another method (e.g.
+    CONTENT_ENGINE_SCORING_BASELINE was changed). Checked in a read
+    transaction: nothing is written when all are current.
+
+    Returns:
+        Number of videos whose score changed
+    """
+    method = method or DEFAULT_METHOD
+    with transaction() as conn:
+        creator_ids = [row[0] for row in conn.execute("""
+            SELECT c.id FROM creators c
+            LEFT JOIN creator_baselines b ON b.creator_id = c.id
+            WHERE (b.creator_id IS NULL OR b.method IS NOT ?)
+              AND EXISTS (SELECT 1 FROM videos v WHERE v.creator_id = c.id)
+        """, (method,))]
+    return rescore_creators(creator_ids, method)
+
+def _rescore(conn, creator_ids: list = None, method: str = None) -> int:
+    method = method or DEFAULT_METHOD
     cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples straight into NumPy
+    # upload_date as YYYYMMDD whichever way it was stored (NULL: oldest)
+    select = """
+        SELECT id, creator_id, view_count, outlier_score,
+               COALESCE(CAST(REPLACE(upload_date, '-', '') AS INTEGER), 0)
+        FROM videos
+    """
+    if creator_ids is None:
+        rows = cursor.execute(select).fetchall()
+    else:
+        rows = []
+        ids = list(creator_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows += cursor.execute(f"{select} WHERE creator_id IN ({','.join('?' * len(chunk))})",
+                                   chunk).fetchall()
+    if not rows:
+        return 0
 
-    try:
-        for video in videos:
-            cursor.execute("""
-                INSERT INTO videos (
-                    creator_id, platform_video_id, title, url, video_url, view_count,
-                    like_count, comment_count, duration, upload_date,
-                    thumbnail, outlier_score, synced_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(creator_id, platform_video_id) DO UPDATE SET
-                    view_count = excluded.view_count,
-                    like_count = excluded.like_count,
-                    comment_count = excluded.comment_count,
-                    outlier_score = excluded.outlier_score,
-                    video_url = COALESCE(excluded.video_url, videos.video_url),
-                    synced_at = CURRENT_TIMESTAMP
-            """, (
-                creator_id,
-                video.get('id') or video.get('platform_video_id'),
-                video.get('title'),
-                video.get('url'),
-                video.get('video_url'),  # Direct video URL for transcription (Instagram)
-                video.get('view_count', 0),
-                video.get('like_count', 0),
-                video.get('comment_count', 0),
-                video.get('duration'),
-                video.get('upload_date'),
-                video.get('thumbnail'),
-                video.get('outlier_score', 0)
-            ))
-        conn.commit()
-        update_creator_sync_time(creator_id)
-    finally:
-        conn.close()
+    columns = np.array(rows, dtype=float)
+    in_window = recent_in_group(columns[:, 2], columns[:, 1], [columns[:, 4], columns[:, 0]],
+                                BASELINE_WINDOW)
+    scores, baselines = compute_scores(columns[:, 2], groups=columns[:, 1], method=method,
+                                       in_baseline=in_window)
+    changed = np.isnan(columns[:, 3]) | (np.abs(scores - columns[:, 3]) >= 0.005)
+    updates = zip(scores[changed].tolist(), columns[changed, 0].astype(np.int64).tolist())
+
+    if changed.sum() < BULK_RESCORE_ROWS:
+        conn.executemany("UPDATE videos SET outlier_score = ? WHERE id = ?", updates)
+    else:
+        # Rebuilding the score indexes once beats updating them row by row (~2x at 1M rows)
+        indexes = conn.execute(f"""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND name IN ({','.join('?' * len(SCORE_INDEXES))})
+        """, SCORE_INDEXES).fetchall()
+        for index in indexes:
+            conn.execute(f"DROP INDEX {index['name']}")
+        conn.executemany("UPDATE videos SET outlier_score = ? WHERE id = ?", updates)
+        for index in indexes:
+            conn.execute(index['sql'])
+
+    # The same sums _refresh_baselines keeps, from the rows already in hand
+    keys, count, view_sum, log_sum, log_sq_sum = grouped_view_stats(
+        np.where(in_window, columns[:, 2], 0), columns[:, 1]
+    )
+    first_row = np.unique(columns[:, 1], return_index=True)[1]
+    conn.executemany("""
+        INSERT OR REPLACE INTO creator_baselines
+            (creator_id, video_count, view_sum, log_sum, log_sq_sum, method, baseline, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """, [
+        (int(key), int(n), float(total), float(logs), float(squares), method,
+         None if np.isnan(baseline) else float(baseline))
+        for key, n, total, logs, squares, baseline in zip(
+            keys, count, view_sum, log_sum, log_sq_sum, baselines[first_row]
+        )
+    ])
+    return int(changed.sum())
+
+def get_videos_to_enrich(min_score: float = 2.0, new_within: int = 48 * 3600,
+                         refresh_after: int = 24 * 3600, limit: int = 100) -> list:
+    """
+    YouTube videos due for engagement enrichment, highest score first:
+    never-enriched videos synced in the last new_within seconds, plus videos
+    scoring at least min_score whose enrichment is older than refresh_after.
+    Not cached: the result depends on the clock.
+    """
+    with transaction() as conn:
+        rows = conn.execute("""
+            SELECT v.id, v.creator_id, v.platform_video_id, v.url, v.outlier_score,
+                   v.like_count, v.comment_count
+            FROM videos v
+            CROSS JOIN creators c ON v.creator_id = c.id
+            LEFT JOIN video_enrichment e ON e.platform_video_id = v.platform_video_id
+            WHERE c.platform = 'youtube'
+              AND (e.enriched_at IS NULL OR e.enriched_at < datetime('now', ?))
+              AND (v.outlier_score >= ? OR (e.enriched_at IS NULL AND v.synced_at >= datetime('now', ?)))
+            ORDER BY v.outlier_score DESC, v.id DESC
+            LIMIT ?
+        """, (f"-{int(refresh_after)} seconds", min_score, f"-{int(new_within)} seconds", limit))
+        return [dict(row) for row in rows.fetchall()]
+
+def save_video_engagement(results: dict) -> int:
+    """
+    Record enrichment results {videos.id: {'platform_video_id', 'like_count',
+    'comment_count'}}. Every result is remembered in video_enrichment, but
+    videos rows are only written when a counter actually changed.
+
+    Returns:
+        Number of videos rows updated
+    """
+    with transaction(write=True) as conn:
+        conn.executemany("""
+            INSERT INTO video_enrichment (platform_video_id, like_count, comment_count) VALUES (?, ?, ?)
+            ON CONFLICT(platform_video_id) DO UPDATE SET
+                like_count = excluded.like_count,
+                comment_count = excluded.comment_count,
+                enriched_at = CURRENT_TIMESTAMP
+        """, [(m['platform_video_id'], m.get('like_count'), m.get('comment_count')) for m in results.values()])
+
+        updated = []
+        for video_id, m in results.items():
+            cursor = conn.execute("""
+                UPDATE videos
+                SET like_count = COALESCE(?, like_count), comment_count = COALESCE(?, comment_count)
+                WHERE id = ?
+                  AND (like_count IS NOT COALESCE(?, like_count)
+                       OR comment_count IS NOT COALESCE(?, comment_count))
+            """, (m.get('like_count'), m.get('comment_count'), video_id,
+                  m.get('like_count'), m.get('comment_count')))
+            if cursor.rowcount:
+                updated.append(video_id)
+
+        now = int(time.time())
+        conn.executemany("""
+            INSERT OR REPLACE INTO video_metrics (video_id, ts, views, likes, comments)
+            SELECT id, ?, view_count, like_count, comment_count FROM videos WHERE id = ?
+        """, [(now, video_id) for video_id in updated])
+        return len(updated)
+
+# Velocity is growth between snapshots at least MIN_VELOCITY_SPAN apart,
+# measured from the oldest snapshot inside VELOCITY_WINDOW
+VELOCITY_WINDOW = 48 * 3600
+MIN_VELOCITY_SPAN = 3600
+
+def _upload_timestamp(upload_date: str) -> int:
+    """Unix time of an upload_date ('YYYY-MM-DD' or yt-dlp's 'YYYYMMDD'), or None."""
+    for fmt in ('%Y-%m-%d', '%Y%m%d'):
+        try:
+            return int(datetime.strptime(upload_date, fmt).replace(tzinfo=timezone.utc).timestamp())
+        except (TypeError, ValueError):
+            continue
+    return None
 
+def _update_velocity(conn, video_ids: list, now: int):
+    """
+    Recompute views_per_hour: recent growth from video_metrics when there
+    are snapshots far enough apart, otherwise lifetime views per hour since
+    upload. Videos with neither (no upload date, seen once) get 0.
+    """
+    updates = []
+    for start in range(0, len(video_ids), 500):
+        chunk = video_ids[start:start + 500]
+        rows = conn.execute(f"""
+            SELECT v.id, v.view_count, v.upload_date, v.views_per_hour, m.ts AS start_ts, m.views AS start_views
+            FROM videos v
+            LEFT JOIN video_metrics m ON m.video_id = v.id AND m.ts = (
+                SELECT MIN(ts) FROM video_metrics
+                WHERE video_id = v.id AND ts BETWEEN ? AND ?
+            )
+            WHERE v.id IN ({','.join('?' * len(chunk))})
+        """, (now - VELOCITY_WINDOW, now - MIN_VELOCITY_SPAN, *chunk)).fetchall()
+
+        for row in rows:
+            views = row['view_count'] or 0
+            uploaded = _upload_timestamp(row['upload_date'])
+            if row['start_ts'] is not None:
+                velocity = max(0, views - (row['start_views'] or 0)) * 3600 / (now - row['start_ts'])
+            elif uploaded is not None:
+                velocity = views * 3600 / max(3600, now - uploaded)
+            else:
+                velocity = 0.0
+            velocity = round(velocity, 1)
+            if velocity != row['views_per_hour']:
+                updates.append((velocity, row['id']))
+    conn.executemany("UPDATE videos SET views_per_hour = ? WHERE id = ?", updates)
+
+def backfill_velocity(limit: int = 5000) -> int:
+    """
+    Compute views_per_hour for videos flagged velocity_pending (stored
+    before video_metrics existed, and not re-synced since). Each video is
+    computed once, even when its velocity rounds to 0.
+
+    Returns:
+        Videos computed
+    """
+    with transaction() as conn:
+        video_ids = [row[0] for row in conn.execute("""
+            SELECT id FROM videos
+            WHERE velocity_pending = 1
+            ORDER BY id DESC
+            LIMIT ?
+        """, (limit,))]
+    if video_ids:
+        with transaction(write=True) as conn:
+            _update_velocity(conn, video_ids, int(time.time()))
+            conn.executemany("UPDATE videos SET velocity_pending = 0 WHERE id = ?",
+                             [(video_id,) for video_id in video_ids])
+    return len(video_ids)
+
+def compact_video_metrics(hourly_after: int = 2 * 86400, daily_after: int = 30 * 86400,
+                          retention: int = 365 * 86400) -> int:
+    """
+    Bound video_metrics: snapshots older than hourly_after are thinned to
+    the last one per video per hour, older than daily_after to one per
+    day, and anything older than retention is dropped, except each
+    video's latest snapshot.
+
+    Returns:
+        Snapshots deleted
+    """
+    now = int(time.time())
+    deleted = 0
+    with transaction(write=True) as conn:
+        for newer_than, older_than, bucket in ((now - daily_after, now - hourly_after, 3600),
+                                               (0, now - daily_after, 86400)):
+            deleted += conn.execute("""
+                DELETE FROM video_metrics
+                WHERE ts >= ? AND ts < ?
+                  AND (video_id, ts) NOT IN (
+                      SELECT video_id, MAX(ts) FROM video_metrics
+                      WHERE ts >= ? AND ts < ?
+                      GROUP BY video_id, ts / ?
+                  )
+            """, (newer_than, older_than, newer_than, older_than, bucket)).rowcount
+        deleted += conn.execute("""
+            DELETE FROM video_metrics
+            WHERE ts < ?
+              AND ts < (SELECT MAX(ts) FROM video_metrics latest WHERE latest.video_id = video_metrics.video_id)
+        """, (now - retention,)).rowcount
+    return deleted
+
+@_cached
+def get_video_metrics(video_id: int) -> list:
+    """A video's snapshots, oldest first: [{'ts', 'views', 'likes', 'comments'}, ...]."""
+    with transaction() as conn:
+        rows = conn.execute("""
+            SELECT ts, views, likes, comments FROM video_metrics WHERE video_id = ? ORDER BY ts
+        """, (video_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+@_cached
 def get_videos_for_creator(creator_id: int, limit: int = 50) -> list:
     """Get videos for a specific creator."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction() as conn:
+        cursor = conn.execute("""
             SELECT * FROM videos
             WHERE creator_id = ?
             ORDER BY outlier_score DESC
             LIMIT ?
         """, (creator_id, limit))
         return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
 
-def get_all_outliers(min_score: float = 2.0, limit: int = 100) -> list:
-    """Get top outliers across all creators."""
-    conn = get_connection()
-    cursor = conn.cursor()
+@_cached
+def get_known_video_ids(creator_id: int) -> list:
+    """platform_video_ids already stored for a creator (for incremental sync)."""
+    with transaction() as conn:
+        return [row[0] for row in conn.execute("""
+            SELECT platform_video_id FROM videos WHERE creator_id = ?
+        """, (creator_id,))]
 
-    try:
-        cursor.execute("""
+@_cached
+def get_top_videos_by_creator(per_creator: int = 5, creator_ids: list = None) -> dict:
+    """
+    Get each creator's top videos by outlier score in one windowed query.
+
+    Args:
+        per_creator: Videos to return per creator
+        creator_ids: Limit to these creators (default: every creator)
+
+    Returns:
+        {creator_id: [video, ...]} best first; creators without videos are absent
+    """
+    if creator_ids is None:
+        chunks = [None]
+    else:
+        ids = list(creator_ids)
+        # Stay under SQLite's bound-parameter limit; creators never span chunks
+        chunks = [ids[start:start + 500] for start in range(0, len(ids), 500)]
+
+    rows = []
+    with transaction() as conn:
+        for chunk in chunks:
+            where = f"WHERE creator_id IN ({', '.join('?' * len(chunk))})" if chunk is not None else ""
+            rows += conn.execute(f"""
+                SELECT * FROM (
+                    SELECT v.*,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY creator_id ORDER BY outlier_score DESC
+                           ) AS creator_rank
+                    FROM videos v
+                    {where}
+                )
+                WHERE creator_rank <= ?
+                ORDER BY creator_id, creator_rank
+            """, (*(chunk or ()), per_creator)).fetchall()
+
+    grouped = {}
+    for row in rows:
+        video = dict(row)
+        del video['creator_rank']
+        grouped.setdefault(video['creator_id'], []).append(video)
+    return grouped
+
+# Feed orderings: rank column, each walked through its own (column DESC, id DESC) index
+FEED_ORDERS = {'score': 'outlier_score', 'velocity': 'views_per_hour'}
+
+@_cached
+def get_all_outliers(min_score: float = 2.0, limit: int = 100, platform: str = None,
+                     cursor: tuple = None, order: str = 'score') -> list:
+    """
+    Get top outliers across all creators, best first.
+
+    Args:
+        min_score: Minimum outlier score
+        limit: Max rows to return
+        platform: Only this platform ('youtube', 'instagram'); None or 'all' for every platform
+        cursor: (rank value, id) of the last row already shown; returns the rows after it
+        order: 'score' (outlier_score) or 'velocity' (views_per_hour)
+    """
+    if order not in FEED_ORDERS:
+        raise ValueError(f"Unknown feed order: {order}")
+    column = FEED_ORDERS[order]
+    where = ["v.outlier_score >= ?"]
+    params = [min_score]
+
+    if platform and platform.lower() != 'all':
+        where.append("c.platform = ?")
+        params.append(platform.lower())
+
+    if cursor is not None:
+        where.append(f"(v.{column}, v.id) < (?, ?)")
+        params.extend(cursor)
+
+    # CROSS JOIN pins the join order: walk the rank index and stop after
+    # `limit` matches instead of sorting every video of a platform.
+    with transaction() as conn:
+        rows = conn.execute(f"""
             SELECT v.*, c.username, c.platform, c.display_name as creator_name
             FROM videos v
-            JOIN creators c ON v.creator_id = c.id
+            CROSS JOIN creators c ON v.creator_id = c.id
+            WHERE {' AND '.join(where)}
+            ORDER BY v.{column} DESC, v.id DESC
+            LIMIT ?
+        """, (*params, limit))
+        return [dict(row) for row in rows.fetchall()]
+
+@_cached
+def get_outlier_page(min_score: float = 2.0, page_size: int = 25, platform: str = None,
+                     cursor: tuple = None, order: str = 'score') -> tuple:
+    """
+    Get one page of the outlier feed using keyset (seek) pagination.
+
+    Returns:
+        (rows, next_cursor) where next_cursor is None on the last page.
+        Pass next_cursor back in to get the following page; cost does not
+        grow with page depth the way OFFSET does.
+    """
+    rows = get_all_outliers(min_score=min_score, limit=page_size + 1, platform=platform,
+                            cursor=cursor, order=order)
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1][FEED_ORDERS[order]], rows[-1]['id'])
+
+@_cached
+def get_feed_stats(min_score: float = 1.0, hot_score: float = 3.0) -> dict:
+    """
+    Get Outlier Feed counts without fetching any video rows. Videos are
+    aggregated index-only from idx_videos_creator_score.
+
+    Returns:
+        {'creators': n, 'videos': n, 'hot_outliers': n,
+         'platforms': {platform: videos, ...}} for videos scoring >= min_score
+    """
+    with transaction() as conn:
+        rows = conn.execute("""
+            SELECT c.platform,
+                   COUNT(*) AS videos,
+                   SUM(v.outlier_score >= ?) AS hot_outliers
+            FROM creators c
+            JOIN videos v ON v.creator_id = c.id
             WHERE v.outlier_score >= ?
-            ORDER BY v.outlier_score DESC
+            GROUP BY c.platform
+        """, (hot_score, min_score)).fetchall()
+        creators = conn.execute("SELECT COUNT(*) FROM creators").fetchone()[0]
+
+    return {
+        'creators': creators,
+        'videos': sum(row['videos'] for row in rows),
+        'hot_outliers': sum(row['hot_outliers'] for row in rows),
+        'platforms': {row['platform']: row['videos'] for row in rows},
+    }
+
+@_cached
+def get_videos_needing_transcripts(platform: str = None, min_score: float = 0, limit: int = 50) -> list:
+    """Get the highest-scoring videos that have no transcript yet."""
+    where = ["v.outlier_score >= ?", "(v.transcript IS NULL OR v.transcript = '')"]
+    params = [min_score]
+    if platform and platform.lower() != 'all':
+        where.append("c.platform = ?")
+        params.append(platform.lower())
+
+    with transaction() as conn:
+        rows = conn.execute(f"""
+            SELECT v.*, c.username, c.platform, c.display_name as creator_name
+            FROM videos v
+            CROSS JOIN creators c ON v.creator_id = c.id
+            WHERE {' AND '.join(where)}
+            ORDER BY v.outlier_score DESC, v.id DESC
             LIMIT ?
-        """, (min_score, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+        """, (*params, limit))
+        return [dict(row) for row in rows.fetchall()]
 
+@_cached
 def get_video_by_id(video_id: int) -> dict:
     """Get single video by ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction() as conn:
+        row = conn.execute("""
             SELECT v.*, c.username, c.platform, c.display_name as creator_name
             FROM videos v
             JOIN creators c ON v.creator_id = c.id
             WHERE v.id = ?
-        """, (video_id,))
-        row = cursor.fetchone()
+        """, (video_id,)).fetchone()
         return dict(row) if row else None
-    finally:
-        conn.close()
 
 def save_transcript(video_id: int, transcript: str):
     """Save transcript for a video."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction(write=True) as conn:
+        conn.execute("""
             UPDATE videos SET transcript = ? WHERE id = ?
         """, (transcript, video_id))
-        conn.commit()
-    finally:
-        conn.close()
+        # Fetched by hand in Remix Studio: the background job is no longer needed
+        conn.execute("""
+            UPDATE transcription_jobs SET status = 'done', updated_at = CURRENT_TIMESTAMP
+            WHERE video_id = ? AND status IN ('queued', 'failed')
+        """, (video_id,))
+
+# ============================================
+# TRANSCRIPTION JOBS
+# ============================================
+
+def enqueue_transcription_jobs(min_score: float = 3.0) -> int:
+    """
+    Queue every video at or above min_score that has no transcript and no job.
+    Queued jobs are re-prioritised with the video's current score.
+
+    Returns:
+        Number of newly queued jobs
+    """
+    with transaction(write=True) as conn:
+        cursor = conn.execute("""
+            INSERT OR IGNORE INTO transcription_jobs (video_id, priority)
+            SELECT id, outlier_score FROM videos
+            WHERE outlier_score >= ? AND (transcript IS NULL OR transcript = '')
+        """, (min_score,))
+        queued = cursor.rowcount
+        conn.execute("""
+            UPDATE transcription_jobs
+            SET priority = (SELECT outlier_score FROM videos WHERE videos.id = transcription_jobs.video_id)
+            WHERE status = 'queued'
+        """)
+        return queued
+
+def claim_transcription_jobs(limit: int = 10, platform: str = None, stale_after: int = 1800) -> list:
+    """
+    Mark the highest-priority queued jobs as running and return them with
+    their video (url, video_url, duration, platform). Jobs left running for
+    stale_after seconds (e.g. the app was restarted mid-run) are requeued first.
+    """
+    where = ["j.status = 'queued'"]
+    params = []
+    if platform:
+        where.append("c.platform = ?")
+        params.append(platform.lower())
+
+    with transaction(write=True) as conn:
+        conn.execute("""
+            UPDATE transcription_jobs SET status = 'queued'
+            WHERE status = 'running' AND updated_at < datetime('now', ?)
+        """, (f"-{int(stale_after)} seconds",))
+        rows = conn.execute(f"""
+            SELECT j.video_id, j.priority, j.attempts, v.url, v.video_url, v.duration,
+                   v.title, c.platform
+            FROM transcription_jobs j
+            JOIN videos v ON v.id = j.video_id
+            JOIN creators c ON c.id = v.creator_id
+            WHERE {' AND '.join(where)}
+            ORDER BY j.priority DESC, j.video_id DESC
+            LIMIT ?
+        """, (*params, limit)).fetchall()
+        conn.executemany("""
+            UPDATE transcription_jobs
+            SET status = 'running', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE video_id = ?
+        """, [(row['video_id'],) for row in rows])
+        return [dict(row, attempts=row['attempts'] + 1) for row in rows]
+
+def release_transcription_jobs(video_ids: list):
+    """Put claimed jobs back in the queue without counting the attempt (e.g. over budget)."""
+    with transaction(write=True) as conn:
+        conn.executemany("""
+            UPDATE transcription_jobs
+            SET status = 'queued', attempts = MAX(attempts - 1, 0), updated_at = CURRENT_TIMESTAMP
+            WHERE video_id = ? AND status = 'running'
+        """, [(video_id,) for video_id in video_ids])
+
+def finish_transcription_job(video_id: int, transcript: str = None, error: str = None,
+                             cost_usd: float = 0.0, retry: bool = True, max_attempts: int = 3):
+    """
+    Record a job result. A transcript is saved to the video and the job is
+    done; an error requeues the job until max_attempts, unless retry=False.
+    """
+    with transaction(write=True) as conn:
+        if transcript is not None:
+            conn.execute("UPDATE videos SET transcript = ? WHERE id = ?", (transcript, video_id))
+            status = 'done'
+        else:
+            attempts = conn.execute(
+                "SELECT attempts FROM transcription_jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            retryable = retry and attempts is not None and attempts['attempts'] < max_attempts
+            status = 'queued' if retryable else 'failed'
+        conn.execute("""
+            UPDATE transcription_jobs
+            SET status = ?, error = ?, cost_usd = cost_usd + ?, updated_at = CURRENT_TIMESTAMP
+            WHERE video_id = ?
+        """, (status, error, cost_usd, video_id))
+
+@_cached
+def get_transcription_job_stats() -> dict:
+    """Job counts by status plus total AssemblyAI spend."""
+    with transaction() as conn:
+        stats = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0, 'cost_usd': 0.0}
+        for row in conn.execute("""
+            SELECT status, COUNT(*) as jobs, COALESCE(SUM(cost_usd), 0) as cost_usd
+            FROM transcription_jobs GROUP BY status
+        """):
+            stats[row['status']] = row['jobs']
+            stats['cost_usd'] += row['cost_usd']
+        stats['cost_usd'] = round(stats['cost_usd'], 4)
+        return stats
+
+# ============================================
+# JOB QUEUE (worker.py)
+# ============================================
+
+def _job_dict(row) -> dict:
+    job = dict(row)
+    job['payload'] = json.loads(job['payload'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    job['progress'] = json.loads(job['progress']) if job['progress'] else None
+    return job
+
+def enqueue_job(kind: str, payload: dict = None, dedupe_key: str = None,
+                max_attempts: int = 3, delay: int = 0) -> int:
+    """
+    Queue a job for worker.py. If dedupe_key matches a job that is still
+    queued or running, that job's ID is returned instead of adding another.
+    """
+    with transaction(write=True) as conn:
+        if dedupe_key is not None:
+            row = conn.execute("""
+                SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')
+            """, (dedupe_key,)).fetchone()
+            if row:
+                return row['id']
+        return conn.execute("""
+            INSERT INTO jobs (kind, payload, dedupe_key, max_attempts, run_after)
+            VALUES (?, ?, ?, ?, ?)
+        """, (kind, json.dumps(payload or {}), dedupe_key, max_attempts, int(time.time()) + delay)).lastrowid
+
+def claim_jobs(worker: str, kinds: list = None, limit: int = 1, lease: int = 600) -> list:
+    """
+    Lease up to limit due jobs to worker, oldest first: queued jobs whose
+    run_after has passed, and running jobs whose lease lapsed (the worker
+    died). Lapsed jobs already out of attempts are dead-lettered instead.
+    Not cached: the result depends on the clock.
+    """
+    now = int(time.time())
+    kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+    with transaction(write=True) as conn:
+        conn.execute(f"""
+            UPDATE jobs
+            SET status = 'dead', lease_until = NULL, updated_at = CURRENT_TIMESTAMP,
+                error = COALESCE(error || '; ', '') || 'lease expired on attempt ' || attempts
+            WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts {kind_filter}
+        """, (now, *(kinds or ())))
+        ids = [row[0] for row in conn.execute(f"""
+            SELECT id FROM jobs
+            WHERE ((status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_until < ?))
+              {kind_filter}
+            ORDER BY run_after, id
+            LIMIT ?
+        """, (now, now, *(kinds or ()), limit))]
+        conn.executemany("""
+            UPDATE jobs
+            SET status = 'running', attempts = attempts + 1, lease_until = ?, worker = ?,
+                progress = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [(now + lease, worker, job_id) for job_id in ids])
+        return [_job_dict(row) for row in conn.execute(f"""
+            SELECT * FROM jobs WHERE id IN ({','.join('?' * len(ids))}) ORDER BY run_after, id
+        """, ids)] if ids else []
+
+def extend_job_lease(job_id: int, worker: str, lease: int = 600) -> bool:
+    """Push a running job's lease forward. False if worker no longer holds it."""
+    with transaction(write=True) as conn:
+        return conn.execute("""
+            UPDATE jobs SET lease_until = ?
+            WHERE id = ? AND worker = ? AND status = 'running'
+        """, (int(time.time()) + lease, job_id, worker)).rowcount > 0
+
+def set_job_progress(job_id: int, worker: str, progress: dict) -> bool:
+    """Record a running job's progress for the app. False if worker no longer holds it."""
+    with transaction(write=True) as conn:
+        return conn.execute("""
+            UPDATE jobs SET progress = ?
+            WHERE id = ? AND worker = ? AND status = 'running'
+        """, (json.dumps(progress), job_id, worker)).rowcount > 0
+
+def finish_job(job_id: int, worker: str, result: dict = None, error: str = None,
+               retry: bool = True, backoff: int = 60) -> str:
+    """
+    Record the outcome of a leased job. An error requeues it after
+    backoff * 2^(attempts - 1) seconds until max_attempts (or straight
+    away to 'dead' with retry=False).
+
+    Returns:
+        The new status, or None if worker had lost the lease
+    """
+    with transaction(write=True) as conn:
+        job = conn.execute("""
+            SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'running'
+        """, (job_id, worker)).fetchone()
+        if job is None:
+            return None
+        if error is None:
+            status, run_after = 'done', None
+        elif retry and job['attempts'] < job['max_attempts']:
+            status, run_after = 'queued', int(time.time()) + backoff * 2 ** (job['attempts'] - 1)
+        else:
+            status, run_after = 'dead', None
+        conn.execute("""
+            UPDATE jobs
+            SET status = ?, run_after = COALESCE(?, run_after), lease_until = NULL,
+                result = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, run_after, json.dumps(result) if result is not None else None, error, job_id))
+        return status
+
+def retry_job(job_id: int) -> bool:
+    """Requeue a dead job with a fresh set of attempts."""
+    with transaction(write=True) as conn:
+        return conn.execute("""
+            UPDATE jobs
+            SET status = 'queued', attempts = 0, run_after = ?, error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'dead'
+        """, (int(time.time()), job_id)).rowcount > 0
+
+@_cached
+def get_job(job_id: int) -> dict:
+    """One job with payload and result decoded, or None."""
+    with transaction() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_dict(row) if row else None
+
+@_cached
+def get_jobs(statuses: list = None, kinds: list = None, limit: int = 20) -> list:
+    """Most recently updated jobs first, optionally filtered by status and kind."""
+    where, params = [], []
+    if statuses:
+        where.append(f"status IN ({','.join('?' * len(statuses))})")
+        params += statuses
+    if kinds:
+        where.append(f"kind IN ({','.join('?' * len(kinds))})")
+        params += kinds
+    with transaction() as conn:
+        rows = conn.execute(f"""
+            SELECT * FROM jobs {'WHERE ' + ' AND '.join(where) if where else ''}
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?
+        """, (*params, limit)).fetchall()
+        return [_job_dict(row) for row in rows]
+
+@_cached
+def get_job_stats() -> dict:
+    """Job counts by status."""
+    with transaction() as conn:
+        stats = {'queued': 0, 'running': 0, 'done': 0, 'dead': 0}
+        for row in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            stats[row[0]] = row[1]
+        return stats
+
+def purge_jobs(older_than: int = 7 * 86400) -> int:
+    """Delete done jobs last updated more than older_than seconds ago. Returns rows deleted."""
+    with transaction(write=True) as conn:
+        return conn.execute("""
+            DELETE FROM jobs WHERE status = 'done' AND updated_at < datetime('now', ?)
+        """, (f"-{int(older_than)} seconds",)).rowcount
+
+# ============================================
+# TRANSCRIPT CACHE
+# ============================================
+
+def get_cached_transcript(keys: list, ttl_seconds: int) -> str:
+    """
+    Look up a cached transcript by any of keys. A hit refreshes its LRU
+    timestamp and links the other keys to it; an expired entry is deleted.
+
+    Returns:
+        Transcript text, or None on a miss
+    """
+    if not keys:
+        return None
+    placeholders = ",".join("?" * len(keys))
+    # Misses are the common case while a batch is new: keep them off the write queue
+    with transaction() as conn:
+        row = conn.execute(f"""
+            SELECT b.content_hash, b.transcript, b.created_at < datetime('now', ?) as expired
+            FROM transcript_keys k
+            JOIN transcript_blobs b ON b.content_hash = k.content_hash
+            WHERE k.cache_key IN ({placeholders})
+            LIMIT 1
+        """, (f"-{int(ttl_seconds)} seconds", *keys)).fetchone()
+    if row is None:
+        return None
+
+    with transaction(write=True) as conn:
+        if row['expired']:
+            _delete_transcript_blobs(conn, [row['content_hash']])
+            return None
+
+        touched = conn.execute("""
+            UPDATE transcript_blobs SET last_used_at = CURRENT_TIMESTAMP WHERE content_hash = ?
+        """, (row['content_hash'],)).rowcount
+        # Evicted since the read: don't point keys at a missing transcript
+        if touched:
+            conn.executemany("""
+                INSERT OR REPLACE INTO transcript_keys (cache_key, content_hash) VALUES (?, ?)
+            """, [(key, row['content_hash']) for key in keys])
+    return row['transcript']
+
+def put_cached_transcript(keys: list, content_hash: str, transcript: str,
+                          max_bytes: int, max_entries: int) -> int:
+    """
+    Store a transcript under content_hash and point keys at it, then evict
+    least recently used transcripts beyond max_entries or max_bytes of text.
+
+    Returns:
+        Number of transcripts evicted
+    """
+    with transaction(write=True) as conn:
+        conn.execute("""
+            INSERT INTO transcript_blobs (content_hash, transcript, size) VALUES (?, ?, ?)
+            ON CONFLICT(content_hash) DO UPDATE SET last_used_at = CURRENT_TIMESTAMP
+        """, (content_hash, transcript, len(transcript.encode('utf-8'))))
+        conn.executemany("""
+            INSERT OR REPLACE INTO transcript_keys (cache_key, content_hash) VALUES (?, ?)
+        """, [(key, content_hash) for key in keys])
+        # Transcripts whose last key was just repointed are unreachable
+        conn.execute("""
+            DELETE FROM transcript_blobs
+            WHERE content_hash NOT IN (SELECT content_hash FROM transcript_keys)
+        """)
+
+        # Newest first: everything past the entry or byte limit goes
+        evicted = [row[0] for row in conn.execute("""
+            SELECT content_hash FROM (
+                SELECT content_hash,
+                       ROW_NUMBER() OVER w as position,
+                       SUM(size) OVER w as running_bytes
+                FROM transcript_blobs
+                WINDOW w AS (ORDER BY last_used_at DESC, rowid DESC)
+            )
+            WHERE position > ? OR running_bytes > ?
+        """, (max_entries, max_bytes))]
+        _delete_transcript_blobs(conn, evicted)
+        return len(evicted)
+
+def _delete_transcript_blobs(conn, content_hashes: list):
+    params = [(content_hash,) for content_hash in content_hashes]
+    conn.executemany("DELETE FROM transcript_keys WHERE content_hash = ?", params)
+    conn.executemany("DELETE FROM transcript_blobs WHERE content_hash = ?", params)
+
+def purge_expired_transcripts(ttl_seconds: int) -> int:
+    """Delete cached transcripts older than ttl_seconds. Returns how many."""
+    with transaction(write=True) as conn:
+        expired = [row[0] for row in conn.execute("""
+            SELECT content_hash FROM transcript_blobs WHERE created_at < datetime('now', ?)
+        """, (f"-{int(ttl_seconds)} seconds",))]
+        _delete_transcript_blobs(conn, expired)
+        return len(expired)
+
+@_cached
+def get_transcript_cache_stats() -> dict:
+    """Cached transcript count, lookup keys and total text size."""
+    with transaction() as conn:
+        row = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM transcript_blobs) as entries,
+                (SELECT COUNT(*) FROM transcript_keys) as keys,
+                (SELECT COALESCE(SUM(size), 0) FROM transcript_blobs) as bytes
+        """).fetchone()
+        return dict(row)
 
 # ============================================
 # REMIX OPERATIONS
@@ -286,32 +1829,22 @@ def save_transcript(video_id: int, transcript: str):
 
 def save_remix(video_id: int, content: str) -> int:
     """Save a remixed version of video content."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction(write=True) as conn:
+        cursor = conn.execute("""
             INSERT INTO remixes (video_id, remixed_content)
             VALUES (?, ?)
         """, (video_id, content))
-        conn.commit()
         return cursor.lastrowid
-    finally:
-        conn.close()
 
+@_cached
 def get_remixes_for_video(video_id: int) -> list:
     """Get all remixes for a video."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("""
+    with transaction() as conn:
+        cursor = conn.execute("""
             SELECT * FROM remixes WHERE video_id = ?
             ORDER BY created_at DESC
         """, (video_id,))
         return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
 
 # ============================================
 # UTILITY
@@ -324,10 +1857,10 @@ def parse_youtube_url(url: str) -> tuple:
     # Handle @username format
     if '/@' in url:
         parts = url.split('/@')
-        username = parts[1].split('/')[0].split('?')[0]
+        username = parts[1].split('/')[0].split('?')[0].lower()
         return ('youtube', username, url.split('/videos')[0].split('/shorts')[0])
 
-    # Handle /channel/ format
+    # Handle /channel/ format (channel IDs are case-sensitive)
     if '/channel/' in url:
         parts = url.split('/channel/')
         channel_id = parts[1].split('/')[0].split('?')[0]
@@ -336,7 +1869,7 @@ def parse_youtube_url(url: str) -> tuple:
     # Handle /c/ format
     if '/c/' in url:
         parts = url.split('/c/')
-        username = parts[1].split('/')[0].split('?')[0]
+        username = parts[1].split('/')[0].split('?')[0].lower()
         return ('youtube', username, url)
 
     return ('youtube', 'unknown', url)
@@ -365,11 +1898,14 @@ def parse_creator_url(url: str) -> tuple:
     Parse any creator URL and detect platform.
     Returns: (platform, username, clean_url)
     """
-    url = url.strip().lower()
+    url = url.strip()
+    lowered = url.lower()
 
-    if 'instagram.com' in url:
-        return parse_instagram_url(url)
-    elif 'youtube.com' in url or 'youtu.be' in url:
+    if 'instagram.com' in lowered:
+        # Instagram usernames are case-insensitive
+        return parse_instagram_url(lowered)
+    elif 'youtube.com' in lowered or 'youtu.be' in lowered:
+        # Only handles are case-folded; channel and video IDs keep their case
         return parse_youtube_url(url)
     else:
         # Default to YouTube for backwards compatibility
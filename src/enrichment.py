@@ -0,0 +1,96 @@
+"""
+Engagement enrichment for YouTube videos.
+
+Channel listings (extract_flat) only carry view counts, so like_count and
+comment_count were never filled for YouTube. After a sync has been written,
+this stage fetches full metadata for new and high-scoring videos on a small
+thread pool, so the sync itself never waits on per-video extraction.
+Each result is remembered per platform_video_id in video_enrichment, and
+get_videos_to_enrich skips videos enriched within REFRESH_AFTER, so the
+same video isn't fetched twice across runs, workers or restarts. videos
+rows are only written when a counter changed.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from background import BackgroundRun
+from database import get_videos_to_enrich, save_video_engagement
+
+DEFAULT_MIN_SCORE = float(os.getenv("CONTENT_ENGINE_ENRICH_MIN_SCORE", 2.0))
+# Re-fetch enriched videos after this long (engagement keeps moving)
+REFRESH_AFTER = int(os.getenv("CONTENT_ENGINE_ENRICH_REFRESH_HOURS", 24)) * 3600
+# Videos synced this recently are enriched whatever their score
+NEW_WITHIN = 48 * 3600
+
+
+class VideoEnricher:
+    """
+    Fetches likes/comments for videos returned by get_videos_to_enrich.
+
+    Args:
+        scraper: YouTubeScraper (get_video_metadata)
+        max_workers: Concurrent extractions
+        min_score: Enrich (and periodically refresh) videos scoring at least this
+        limit: Videos per run
+    """
+
+    def __init__(self, scraper, max_workers: int = 4, min_score: float = DEFAULT_MIN_SCORE,
+                 limit: int = 100):
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.min_score = min_score
+        self.limit = limit
+
+    def fetch(self, video: dict) -> dict:
+        """Metadata for one video row."""
+        return self.scraper.get_video_metadata(
+            video.get('url') or f"https://www.youtube.com/watch?v={video['platform_video_id']}"
+        )
+
+    def run(self) -> dict:
+        """
+        Enrich due videos, highest score first.
+
+        Returns:
+            {'candidates', 'fetched', 'failed', 'updated'}
+        """
+        videos = get_videos_to_enrich(
+            min_score=self.min_score, new_within=NEW_WITHIN, refresh_after=REFRESH_AFTER, limit=self.limit
+        )
+        report = {'candidates': len(videos), 'fetched': 0, 'failed': 0, 'updated': 0}
+        if not videos:
+            return report
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="enrich") as pool:
+            futures = {pool.submit(self.fetch, video): video for video in videos}
+            for future, video in futures.items():
+                try:
+                    metadata = future.result()
+                except Exception as e:
+                    print(f"Enrichment failed for {video['platform_video_id']}: {e}")
+                    report['failed'] += 1
+                    continue
+                report['fetched'] += 1
+                results[video['id']] = dict(metadata, platform_video_id=video['platform_video_id'])
+
+        if results:
+            report['updated'] = save_video_engagement(results)
+        return report
+
+
+# One background run per process; background.last_report is kept for the UI
+background = BackgroundRun("Enrichment", thread_name="enrich")
+
+
+def start_background(enricher: VideoEnricher) -> bool:
+    """
+    Run the enricher on a daemon thread. Returns False (and does nothing)
+    if a background run is already in progress.
+    """
+    return background.start(enricher.run)
+
+
+def is_running() -> bool:
+    """True while a background run is in progress."""
+    return background.is_running()
@@ -0,0 +1,255 @@
+"""
+Shared HTTP layer for the external APIs (Apify, AssemblyAI, YouTube feeds).
+
+One pooled requests.Session per provider keeps TCP/TLS connections alive
+between calls. Requests are retried with exponential backoff (honouring
+Retry-After) on 429 and 5xx; non-idempotent requests (POST) only on
+responses that mean the request wasn't processed (429, 503) or when the
+connection couldn't be made. Consecutive failures open a per-provider
+circuit breaker so a provider that is down fails fast instead of tying up
+a sync, and every attempt's latency goes into a histogram shown in the app.
+
+Errors are the usual requests.exceptions.RequestException subclasses, so
+callers' existing error handling applies unchanged.
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_RETRIES = int(os.getenv("CONTENT_ENGINE_HTTP_RETRIES", 3))
+DEFAULT_BACKOFF = float(os.getenv("CONTENT_ENGINE_HTTP_BACKOFF_SECONDS", 0.5))
+MAX_BACKOFF = 30.0
+CIRCUIT_FAILURES = int(os.getenv("CONTENT_ENGINE_CIRCUIT_FAILURES", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CONTENT_ENGINE_CIRCUIT_RESET_SECONDS", 60))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# The server rejected these without acting on them: safe to resend a POST
+UNPROCESSED_STATUSES = (429, 503)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, float('inf'))
+
+PROVIDERS = {
+    'apify': {'timeout': 60},
+    'assemblyai': {'timeout': 30},
+    # The feed is a pre-check with a yt-dlp fallback: no point retrying it
+    'youtube': {'timeout': 10, 'retries': 0},
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without a request being made while a provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. Once `reset_timeout`
+    seconds have passed a single trial request is let through (half-open):
+    success closes the circuit, failure opens it again. A trial that never
+    reports back is replaced by another after a further `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURES, reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_timeout:
+                # opened_at doubles as the time the current trial was let through
+                self.state = 'half_open'
+                self.opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are bucket upper bounds."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.bounds = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.counts[next(i for i, bound in enumerate(self.bounds) if seconds <= bound)] += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            count = sum(self.counts)
+            if not count:
+                return None
+            seen = 0
+            for bound, n in zip(self.bounds, self.counts):
+                seen += n
+                if seen >= q * count:
+                    return min(bound, self.max)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count = sum(self.counts)
+            stats = {
+                'count': count,
+                'mean': round(self.total / count, 3) if count else None,
+                'max': round(self.max, 3),
+                'buckets': {bound: n for bound, n in zip(self.bounds, self.counts) if n},
+            }
+        stats['p50'] = self.percentile(0.5)
+        stats['p95'] = self.percentile(0.95)
+        return stats
+
+
+class ProviderClient:
+    """
+    Pooled, retrying, circuit-broken HTTP client for one provider.
+
+    Args:
+        name: Provider name (shown in stats and errors)
+        timeout: Default per-attempt timeout in seconds
+        retries: Extra attempts after a retryable failure
+        backoff: First retry delay; doubles per attempt (with jitter)
+        pool_size: Connections kept alive per host
+        breaker: CircuitBreaker (a new one by default)
+    """
+
+    def __init__(self, name: str, timeout: float = 30, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, pool_size: int = 16, breaker: CircuitBreaker = None):
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, timeout: float = None, retries: int = None,
+                **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures. Returns the last
+        response (callers still raise_for_status); raises the last
+        request error, or CircuitOpenError while the circuit is open.
+        """
+        retries = self.retries if retries is None else retries
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.name} circuit open after repeated failures; not calling {url}")
+
+            response, error = None, None
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = e
+            self.latency.observe(time.monotonic() - start)
+            with self._lock:
+                self.requests += 1
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                # 4xx other than 429 is the caller's problem, not the provider's
+                self.breaker.record_success()
+                return response
+
+            self.breaker.record_failure()
+            with self._lock:
+                self.failures += 1
+            if response is not None:
+                retryable = idempotent or response.status_code in UNPROCESSED_STATUSES
+            elif isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                retryable = idempotent or isinstance(error, requests.exceptions.ConnectTimeout)
+            else:
+                retryable = False
+            if attempt == retries or not retryable:
+                break
+
+            delay = self._retry_delay(attempt, response)
+            print(f"{self.name}: {response.status_code if response is not None else error}, "
+                  f"retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            with self._lock:
+                self.retried += 1
+            time.sleep(delay)
+
+        if response is not None:
+            return response
+        raise error
+
+    def _retry_delay(self, attempt: int, response) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form: fall back to our own backoff
+        return min(MAX_BACKOFF, self.backoff * 2 ** attempt * random.uniform(0.8, 1.2))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {'requests': self.requests, 'retries': self.retried, 'failures': self.failures}
+        stats['circuit'] = self.breaker.state
+        stats['latency'] = self.latency.snapshot()
+        return stats
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider: str) -> ProviderClient:
+    """Process-wide client for a provider in PROVIDERS, created on first use."""
+    with _clients_lock:
+        if provider not in _clients:
+            if provider not in PROVIDERS:
+                raise ValueError(f"Unknown HTTP provider: {provider}")
+            _clients[provider] = ProviderClient(provider, **PROVIDERS[provider])
+        return _clients[provider]
+
+
+def http_stats() -> dict:
+    """{provider: stats} for every client used in this process."""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.stats() for name, client in clients.items()}
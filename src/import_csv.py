@@ -5,7 +5,8 @@ Usage: python import_csv.py /path/to/csv/folder
 import csv
 import sys
 from pathlib import Path
-from database import add_creator, upsert_videos, get_all_creators
+from database import add_creator, bulk_upsert_videos, get_all_creators
+from scoring import score_videos
 
 def parse_csv_row(row: dict) -> dict:
     """Transform Apify CSV row to our video format."""
@@ -42,31 +43,11 @@ def parse_csv_row(row: dict) -> dict:
 
 def calculate_outliers(videos: list) -> list:
     """Calculate outlier score based on likes (since views not available)."""
-    if not videos:
-        return []
-
-    # Use likes as the metric since views aren't in CSV
-    valid_videos = [v for v in videos if v.get('like_count', 0) > 0]
-
-    if not valid_videos:
-        for v in videos:
-            v['outlier_score'] = 0
-        return videos
-
-    total_likes = sum(v['like_count'] for v in valid_videos)
-    avg_likes = total_likes / len(valid_videos)
-
     for video in videos:
-        likes = video.get('like_count', 0)
-        if avg_likes > 0:
-            video['outlier_score'] = round(likes / avg_likes, 2)
-            # Also set view_count to likes for display purposes
-            video['view_count'] = likes
-        else:
-            video['outlier_score'] = 0
-
-    videos.sort(key=lambda x: x.get('outlier_score', 0), reverse=True)
-    return videos
+        # Likes stand in for views in the UI too
+        if video.get('like_count', 0) > 0:
+            video['view_count'] = video['like_count']
+    return score_videos(videos, metric='like_count')
 
 def import_csv_file(csv_path: Path) -> tuple:
     """Import a single CSV file. Returns (username, video_count)."""
@@ -83,6 +64,7 @@ def import_csv_file(csv_path: Path) -> tuple:
             videos_by_user[username].append(video)
 
     total_imported = 0
+    batches = {}
     for username, videos in videos_by_user.items():
         if not username:
             continue
@@ -96,11 +78,14 @@ def import_csv_file(csv_path: Path) -> tuple:
         )
 
         if creator_id:
-            # Calculate outliers and save
-            analyzed = calculate_outliers(videos)
-            upsert_videos(creator_id, analyzed)
+            # Calculate outliers; everything is written in one transaction below
+            batches[creator_id] = calculate_outliers(videos)
             total_imported += len(videos)
-            print(f"  ✅ Imported {len(videos)} reels from @{username}")
+            print(f"  ✅ Parsed {len(videos)} reels from @{username}")
+
+    if batches:
+        counts = bulk_upsert_videos(batches, rescore=True)
+        print(f"  💾 {counts['inserted']} new, {counts['updated']} updated, {counts['unchanged']} unchanged")
 
     return len(videos_by_user), total_imported
 
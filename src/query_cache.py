@@ -0,0 +1,143 @@
+"""
+Read-through cache for database query results.
+
+Streamlit reruns the whole script on every widget interaction, so the
+same reads repeat constantly. Results are cached per process (shared by
+every session on the server) and invalidated wholesale by a generation
+counter that database.py bumps after each committed write. Writes from
+other processes (worker.py) are picked up through a version token, checked
+at most every VERSION_CHECK_SECONDS so a page full of cached reads doesn't
+each pay for it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+DEFAULT_MAX_ENTRIES = 512
+# How stale a write from another process may look to cached reads
+VERSION_CHECK_SECONDS = 1.0
+
+
+class QueryCache:
+    """Bounded LRU cache of query results keyed by the current write generation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, version_interval: float = VERSION_CHECK_SECONDS):
+        self.max_entries = max_entries
+        self.version_interval = version_interval
+        self._version_checked_at = float('-inf')
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def bump(self):
+        """Invalidate every cached result. Call after a write commits."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def observe(self, version):
+        """Invalidate everything if an external version token changed since the last call."""
+        with self._lock:
+            if version == self._version:
+                return
+            changed = self._version is not None
+            self._version = version
+            if changed:
+                self._generation += 1
+                self._entries.clear()
+
+    def check_version(self, version):
+        """observe(version()), calling version() at most once per version_interval seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._version_checked_at < self.version_interval:
+                return
+            self._version_checked_at = now
+        self.observe(version())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss."""
+        with self._lock:
+            generation = self._generation
+            full_key = (generation, key)
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return self._entries[full_key]
+            self.misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # A write committed while loading: the value may predate it
+            if generation == self._generation:
+                self._entries[full_key] = value
+                self._entries.move_to_end(full_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'generation': self._generation,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+query_cache = QueryCache()
+
+
+def _freeze(value):
+    """Make list/dict arguments hashable for use in a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def cached_query(scope=None, version=None):
+    """
+    Decorator for read functions. Cached results are shared between
+    callers and sessions, so treat them as read-only.
+
+    Args:
+        scope: Optional zero-arg callable whose value is added to every key
+               (database.py passes its DB_PATH so test databases don't mix)
+        version: Optional zero-arg callable returning a token that changes
+                 when the data is written elsewhere; see check_version
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if version:
+                query_cache.check_version(version)
+            key = (
+                fn.__qualname__,
+                scope() if scope else None,
+                _freeze(args),
+                _freeze(kwargs),
+            )
+            return query_cache.get_or_load(key, lambda: fn(*args, **kwargs))
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+"""
+Adaptive re-sync scheduling.
+
+Instead of syncing the whole watchlist every time, each creator gets a
+next_sync_at from how much is likely to have changed since it was last
+synced:
+
+    upload frequency  checked about twice per typical gap between uploads
+                      (over the last UPLOAD_WINDOW); a creator that has gone
+                      quiet is checked less the longer it stays quiet
+    view velocity     the creator's fastest-moving video (views_per_hour)
+                      shortens the interval on a log scale, since its view
+                      counts and scores are changing
+    last sync         next_sync_at = last sync + interval, and due creators
+                      are taken most-overdue-relative-to-interval first
+
+Intervals are clamped to [MIN_INTERVAL, MAX_INTERVAL]. run_due() syncs at
+most `budget` due creators per run, so a large watchlist stays fresh at a
+fraction of the API calls and yt-dlp time.
+"""
+import math
+import os
+import time
+
+from database import count_due_creators, get_due_creators, get_sync_signals, set_sync_schedule
+
+MIN_INTERVAL = int(float(os.getenv("CONTENT_ENGINE_SYNC_MIN_HOURS", 2)) * 3600)
+MAX_INTERVAL = int(float(os.getenv("CONTENT_ENGINE_SYNC_MAX_HOURS", 168)) * 3600)
+# Creators due per scheduled run; the rest wait for the next one
+DEFAULT_BUDGET = int(os.getenv("CONTENT_ENGINE_SYNC_BUDGET", 25))
+# Interval when nothing is known about a creator's uploads
+DEFAULT_INTERVAL = 24 * 3600
+UPLOAD_WINDOW = 30 * 86400
+# views_per_hour at which the interval is cut by ~1.3x (10x this: ~2x)
+VELOCITY_SCALE = 1000.0
+
+
+def sync_interval(signals: dict, now: int) -> int:
+    """Seconds until a creator should be synced again, from get_sync_signals output."""
+    if signals['recent_uploads']:
+        interval = UPLOAD_WINDOW / signals['recent_uploads'] / 2
+    elif signals['latest_upload'] is not None:
+        interval = (now - signals['latest_upload']) / 2
+    else:
+        interval = DEFAULT_INTERVAL
+
+    interval /= 1 + math.log10(1 + (signals['top_velocity'] or 0) / VELOCITY_SCALE)
+    return int(min(MAX_INTERVAL, max(MIN_INTERVAL, interval)))
+
+
+def reschedule(creator_ids: list, synced_at: int = None, now: int = None) -> dict:
+    """
+    Plan the next sync of creators. The interval counts from synced_at
+    (pass the run's time after syncing them) or else from each creator's
+    last_synced; never-synced creators stay due.
+
+    Returns:
+        {creator_id: next_sync_at}
+    """
+    now = int(now or time.time())
+    schedule = {}
+    for creator_id, signals in get_sync_signals(list(creator_ids), UPLOAD_WINDOW, now).items():
+        since = synced_at or signals['last_synced']
+        if since is None:
+            continue
+        interval = sync_interval(signals, now)
+        schedule[creator_id] = (since + interval, interval)
+    set_sync_schedule(schedule)
+    return {creator_id: next_sync_at for creator_id, (next_sync_at, _) in schedule.items()}
+
+
+def defer(creator_ids: list, retry_after: int = MIN_INTERVAL, now: int = None):
+    """Retry failed creators after retry_after seconds instead of on every run (interval kept)."""
+    now = int(now or time.time())
+    set_sync_schedule({creator_id: (now + retry_after, None) for creator_id in creator_ids})
+
+
+def due_creators(budget: int = DEFAULT_BUDGET, now: int = None) -> list:
+    """The creators the next run_due would sync, most overdue first."""
+    return get_due_creators(int(now or time.time()), budget, DEFAULT_INTERVAL)
+
+
+def run_due(engine, budget: int = DEFAULT_BUDGET, limit: int = 30, progress=None) -> dict:
+    """
+    Sync up to budget due creators with a SyncEngine, which reschedules
+    them when it finishes.
+
+    Returns:
+        SyncEngine.run report plus 'due' (creators due before the run) and
+        'deferred' (due but over budget); None when nothing is due
+    """
+    now = int(time.time())
+    due = count_due_creators(now)
+    creators = get_due_creators(now, budget, DEFAULT_INTERVAL)
+    if not creators:
+        return None
+    report = engine.run(creators, limit=limit, progress=progress)
+    report['due'] = due
+    report['deferred'] = due - len(creators)
+    return report
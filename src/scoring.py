@@ -0,0 +1,221 @@
+"""
+Outlier scoring.
+
+A video's outlier score compares its views with a baseline computed from
+the other videos of the same creator (or the same batch). Everything works
+on columnar NumPy arrays, grouped by creator, so a whole library is scored
+in one vectorized pass instead of a Python loop per creator.
+
+Baselines (CONTENT_ENGINE_SCORING_BASELINE, default "mean"):
+
+    mean          views / mean views                     (the original score)
+    median        views / median views
+    trimmed_mean  views / mean with the top and bottom 10% dropped
+    percentile    views / the creator's 75th percentile views
+    log_zscore    z-score of log(1 + views): standard deviations above the
+                  creator's typical video rather than a multiple of it
+
+The robust baselines keep one mega-viral video from dragging every other
+score down. Only positive view counts feed a baseline; videos without
+views score 0. mean and log_zscore can also be computed from per-creator
+sums (grouped_view_stats / baseline_from_stats), which is how stored videos
+are scored against a creator's history without reading it back. That
+history is rolling: the creator's BASELINE_WINDOW most recent uploads with
+views (CONTENT_ENGINE_BASELINE_WINDOW, 0 for all of them).
+"""
+import os
+
+import numpy as np
+
+DEFAULT_METHOD = os.getenv("CONTENT_ENGINE_SCORING_BASELINE", "mean")
+BASELINE_WINDOW = int(os.getenv("CONTENT_ENGINE_BASELINE_WINDOW", 100))
+TRIM_PROPORTION = 0.1
+PERCENTILE = 75
+
+
+def _group_index(groups, size: int):
+    """(inverse index 0..n-1 per row, number of groups) for an optional group-key array."""
+    if groups is None:
+        return np.zeros(size, dtype=np.intp), 1
+    _, inverse = np.unique(np.asarray(groups), return_inverse=True)
+    return inverse.reshape(-1), int(inverse.max()) + 1 if size else 0
+
+
+def _sorted_by_group(values, inverse, n_groups):
+    """Values sorted by (group, value), per-group start offsets and counts."""
+    # Sort by value, then stably by group: ~2x faster than np.lexsort on large inputs
+    by_value = np.argsort(values)
+    order = by_value[np.argsort(inverse[by_value], kind='stable')]
+    counts = np.bincount(inverse, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    return values[order], inverse[order], starts, counts
+
+
+def _grouped_mean(values, inverse, n_groups):
+    counts = np.bincount(inverse, minlength=n_groups)
+    sums = np.bincount(inverse, weights=values, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def _grouped_quantile(values, inverse, n_groups, q: float):
+    """Per-group quantile with linear interpolation (NaN for empty groups)."""
+    ordered, _, starts, counts = _sorted_by_group(values, inverse, n_groups)
+    result = np.full(n_groups, np.nan)
+    present = counts > 0
+    if not present.any():
+        return result
+    position = starts[present] + q * (counts[present] - 1)
+    low = np.floor(position).astype(np.intp)
+    high = np.ceil(position).astype(np.intp)
+    result[present] = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+    return result
+
+
+def _grouped_trimmed_mean(values, inverse, n_groups, proportion: float = TRIM_PROPORTION):
+    ordered, ordered_groups, starts, counts = _sorted_by_group(values, inverse, n_groups)
+    rank = np.arange(len(ordered)) - starts[ordered_groups]
+    cut = np.floor(counts * proportion).astype(np.intp)[ordered_groups]
+    keep = (rank >= cut) & (rank < counts[ordered_groups] - cut)
+    return _grouped_mean(ordered[keep], ordered_groups[keep], n_groups)
+
+
+BASELINES = {
+    'mean': _grouped_mean,
+    'median': lambda v, g, n: _grouped_quantile(v, g, n, 0.5),
+    'trimmed_mean': _grouped_trimmed_mean,
+    'percentile': lambda v, g, n: _grouped_quantile(v, g, n, PERCENTILE / 100),
+}
+METHODS = tuple(BASELINES) + ('log_zscore',)
+
+
+# Baselines that can be kept as running sums per creator (creator_baselines)
+# instead of being recomputed from every stored video
+INCREMENTAL_METHODS = ('mean', 'log_zscore')
+
+
+def grouped_view_stats(views, groups):
+    """
+    Running-sum statistics of the positive view counts, per group, in one pass.
+
+    Returns:
+        (keys, count, sum, log_sum, log_sq_sum) arrays, one entry per distinct group key
+    """
+    views = np.asarray(views, dtype=float)
+    keys, inverse = np.unique(np.asarray(groups), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    positive = views > 0
+    views, inverse, n = views[positive], inverse[positive], len(keys)
+    logs = np.log1p(views)
+    return (keys, np.bincount(inverse, minlength=n), np.bincount(inverse, views, n),
+            np.bincount(inverse, logs, n), np.bincount(inverse, logs ** 2, n))
+
+
+def recent_in_group(views, groups, recency: list, window: int):
+    """
+    Boolean mask of each group's `window` most recent rows with positive views.
+
+    Args:
+        recency: Sort keys, most significant first; larger means more recent
+                 (e.g. [upload date as YYYYMMDD, row id])
+    """
+    views = np.asarray(views, dtype=float)
+    groups = np.asarray(groups)
+    if not window:
+        return views > 0
+    order = np.lexsort([-np.asarray(key, dtype=float) for key in reversed(recency)] + [groups])
+    positive = views[order] > 0
+    ordered_groups = groups[order]
+    seen = np.cumsum(positive)
+    new_group = np.r_[True, ordered_groups[1:] != ordered_groups[:-1]]
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(order)), 0))
+    rank = seen - np.where(group_start > 0, seen[group_start - 1], 0)
+    mask = np.empty(len(order), dtype=bool)
+    mask[order] = positive & (rank <= window)
+    return mask
+
+
+def baseline_from_stats(count, view_sum, log_sum, log_sq_sum, method: str = None) -> tuple:
+    """
+    Baseline for an INCREMENTAL_METHODS method from running sums over a
+    creator's positive view counts (count, sum, sum of log1p, sum of squares
+    of log1p).
+
+    Returns:
+        (center, spread, baseline_views): mean views (spread None) for
+        "mean"; mean and standard deviation of log1p(views) for
+        "log_zscore". center is None when there are no positive views.
+    """
+    method = method or DEFAULT_METHOD
+    if method not in INCREMENTAL_METHODS:
+        raise ValueError(f"{method} baselines can't be computed from running sums")
+    if not count:
+        return None, None, None
+    if method == 'mean':
+        center = view_sum / count
+        return center, None, center
+    center = log_sum / count
+    # Sum-of-squares variance can dip just below zero through rounding
+    spread = float(np.sqrt(max(0.0, log_sq_sum / count - center ** 2)))
+    return center, spread, float(np.expm1(center))
+
+
+def compute_scores(views, groups=None, method: str = None, in_baseline=None):
+    """
+    Outlier scores for a column of view counts.
+
+    Args:
+        views: View counts (NaN/None for unknown)
+        groups: Optional group key per row (e.g. creator_id); one group if None
+        method: One of METHODS; DEFAULT_METHOD if None
+        in_baseline: Optional boolean per row: only these rows feed the
+                     baselines (every row is still scored)
+
+    Returns:
+        (scores, baselines): float arrays aligned with views, scores rounded
+        to 2 places. baselines is the per-row baseline in views (for
+        log_zscore, the geometric mean).
+    """
+    method = method or DEFAULT_METHOD
+    if method not in METHODS:
+        raise ValueError(f"Unknown scoring method: {method} (expected one of {', '.join(METHODS)})")
+
+    views = np.asarray(views, dtype=float)
+    inverse, n_groups = _group_index(groups, len(views))
+    valid = views > 0  # False for NaN too
+    counted = valid if in_baseline is None else valid & np.asarray(in_baseline, dtype=bool)
+    valid_views, valid_groups = views[counted], inverse[counted]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'log_zscore':
+            logs = np.log1p(valid_views)
+            mean = _grouped_mean(logs, valid_groups, n_groups)
+            spread = np.sqrt(_grouped_mean((logs - mean[valid_groups]) ** 2, valid_groups, n_groups))
+            scores = (np.log1p(np.nan_to_num(views)) - mean[inverse]) / spread[inverse]
+            baselines = np.expm1(mean)[inverse]
+        else:
+            baselines = BASELINES[method](valid_views, valid_groups, n_groups)[inverse]
+            scores = views / baselines
+
+    scores[~valid | ~np.isfinite(scores)] = 0.0
+    return np.round(scores, 2), baselines
+
+
+def score_videos(videos: list, metric: str = 'view_count', method: str = None) -> list:
+    """
+    Score a batch of video dicts in place (outlier_score, avg_views_benchmark)
+    against the batch itself and return them sorted by score, highest first.
+    """
+    if not videos:
+        return []
+    values = [v.get(metric) for v in videos]
+    scores, baselines = compute_scores(
+        [np.nan if value is None else value for value in values], method=method
+    )
+    baselines = np.nan_to_num(baselines)
+    for video, score, baseline in zip(videos, scores.tolist(), baselines.tolist()):
+        video['outlier_score'] = score
+        video['avg_views_benchmark'] = round(baseline)
+
+    videos.sort(key=lambda x: x.get('outlier_score', 0), reverse=True)
+    return videos
@@ -4,11 +4,18 @@ from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, No
 import ssl
 import certifi
 import os
+import random
 import requests
+import threading
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
+from http_client import get_client
+from scoring import score_videos
+
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
 
@@ -27,6 +34,10 @@ else:
 # INSTAGRAM SCRAPER (APIFY)
 # ============================================
 
+class DatasetReadError(RuntimeError):
+    """A finished actor run's dataset could not be read; the run itself succeeded (and was billed)."""
+
+
 class InstagramScraper:
     """
     Scrapes Instagram reels using Apify's Instagram Reel Scraper.
@@ -36,22 +47,24 @@ class InstagramScraper:
     # Note: Actor ID uses tilde (~) not slash (/)
     APIFY_ACTOR_ID = "apify~instagram-reel-scraper"
     APIFY_API_BASE = "https://api.apify.com/v2"
+    # Profiles per actor run; larger runs risk the 300 s sync-run timeout
+    MAX_PROFILES_PER_RUN = 25
 
-    def __init__(self, api_token: str = None):
+    def __init__(self, api_token: str = None, http=None):
+        """
+        Args:
+            api_token: Apify token (falls back to APIFY_API_TOKEN)
+            http: Optional ProviderClient; the shared 'apify' client by default
+        """
+        self.http = http or get_client('apify')
         self.api_token = api_token or os.getenv("APIFY_API_TOKEN")
         if not self.api_token:
             raise ValueError("APIFY_API_TOKEN required. Set in .env or pass to constructor.")
 
-    def get_reels(self, username: str, limit: int = 10) -> list:
+    def _run_actor(self, usernames: list, limit: int) -> list:
         """
-        Fetch reels from an Instagram profile.
-
-        Args:
-            username: Instagram username (without @)
-            limit: Max number of reels to fetch
-
-        Returns:
-            List of reel dictionaries with metadata
+        Run the reel scraper synchronously for one or more profiles.
+        Returns raw dataset items; raises requests.exceptions.RequestException on failure.
         """
         url = f"{self.APIFY_API_BASE}/acts/{self.APIFY_ACTOR_ID}/run-sync-get-dataset-items"
 
@@ -64,45 +77,62 @@ class InstagramScraper:
         }
 
         payload = {
-            "username": [username],
+            "username": usernames,
             "resultsLimit": limit
         }
 
-        try:
-            print(f"Fetching {limit} reels from @{username}...")
-            print(f"API URL: {url}")
-            print(f"Payload: {payload}")
-
-            response = requests.post(url, json=payload, headers=headers, params=params, timeout=300)
-
-            # Log response details for debugging
-            print(f"Response status: {response.status_code}")
+        print(f"API URL: {url}")
+        print(f"Payload: {payload}")
+
+        response = self.http.post(url, json=payload, headers=headers, params=params, timeout=300)
+
+        # Log response details for debugging
+        print(f"Response status: {response.status_code}")
+
+        if response.status_code != 200:
+            print(f"Error response: {response.text[:500]}")
+
+        response.raise_for_status()
+
+        data = response.json()
+        print(f"Got {len(data)} items from API")
+        return data
+
+    @staticmethod
+    def _transform_item(item: dict, username: str = None) -> dict:
+        """Transform an Apify dataset item to our standard video format."""
+        return {
+            'id': item.get('id') or item.get('shortCode'),
+            'platform_video_id': item.get('id') or item.get('shortCode'),
+            'title': item.get('caption', '')[:200] if item.get('caption') else 'No caption',
+            'url': item.get('url') or f"https://www.instagram.com/reel/{item.get('shortCode')}",
+            'view_count': item.get('videoPlayCount') or item.get('playCount', 0),
+            'like_count': item.get('likesCount', 0),
+            'comment_count': item.get('commentsCount', 0),
+            'duration': item.get('videoDuration'),
+            'upload_date': item.get('timestamp', '').split('T')[0] if item.get('timestamp') else None,
+            'thumbnail': item.get('displayUrl') or item.get('thumbnailUrl'),
+            'video_url': item.get('videoUrl'),  # Direct video URL for transcription
+            'owner_username': item.get('ownerUsername', username)
+        }
 
-            if response.status_code != 200:
-                print(f"Error response: {response.text[:500]}")
+    def get_reels(self, username: str, limit: int = 10) -> list:
+        """
+        Fetch reels from an Instagram profile.
 
-            response.raise_for_status()
+        Args:
+            username: Instagram username (without @)
+            limit: Max number of reels to fetch
 
-            data = response.json()
-            print(f"Got {len(data)} items from API")
+        Returns:
+            List of reel dictionaries with metadata
+        """
+        try:
+            print(f"Fetching {limit} reels from @{username}...")
+            data = self._run_actor([username], limit)
 
             # Transform Apify response to our standard format
-            reels = []
-            for item in data:
-                reels.append({
-                    'id': item.get('id') or item.get('shortCode'),
-                    'platform_video_id': item.get('id') or item.get('shortCode'),
-                    'title': item.get('caption', '')[:200] if item.get('caption') else 'No caption',
-                    'url': item.get('url') or f"https://www.instagram.com/reel/{item.get('shortCode')}",
-                    'view_count': item.get('videoPlayCount') or item.get('playCount', 0),
-                    'like_count': item.get('likesCount', 0),
-                    'comment_count': item.get('commentsCount', 0),
-                    'duration': item.get('videoDuration'),
-                    'upload_date': item.get('timestamp', '').split('T')[0] if item.get('timestamp') else None,
-                    'thumbnail': item.get('displayUrl') or item.get('thumbnailUrl'),
-                    'video_url': item.get('videoUrl'),  # Direct video URL for transcription
-                    'owner_username': item.get('ownerUsername', username)
-                })
+            reels = [self._transform_item(item, username) for item in data]
 
             print(f"Fetched {len(reels)} reels from @{username}")
             return reels
@@ -111,35 +141,169 @@ class InstagramScraper:
             print(f"Error fetching Instagram reels: {e}")
             return []
 
-    def calculate_outliers(self, videos: list) -> list:
+    def get_reels_batch(self, usernames: list, limit: int = 10, max_retries: int = 2) -> dict:
+        """
+        Fetch reels for many profiles with as few actor runs as possible.
+
+        Profiles are sent MAX_PROFILES_PER_RUN at a time and the items are
+        split by ownerUsername. Profiles missing from a run's results (failed
+        run, or the actor skipped them) are retried in a new run, up to
+        max_retries times.
+
+        Args:
+            usernames: Instagram usernames (without @)
+            limit: Max reels per profile
+            max_retries: Extra runs for profiles that came back empty
+
+        Returns:
+            {username: [reel, ...]} for every requested username (empty list if none found)
         """
-        Calculate outlier score for each video.
-        Score = Video Views / Average Views of the batch.
+        results = {u.lower(): [] for u in usernames}
+        pending = list(results)
+
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                print(f"Retrying {len(pending)} profiles (attempt {attempt + 1})...")
+
+            missing = []
+            for start in range(0, len(pending), self.MAX_PROFILES_PER_RUN):
+                chunk = pending[start:start + self.MAX_PROFILES_PER_RUN]
+                try:
+                    print(f"Fetching {limit} reels each from {len(chunk)} profiles in one run...")
+                    data = self._run_actor(chunk, limit)
+                except requests.exceptions.RequestException as e:
+                    print(f"Error fetching Instagram reels: {e}")
+                    missing.extend(chunk)
+                    continue
+
+                for item in data:
+                    owner = (item.get('ownerUsername') or '').lower()
+                    if owner in results:
+                        results[owner].append(self._transform_item(item, owner))
+                missing.extend(u for u in chunk if not results[u])
+            pending = missing
+
+        return results
+
+    # ----- Async runs: start, poll, then page through the dataset -----
+
+    RUN_TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+    # Seconds before re-reading a failed dataset page (times the failures so far)
+    PAGE_RETRY_DELAY = 1.0
+
+    def start_run(self, usernames: list, limit: int) -> dict:
+        """Start an actor run without waiting for it. Returns Apify's run object."""
+        response = self.http.post(
+            f"{self.APIFY_API_BASE}/acts/{self.APIFY_ACTOR_ID}/runs",
+            json={"username": usernames, "resultsLimit": limit},
+            params={"token": self.api_token},
+            timeout=30
+        )
+        response.raise_for_status()
+        run = response.json()['data']
+        print(f"Started Apify run {run['id']} for {len(usernames)} profiles")
+        return run
+
+    def wait_for_run(self, run_id: str, timeout: float = 900, initial_delay: float = 1.0,
+                     max_delay: float = 15.0) -> dict:
         """
-        if not videos:
-            return []
+        Poll a run with exponential backoff until it finishes.
 
-        # Filter videos with valid view counts
-        valid_videos = [v for v in videos if v.get('view_count') is not None and v.get('view_count', 0) > 0]
+        Returns:
+            The finished run object (status SUCCEEDED)
 
-        if not valid_videos:
-            return videos
+        Raises:
+            RuntimeError if the run failed/aborted, TimeoutError past `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+
+        while True:
+            response = self.http.get(
+                f"{self.APIFY_API_BASE}/actor-runs/{run_id}",
+                params={"token": self.api_token},
+                timeout=30
+            )
+            response.raise_for_status()
+            run = response.json()['data']
+            status = run['status']
 
-        total_views = sum(v['view_count'] for v in valid_videos)
-        avg_views = total_views / len(valid_videos) if len(valid_videos) > 0 else 0
+            if status == "SUCCEEDED":
+                return run
+            if status in self.RUN_TERMINAL_STATUSES:
+                raise RuntimeError(f"Apify run {run_id} finished with status {status}")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Apify run {run_id} still {status} after {timeout}s")
 
-        for video in videos:
-            views = video.get('view_count') or 0
-            if avg_views > 0:
-                video['outlier_score'] = round(views / avg_views, 2)
-            else:
-                video['outlier_score'] = 0
+            print(f"Apify run {run_id}: {status}, next check in {delay:.0f}s...")
+            time.sleep(delay)
+            delay = min(max_delay, delay * 2)
 
-            video['avg_views_benchmark'] = round(avg_views)
+    def iter_dataset_pages(self, dataset_id: str, page_size: int = 100, max_retries: int = 2):
+        """
+        Yield raw dataset items one page (offset/limit) at a time. A failed
+        page is re-read from the same offset up to max_retries times.
 
-        # Sort by outlier score descending
-        videos.sort(key=lambda x: x.get('outlier_score', 0), reverse=True)
-        return videos
+        Raises:
+            DatasetReadError once a page has failed max_retries + 1 times in a row
+        """
+        offset = 0
+        failures = 0
+        while True:
+            try:
+                response = self.http.get(
+                    f"{self.APIFY_API_BASE}/datasets/{dataset_id}/items",
+                    params={"token": self.api_token, "offset": offset, "limit": page_size, "clean": "true"},
+                    timeout=60
+                )
+                response.raise_for_status()
+                items = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                failures += 1
+                if failures > max_retries:
+                    raise DatasetReadError(f"Dataset {dataset_id} unreadable at offset {offset}: {e}") from e
+                print(f"Dataset {dataset_id} page at offset {offset} failed, re-reading: {e}")
+                time.sleep(self.PAGE_RETRY_DELAY * failures)
+                continue
+            failures = 0
+            if items:
+                yield items
+            if len(items) < page_size:
+                return
+            offset += len(items)
+
+    def iter_reels_async(self, usernames: list, limit: int = 10, page_size: int = 100, **wait_options):
+        """
+        Fetch reels through an async actor run, one transformed page at a time.
+        Memory stays bounded by page_size whatever resultsLimit is.
+
+        Args:
+            usernames: Instagram usernames (without @)
+            limit: Max reels per profile (resultsLimit)
+            page_size: Dataset items per page
+            wait_options: Passed to wait_for_run (timeout, initial_delay, max_delay)
+
+        Yields:
+            Lists of reel dictionaries in our standard format
+
+        Raises:
+            requests.exceptions.RequestException, RuntimeError or TimeoutError if
+            the run could not be started or did not succeed; DatasetReadError if
+            it succeeded but its dataset could not be read
+        """
+        run = self.start_run(usernames, limit)
+        run = self.wait_for_run(run['id'], **wait_options)
+        for items in self.iter_dataset_pages(run['defaultDatasetId'], page_size=page_size):
+            yield [self._transform_item(item) for item in items]
+
+    def calculate_outliers(self, videos: list) -> list:
+        """
+        Calculate outlier score for each video against the batch
+        (see scoring.compute_scores). Sorted by score, highest first.
+        """
+        return score_videos(videos)
 
 
 # ============================================
@@ -154,7 +318,15 @@ class AssemblyAITranscriber:
 
     API_BASE = "https://api.assemblyai.com/v2"
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, transcript_cache=None, http=None):
+        """
+        Args:
+            api_key: AssemblyAI API key (falls back to ASSEMBLYAI_API_KEY)
+            transcript_cache: Optional TranscriptCache checked before any job is submitted
+            http: Optional ProviderClient; the shared 'assemblyai' client by default
+        """
+        self.http = http or get_client('assemblyai')
+        self.transcript_cache = transcript_cache
         self.api_key = api_key or os.getenv("ASSEMBLYAI_API_KEY")
         if not self.api_key:
             raise ValueError("ASSEMBLYAI_API_KEY required. Set in .env or pass to constructor.")
@@ -164,13 +336,31 @@ class AssemblyAITranscriber:
             "Content-Type": "application/json"
         }
 
-    def transcribe_url(self, video_url: str) -> str:
+    def submit(self, audio_url: str) -> str:
+        """Start a transcription job. Returns the AssemblyAI transcript ID."""
+        response = self.http.post(
+            f"{self.API_BASE}/transcript",
+            json={"audio_url": audio_url},
+            headers=self.headers,
+            timeout=30
+        )
+        response.raise_for_status()
+        return response.json()['id']
+
+    def get_status(self, transcript_id: str) -> dict:
+        """Fetch a transcription job (status, text, error)."""
+        response = self.http.get(f"{self.API_BASE}/transcript/{transcript_id}", headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def transcribe_url(self, video_url: str, timeout: float = 600) -> str:
         """
         Transcribe audio from a video URL.
         AssemblyAI can directly process video URLs.
 
         Args:
             video_url: Direct URL to video file
+            timeout: Give up after this many seconds
 
         Returns:
             Transcript text or error message
@@ -178,39 +368,99 @@ class AssemblyAITranscriber:
         if not video_url:
             return "Error: No video URL provided"
 
-        try:
-            # Start transcription job
-            response = requests.post(
-                f"{self.API_BASE}/transcript",
-                json={"audio_url": video_url},
-                headers=self.headers,
-                timeout=30
-            )
-            response.raise_for_status()
-
-            transcript_id = response.json()['id']
-            print(f"Transcription job started: {transcript_id}")
+        return self.transcribe_batch({video_url: video_url}, timeout=timeout)[video_url]
 
-            # Poll for completion
-            polling_endpoint = f"{self.API_BASE}/transcript/{transcript_id}"
-
-            while True:
-                poll_response = requests.get(polling_endpoint, headers=self.headers, timeout=30)
-                poll_response.raise_for_status()
+    def transcribe_batch(self, jobs: dict, on_complete=None, timeout: float = 900,
+                         initial_delay: float = 2.0, max_delay: float = 10.0,
+                         max_submit_workers: int = 8) -> dict:
+        """
+        Transcribe many URLs at once. Every job is submitted up front, then a
+        single poller checks whichever job is due next, backing each job off
+        exponentially (with jitter) while it is still processing. Total time
+        is roughly that of the slowest job rather than the sum of all of them.
 
-                result = poll_response.json()
-                status = result['status']
+        Args:
+            jobs: {key: video_url}, e.g. {video_id: url}
+            on_complete: Optional callback(key, text), called on this thread as
+                         each job finishes (e.g. to save_transcript)
+            timeout: Overall deadline in seconds; unfinished jobs get an error
+            initial_delay: First wait before polling a job
+            max_delay: Cap for the per-job poll interval
+            max_submit_workers: Parallel submission requests
 
-                if status == 'completed':
-                    return result['text'] or "No speech detected"
-                elif status == 'error':
-                    return f"Transcription error: {result.get('error', 'Unknown error')}"
+        Returns:
+            {key: transcript text or error message} in the same format as transcribe_url
+        """
+        results = {}
+        deadline = time.monotonic() + timeout
+
+        def finish(key, text):
+            results[key] = text
+            if self.transcript_cache:
+                self.transcript_cache.put(text, jobs[key])
+            if on_complete:
+                on_complete(key, text)
+
+        # Already transcribed (possibly under another URL): no new job
+        if self.transcript_cache:
+            for key, url in jobs.items():
+                cached = self.transcript_cache.get(url) if url else None
+                if cached:
+                    results[key] = cached
+                    if on_complete:
+                        on_complete(key, cached)
+
+        # Submit everything at once
+        def submit(item):
+            key, url = item
+            if not url:
+                return key, None, "Error: No video URL provided"
+            try:
+                return key, self.submit(url), None
+            except requests.exceptions.RequestException as e:
+                return key, None, f"Error transcribing: {e}"
+
+        pending = {}  # key -> [transcript_id, next_poll_at, delay]
+        with ThreadPoolExecutor(max_workers=max_submit_workers) as pool:
+            to_submit = [(key, url) for key, url in jobs.items() if key not in results]
+            for key, transcript_id, error in pool.map(submit, to_submit):
+                if error:
+                    finish(key, error)
+                else:
+                    print(f"Transcription job started: {transcript_id}")
+                    pending[key] = [transcript_id, time.monotonic() + initial_delay, initial_delay]
+
+        # One poller for all jobs
+        while pending:
+            key = min(pending, key=lambda k: pending[k][1])
+            transcript_id, next_poll_at, delay = pending[key]
+
+            if next_poll_at > deadline:
+                for timed_out in list(pending):
+                    finish(timed_out, f"Transcription error: timed out after {timeout:.0f}s")
+                    del pending[timed_out]
+                break
+
+            time.sleep(max(0, next_poll_at - time.monotonic()))
 
-                print(f"Transcription status: {status}...")
-                time.sleep(3)  # Poll every 3 seconds
+            try:
+                result = self.get_status(transcript_id)
+            except requests.exceptions.RequestException as e:
+                result = {'status': 'poll_failed', 'error': str(e)}
+
+            status = result['status']
+            if status == 'completed':
+                finish(key, result['text'] or "No speech detected")
+                del pending[key]
+            elif status == 'error':
+                finish(key, f"Transcription error: {result.get('error', 'Unknown error')}")
+                del pending[key]
+            else:
+                # Still queued/processing (or a transient poll failure): back off with jitter
+                delay = min(max_delay, delay * 2)
+                pending[key] = [transcript_id, time.monotonic() + delay * random.uniform(0.8, 1.2), delay]
 
-        except requests.exceptions.RequestException as e:
-            return f"Error transcribing: {e}"
+        return results
 
     def transcribe_instagram_reel(self, reel: dict) -> str:
         """
@@ -226,113 +476,330 @@ class AssemblyAITranscriber:
         if not video_url:
             return "Error: Reel has no video URL. Re-scrape with video URLs enabled."
 
-        return self.transcribe_url(video_url)
+        # The reel's page URL survives CDN re-signing; cache under both
+        if self.transcript_cache:
+            cached = self.transcript_cache.get(reel.get('url'), video_url)
+            if cached:
+                return cached
+
+        transcript = self.transcribe_url(video_url)
+        if self.transcript_cache:
+            self.transcript_cache.put(transcript, reel.get('url'), video_url)
+        return transcript
+
+# ============================================
+# YOUTUBE UPLOAD FEED (RSS/ATOM)
+# ============================================
+
+FEED_NAMESPACES = {
+    'atom': "http://www.w3.org/2005/Atom",
+    'yt': "http://www.youtube.com/xml/schemas/2015",
+    'media': "http://search.yahoo.com/mrss/",
+}
+
+
+def parse_upload_feed(xml_text) -> dict:
+    """
+    Parse a channel's Atom upload feed (latest ~15 uploads, newest first).
+
+    Returns:
+        {'channel_id': str, 'videos': [{'id', 'title', 'url', 'published',
+         'view_count', 'thumbnail'}, ...]}
+
+    Raises:
+        ValueError: If the document isn't a YouTube upload feed
+    """
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid upload feed: {e}")
+    if root.tag != f"{{{FEED_NAMESPACES['atom']}}}feed":
+        raise ValueError(f"Invalid upload feed: unexpected root <{root.tag}>")
+
+    videos = []
+    for entry in root.findall('atom:entry', FEED_NAMESPACES):
+        video_id = entry.findtext('yt:videoId', namespaces=FEED_NAMESPACES)
+        if not video_id:
+            continue
+        link = entry.find('atom:link', FEED_NAMESPACES)
+        stats = entry.find('media:group/media:community/media:statistics', FEED_NAMESPACES)
+        thumbnail = entry.find('media:group/media:thumbnail', FEED_NAMESPACES)
+        videos.append({
+            'id': video_id,
+            'title': entry.findtext('atom:title', namespaces=FEED_NAMESPACES),
+            'url': link.get('href') if link is not None else f"https://www.youtube.com/watch?v={video_id}",
+            'published': entry.findtext('atom:published', namespaces=FEED_NAMESPACES),
+            'view_count': int(stats.get('views', 0)) if stats is not None else None,
+            'thumbnail': thumbnail.get('url') if thumbnail is not None else None,
+        })
+
+    return {
+        'channel_id': root.findtext('yt:channelId', namespaces=FEED_NAMESPACES),
+        'videos': videos,
+    }
+
 
 class YouTubeScraper:
-    def __init__(self):
+    FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+
+    def __init__(self, transcript_cache=None, channel_cache=None, http=None):
+        # Optional TranscriptCache checked by get_transcript before any network call
+        self.transcript_cache = transcript_cache
+        # Optional ChannelCache: video URL / handle -> channel ID, so video URLs resolve once
+        self.channel_cache = channel_cache
+        # Upload feed checks; the shared 'youtube' ProviderClient by default
+        self.http = http or get_client('youtube')
         self.ydl_opts = {
             'quiet': True,
             'extract_flat': True, # Don't download video files
             'force_generic_extractor': False,
+            'lazy_playlist': True,
         }
-
-    def get_channel_videos(self, channel_url, limit=50):
+        # YoutubeDL instances are reused (extractor setup is not free) but are
+        # not thread-safe, so each sync worker thread gets its own
+        self._extractors = threading.local()
+
+    def _extractor(self, kind='flat'):
+        """Long-lived YoutubeDL for this thread: 'flat' for channel listings, 'video' for metadata."""
+        ydl = getattr(self._extractors, kind, None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts.copy() if kind == 'flat' else {'quiet': True})
+            setattr(self._extractors, kind, ydl)
+        return ydl
+
+    def get_channel_videos(self, channel_url, limit=50, known_ids=None, refresh_window=0):
         """
         Fetches the latest videos from a channel.
         Handles single video URLs by resolving them to the channel first.
-        """
-        # 1. Handle Single Video URLs (detect 'watch?v=' or 'youtu.be/')
-        if 'watch?v=' in channel_url or 'youtu.be/' in channel_url:
-            print(f"Detected video URL: {channel_url}. Resolving channel...")
-            try:
-                with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
-                    info = ydl.extract_info(channel_url, download=False)
-                    if info and 'uploader_url' in info:
-                        channel_url = info['uploader_url']
-                        print(f"Resolved to channel: {channel_url}")
-                    else:
-                        print("Could not resolve channel from video.")
-            except Exception as e:
-                print(f"Error resolving channel: {e}")
-                # Fall through and try anyway, though it will likely fail if it's a video link
 
-        # 2. Add /videos to ensure we get the video tab if a generic channel URL is passed
-        # Only do this if it looks like a standard channel URL
-        if '/@' in channel_url and not channel_url.endswith('/videos'):
-             target_url = channel_url.rstrip('/') + '/videos'
-        else:
-            target_url = channel_url
+        Incremental mode (known_ids given): the feed is walked lazily, newest
+        first, and stops at the first already-stored video after re-reading
+        refresh_window known videos for fresh view counts. Only the feed pages
+        actually walked are requested. Errors are raised rather than returned
+        as [], so [] means nothing new.
 
-        ydl_opts = self.ydl_opts.copy()
-        ydl_opts['playlistend'] = limit
+        Args:
+            channel_url: Channel (or video) URL
+            limit: Maximum number of new videos
+            known_ids: platform_video_ids already stored for this channel
+            refresh_window: Known videos to re-read after the newest new one
+        """
+        target_url = self._videos_tab_url(channel_url)
+        if known_ids is not None:
+            videos = self._get_new_channel_videos(target_url, limit, set(known_ids), refresh_window)
+            self._remember_channel(videos, channel_url, target_url)
+            return videos
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(target_url, download=False)
-                
-                if 'entries' not in info:
-                    return []
-                
-                videos = []
-                for entry in info['entries']:
-                    if not entry:
-                        continue
-                        
-                    # Filter out Shorts if possible, or keep them. 
-                    # Usually shorts have 60s length or less, but we might want them.
-                    # For now, let's include everything.
-                    
-                    videos.append({
-                        'id': entry.get('id'),
-                        'title': entry.get('title'),
-                        'url': entry.get('url') or f"https://www.youtube.com/watch?v={entry.get('id')}",
-                        'view_count': entry.get('view_count', 0),
-                        'upload_date': entry.get('upload_date'),
-                        'duration': entry.get('duration'),
-                        'thumbnail': entry.get('thumbnail') # yt-dlp usually provides a thumbnail url
-                    })
-                
-                return videos
+            ydl = self._extractor('flat')
+            ydl.params['playlistend'] = limit
+            info = ydl.extract_info(target_url, download=False)
+
+            if 'entries' not in info:
+                return []
+
+            videos = []
+            for entry in info['entries']:
+                if not entry:
+                    continue
+
+                # Filter out Shorts if possible, or keep them.
+                # Usually shorts have 60s length or less, but we might want them.
+                # For now, let's include everything.
+
+                videos.append(self._entry_to_video(entry, info.get('channel_id')))
+
+            self._remember_channel(videos, channel_url, target_url)
+            return videos
         except Exception as e:
             print(f"Error fetching channel: {e}")
             return []
 
-    def calculate_outliers(self, videos):
+    @staticmethod
+    def channel_id_from_url(channel_url):
+        """Channel ID from a /channel/UC... URL, else None (handles need yt-dlp)."""
+        if '/channel/' not in (channel_url or ''):
+            return None
+        channel_id = channel_url.split('/channel/')[1].split('/')[0].split('?')[0]
+        return channel_id if channel_id.startswith('UC') else None
+
+    def check_feed(self, channel_id, etag=None, last_modified=None, timeout=10):
         """
-        Calculates outlier score for each video.
-        Score = Video Views / Average Views of the fetched batch.
+        Conditional GET of a channel's upload feed: a few KB of XML, or an
+        empty 304 when nothing changed since the validators were issued.
+
+        Returns:
+            {'modified': bool, 'etag', 'last_modified', 'feed': parse_upload_feed result or None}
+
+        Raises:
+            requests.exceptions.RequestException, ValueError (unparseable feed)
         """
-        if not videos:
-            return []
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = self.http.get(self.FEED_URL, params={'channel_id': channel_id}, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return {'modified': False, 'etag': etag, 'last_modified': last_modified, 'feed': None}
+        response.raise_for_status()
+        return {
+            'modified': True,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'feed': parse_upload_feed(response.content),
+        }
 
-        # Filter out videos with None view counts just in case
-        valid_videos = [v for v in videos if v.get('view_count') is not None]
-        
-        if not valid_videos:
-            return videos
+    def cached_channel_id(self, url):
+        """Channel ID for a URL without any network call: /channel/ URLs and the channel cache."""
+        channel_id = self.channel_id_from_url(url)
+        if not channel_id and self.channel_cache:
+            channel_id = self.channel_cache.get(url)
+        return channel_id
+
+    def resolve_channel_id(self, url):
+        """
+        Canonical channel ID for a channel, handle or video URL. Checks the
+        channel cache first; otherwise extracts the page metadata (without
+        format processing) and caches every alias it learns. None on failure.
+        """
+        channel_id = self.cached_channel_id(url)
+        if channel_id:
+            return channel_id
+
+        print(f"Resolving channel for {url}...")
+        try:
+            info = self._extractor('video').extract_info(url, download=False, process=False)
+        except Exception as e:
+            print(f"Error resolving channel: {e}")
+            return None
+
+        channel_id = (info or {}).get('channel_id')
+        if not channel_id:
+            print("Could not resolve channel.")
+            return None
+        print(f"Resolved to channel: {channel_id}")
+        if self.channel_cache:
+            self.channel_cache.put(channel_id, url, info.get('uploader_url'), info.get('channel_url'))
+        return channel_id
+
+    def get_video_metadata(self, video_url):
+        """
+        Full metadata for one video (the flat channel listing has no likes or
+        comments). Skips format processing. Raises on extraction errors.
+
+        Returns:
+            {'id', 'view_count', 'like_count', 'comment_count', 'channel_id'}
+        """
+        info = self._extractor('video').extract_info(video_url, download=False, process=False)
+        if self.channel_cache and info.get('channel_id'):
+            self.channel_cache.put(info['channel_id'], video_url)
+        return {
+            'id': info.get('id'),
+            'view_count': info.get('view_count'),
+            'like_count': info.get('like_count'),
+            'comment_count': info.get('comment_count'),
+            'channel_id': info.get('channel_id'),
+        }
 
-        total_views = sum(v['view_count'] for v in valid_videos)
-        avg_views = total_views / len(valid_videos) if len(valid_videos) > 0 else 0
+    def _remember_channel(self, videos, *urls):
+        """Cache the channel ID a listing reported under the URLs used to reach it."""
+        channel_id = next((v['channel_id'] for v in videos if v.get('channel_id')), None)
+        if channel_id and self.channel_cache:
+            self.channel_cache.put(channel_id, *urls)
 
-        for video in videos:
-            views = video.get('view_count') or 0
-            if avg_views > 0:
-                video['outlier_score'] = round(views / avg_views, 2)
+    def _videos_tab_url(self, channel_url):
+        """Resolve video URLs to their channel and point channel URLs at the videos tab."""
+        # 1. Handle Single Video URLs (detect 'watch?v=' or 'youtu.be/')
+        if 'watch?v=' in channel_url or 'youtu.be/' in channel_url:
+            print(f"Detected video URL: {channel_url}. Resolving channel...")
+            channel_id = self.resolve_channel_id(channel_url)
+            if channel_id:
+                return f"https://www.youtube.com/channel/{channel_id}/videos"
+            # Fall through and try anyway, though it will likely fail if it's a video link
+
+        # 2. Add /videos to ensure we get the video tab if a generic channel URL is passed
+        # Only do this if it looks like a standard channel URL
+        if '/@' in channel_url and not channel_url.endswith('/videos'):
+            return channel_url.rstrip('/') + '/videos'
+        return channel_url
+
+    @staticmethod
+    def _entry_to_video(entry, channel_id=None):
+        """Map a flat playlist entry onto a video dict."""
+        thumbnail = entry.get('thumbnail')  # yt-dlp usually provides a thumbnail url
+        if not thumbnail and entry.get('thumbnails'):
+            thumbnail = entry['thumbnails'][-1].get('url')
+        return {
+            'id': entry.get('id'),
+            'title': entry.get('title'),
+            'url': entry.get('url') or f"https://www.youtube.com/watch?v={entry.get('id')}",
+            'view_count': entry.get('view_count', 0),
+            'upload_date': entry.get('upload_date'),
+            'duration': entry.get('duration'),
+            'thumbnail': thumbnail,
+            'channel_id': entry.get('channel_id') or channel_id  # Enables the feed pre-check
+        }
+
+    def _iter_feed_entries(self, target_url):
+        """
+        Yield flat entries from a channel feed, newest first. Unprocessed
+        extraction keeps yt-dlp's entries generator lazy, so each further
+        page of the feed is only requested when iteration reaches it.
+        """
+        ydl = self._extractor('flat')
+        info = ydl.extract_info(target_url, download=False, process=False)
+        # Channel URLs can redirect to their videos tab
+        for _ in range(3):
+            if not info or info.get('_type') not in ('url', 'url_transparent'):
+                break
+            info = ydl.extract_info(info['url'], download=False, process=False)
+
+        channel_id = (info or {}).get('channel_id')
+        for entry in (info or {}).get('entries') or []:
+            if entry:
+                entry.setdefault('channel_id', channel_id)
+                yield entry
+
+    def _get_new_channel_videos(self, target_url, limit, known_ids, refresh_window):
+        videos = []
+        new = refreshed = 0
+        reached_known = False
+
+        for entry in self._iter_feed_entries(target_url):
+            reached_known = reached_known or entry.get('id') in known_ids
+            if reached_known:
+                if refreshed >= refresh_window:
+                    break
+                refreshed += 1
+            elif new >= limit:
+                break
             else:
-                video['outlier_score'] = 0
-            
-            video['avg_views_benchmark'] = round(avg_views)
+                new += 1
+            videos.append(self._entry_to_video(entry))
 
-        # Sort by outlier score descending
-        videos.sort(key=lambda x: x.get('outlier_score', 0), reverse=True)
+        print(f"Incremental sync: {new} new, {refreshed} refreshed from {target_url}")
         return videos
 
+    def calculate_outliers(self, videos):
+        """
+        Calculates outlier score for each video against the fetched batch
+        (see scoring.compute_scores). Sorted by score, highest first.
+        """
+        return score_videos(videos)
+
 
 
     def get_transcript(self, video_url):
         """
         Fetches transcript for a video using youtube_transcript_api.
         """
+        if self.transcript_cache:
+            cached = self.transcript_cache.get(video_url)
+            if cached:
+                return cached
+
         try:
             video_id = video_url.split('v=')[-1].split('&')[0]
             # Handle short URLs or other formats if needed, but standard watch URLs work with this split usually.
@@ -346,6 +813,8 @@ class YouTubeScraper:
             
             # Format transcript - transcript_list is a list of objects in this version
             full_text = " ".join([item.text for item in transcript_list])
+            if self.transcript_cache:
+                self.transcript_cache.put(full_text, video_url)
             return full_text
             
         except TranscriptsDisabled:
@@ -0,0 +1,397 @@
+"""
+Concurrent watchlist sync.
+
+Creators are fetched in parallel with a separate worker pool and token
+bucket per platform (yt-dlp for YouTube, Apify for Instagram). Results are
+handed to a single BatchWriter thread that writes them with
+bulk_upsert_videos, so SQLite sees a few large transactions instead of
+one per creator.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from database import (
+    bulk_upsert_videos, get_known_video_ids, get_youtube_feed, update_youtube_feed
+)
+from scheduler import defer, reschedule
+from scraper import DatasetReadError
+
+# Known YouTube videos re-read per incremental sync to refresh view counts
+YOUTUBE_REFRESH_WINDOW = 10
+# Full yt-dlp extraction at least this often (seconds), even if the upload feed is unchanged
+YOUTUBE_REFRESH_INTERVAL = int(os.getenv("CONTENT_ENGINE_YOUTUBE_REFRESH_HOURS", 6)) * 3600
+# Instagram through async actor runs written page by page (stream_instagram_reels)
+INSTAGRAM_STREAMING = os.getenv("CONTENT_ENGINE_INSTAGRAM_STREAMING", "1") != "0"
+
+# Per-platform concurrency and request rate (tokens/second, burst size)
+PLATFORM_LIMITS = {
+    'youtube': {'workers': 4, 'rate': 2.0, 'burst': 4},
+    'instagram': {'workers': 2, 'rate': 0.5, 'burst': 2},
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BatchWriter:
+    """
+    Single writer thread. Sync workers put() results; they are written with
+    bulk_upsert_videos once batch_size creators are queued or after
+    flush_interval seconds, whichever comes first.
+    """
+
+    _STOP = object()
+
+    def __init__(self, batch_size: int = 20, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        self.errors = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sync-batch-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, creator_id: int, videos: list):
+        self._queue.put((creator_id, videos))
+
+    def close(self) -> dict:
+        """Flush what is queued, stop the thread and return the write counts."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        return self.counts
+
+    def _run(self):
+        pending = {}
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(pending)
+                return
+            if item is not None:
+                creator_id, videos = item
+                pending[creator_id] = videos
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if len(pending) >= self.batch_size or (deadline is not None and time.monotonic() >= deadline):
+                self._flush(pending)
+                pending = {}
+                deadline = None
+
+    def _flush(self, pending: dict):
+        if not pending:
+            return
+        try:
+            counts = bulk_upsert_videos(pending, rescore=True)
+        except Exception as e:
+            self.errors.append((list(pending), e))
+            return
+        for key, value in counts.items():
+            self.counts[key] += value
+
+
+def stream_instagram_reels(scraper, creators: list, limit: int = 30, page_size: int = 100,
+                           max_retries: int = 2) -> dict:
+    """
+    Sync Instagram creators through one async actor run, writing each dataset
+    page as it arrives so memory is bounded by page_size. Each page is
+    scored against the creators' stored history as it is written.
+
+    Profiles missing from the run's results are retried in a new run, up to
+    max_retries times, as InstagramScraper.get_reels_batch does. Errors from
+    the first run are raised; a failed retry run just leaves its profiles empty.
+
+    Returns:
+        {creator_id: reels_written} plus bulk_upsert_videos totals under 'counts'
+    """
+    by_username = {c['username'].lower(): c['id'] for c in creators}
+    written = {creator_id: 0 for creator_id in by_username.values()}
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    pending = list(by_username)
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            print(f"Retrying {len(pending)} profiles (attempt {attempt + 1})...")
+        try:
+            for page in scraper.iter_reels_async(pending, limit=limit, page_size=page_size):
+                batches = {}
+                for reel in page:
+                    owner = (reel.get('owner_username') or '').lower()
+                    if owner in pending:
+                        batches.setdefault(by_username[owner], []).append(reel)
+                for creator_id, reels in batches.items():
+                    written[creator_id] += len(reels)
+                if batches:
+                    for key, value in bulk_upsert_videos(batches, rescore=True).items():
+                        counts[key] += value
+        except (requests.exceptions.RequestException, RuntimeError, TimeoutError) as e:
+            if not attempt:
+                raise
+            print(f"Retry run failed for {len(pending)} profiles: {e}")
+            break
+        pending = [u for u in pending if not written[by_username[u]]]
+        if not pending:
+            break
+
+    return {'written': written, 'counts': counts}
+
+
+def fetch_youtube_videos(scraper, creator: dict, limit: int = 30,
+                         refresh_window: int = YOUTUBE_REFRESH_WINDOW,
+                         refresh_interval: int = YOUTUBE_REFRESH_INTERVAL) -> list:
+    """
+    Fetch a YouTube creator's new videos, stopping at the ones already stored.
+
+    Once the channel ID is known, the small upload feed is checked first
+    (conditional GET): yt-dlp only runs when the feed lists an unknown video
+    or the last full extraction is older than refresh_interval (view counts
+    are stale). The first sync of a creator is a normal full fetch. The
+    result only has batch scores: write it with bulk_upsert_videos(rescore=True).
+    """
+    known_ids = get_known_video_ids(creator['id'])
+    feed = get_youtube_feed(creator['id'], refresh_interval) or {}
+    channel_id = feed.get('channel_id') or scraper.cached_channel_id(creator['url'])
+
+    if known_ids and channel_id and not feed.get('refresh_due', True):
+        try:
+            check = scraper.check_feed(channel_id, feed.get('etag'), feed.get('last_modified'))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Feed check failed for {creator['url']}, using yt-dlp: {e}")
+        else:
+            update_youtube_feed(creator['id'], channel_id=channel_id, etag=check['etag'],
+                                last_modified=check['last_modified'], checked=True)
+            known = set(known_ids)
+            if not check['modified'] or all(v['id'] in known for v in check['feed']['videos']):
+                return []
+
+    if not known_ids:
+        videos = scraper.get_channel_videos(creator['url'], limit=limit)
+    else:
+        videos = scraper.get_channel_videos(
+            creator['url'], limit=limit, known_ids=known_ids, refresh_window=refresh_window
+        )
+    # The listing's own channel ID wins over a stored or URL-derived one
+    channel_id = next((v['channel_id'] for v in videos if v.get('channel_id')), None) or channel_id
+    update_youtube_feed(creator['id'], channel_id=channel_id, refreshed=True)
+    return videos
+
+
+class SyncEngine:
+    """
+    Syncs many creators concurrently.
+
+    Args:
+        youtube_scraper: YouTubeScraper (or compatible) for YouTube creators
+        instagram_scraper: InstagramScraper for Instagram creators, None if unavailable
+        limits: Overrides for PLATFORM_LIMITS
+        instagram_streaming: Use async actor runs and write dataset pages as they
+                             arrive (stream_instagram_reels), falling back to a
+                             run-sync call if the async run fails
+        youtube_incremental: Only fetch YouTube videos newer than the stored ones
+                             (plus refresh_window known videos for fresh view counts)
+    """
+
+    def __init__(self, youtube_scraper=None, instagram_scraper=None, limits: dict = None,
+                 batch_size: int = 20, instagram_streaming: bool = INSTAGRAM_STREAMING,
+                 youtube_incremental: bool = True, refresh_window: int = YOUTUBE_REFRESH_WINDOW):
+        self.scrapers = {'youtube': youtube_scraper, 'instagram': instagram_scraper}
+        self.instagram_streaming = instagram_streaming
+        self.youtube_incremental = youtube_incremental
+        self.refresh_window = refresh_window
+        self.limits = {p: dict(l) for p, l in PLATFORM_LIMITS.items()}
+        for platform, overrides in (limits or {}).items():
+            self.limits.setdefault(platform, {}).update(overrides)
+        self.batch_size = batch_size
+        self.buckets = {
+            platform: TokenBucket(l['rate'], l['burst']) for platform, l in self.limits.items()
+        }
+
+    def fetch_creator(self, creator: dict, limit: int = 30) -> list:
+        """Fetch and score one creator's videos. Runs on a platform worker thread."""
+        platform = creator.get('platform', 'youtube').lower()
+        scraper = self._scraper(platform)
+
+        self.buckets[platform].acquire()
+        if platform == 'instagram':
+            videos = scraper.get_reels(creator['username'], limit=limit)
+        elif self.youtube_incremental:
+            videos = fetch_youtube_videos(scraper, creator, limit, self.refresh_window)
+            if not videos and get_known_video_ids(creator['id']):
+                self._up_to_date.add(creator['id'])
+        else:
+            videos = scraper.get_channel_videos(creator['url'], limit=limit)
+        return scraper.calculate_outliers(videos) if videos else []
+
+    def fetch_instagram_batch(self, creators: list, limit: int = 30) -> dict:
+        """
+        Fetch and score several Instagram creators with one actor run.
+        Returns {creator_id: videos}; each creator is scored on its own reels.
+        """
+        scraper = self._scraper('instagram')
+
+        self.buckets['instagram'].acquire()
+        reels = scraper.get_reels_batch([c['username'] for c in creators], limit=limit)
+        results = {}
+        for creator in creators:
+            videos = reels.get(creator['username'].lower(), [])
+            results[creator['id']] = scraper.calculate_outliers(videos) if videos else []
+        return results
+
+    def _scraper(self, platform: str):
+        scraper = self.scrapers.get(platform)
+        if scraper is None:
+            raise RuntimeError(f"No scraper configured for {platform}")
+        return scraper
+
+    def _fetch_group(self, platform: str, creators: list, limit: int) -> dict:
+        """
+        Fetch one work unit. Returns {creator_id: videos to write}, or
+        {creator_id: count} for creators already written by streaming.
+        """
+        scraper = self.scrapers.get(platform)
+        if platform == 'instagram' and self.instagram_streaming and hasattr(scraper, 'iter_reels_async'):
+            self.buckets['instagram'].acquire()
+            try:
+                result = stream_instagram_reels(scraper, creators, limit)
+            except DatasetReadError:
+                # The run succeeded and was billed: don't pay for another one
+                raise
+            except (requests.exceptions.RequestException, RuntimeError, TimeoutError) as e:
+                # Pages already written are upserted again: no duplicates
+                print(f"Async Instagram run failed, retrying with run-sync: {e}")
+            else:
+                self._streamed_counts.append(result['counts'])
+                return result['written']
+        if platform == 'instagram':
+            return self.fetch_instagram_batch(creators, limit)
+        return {c['id']: self.fetch_creator(c, limit) for c in creators}
+
+    def _groups(self, creators: list, report: dict) -> list:
+        """Split creators into (platform, [creator, ...]) work units."""
+        groups = []
+        instagram = []
+        for creator in creators:
+            platform = creator.get('platform', 'youtube').lower()
+            if platform not in self.limits:
+                report['failed'].append((creator, RuntimeError(f"Unsupported platform: {platform}")))
+            elif platform == 'instagram':
+                instagram.append(creator)
+            else:
+                groups.append((platform, [creator]))
+
+        run_size = getattr(self.scrapers.get('instagram'), 'MAX_PROFILES_PER_RUN', 1)
+        for start in range(0, len(instagram), run_size):
+            groups.append(('instagram', instagram[start:start + run_size]))
+        return groups
+
+    def run(self, creators: list, limit: int = 30, progress=None) -> dict:
+        """
+        Sync creators and write the results through one BatchWriter.
+        Instagram creators are fetched MAX_PROFILES_PER_RUN per actor run.
+
+        Args:
+            creators: Creator dicts (as returned by get_all_creators)
+            limit: Videos to fetch per creator
+            progress: Optional callback(done, total, creator, error) called on the
+                      calling thread as each creator finishes (safe for Streamlit)
+
+        Returns:
+            {'synced': n, 'empty': [creator, ...], 'failed': [(creator, error), ...],
+             'up_to_date': [creator, ...], 'counts': bulk_upsert_videos totals}
+            Up-to-date creators (incremental, nothing new) also count as synced.
+            Every creator gets its next sync planned (scheduler.py); failed
+            ones are retried after the minimum interval.
+        """
+        started = int(time.time())
+        report = {'synced': 0, 'empty': [], 'failed': [], 'up_to_date': []}
+        self._streamed_counts = []
+        self._up_to_date = set()
+        writer = BatchWriter(batch_size=self.batch_size)
+        pools = {
+            platform: ThreadPoolExecutor(max_workers=l['workers'], thread_name_prefix=f"sync-{platform}")
+            for platform, l in self.limits.items()
+        }
+
+        try:
+            futures = {}
+            for platform, group in self._groups(creators, report):
+                futures[pools[platform].submit(self._fetch_group, platform, group, limit)] = group
+
+            done = len(report['failed'])
+            for future in as_completed(futures):
+                error = future.exception()
+                results = {} if error else future.result()
+                for creator in futures[future]:
+                    videos = results.get(creator['id'])
+                    if error is not None:
+                        report['failed'].append((creator, error))
+                    elif isinstance(videos, int):
+                        # Streamed: already in the database
+                        if videos:
+                            report['synced'] += 1
+                        else:
+                            report['empty'].append(creator)
+                    elif videos:
+                        writer.put(creator['id'], videos)
+                        report['synced'] += 1
+                    elif creator['id'] in self._up_to_date:
+                        # Nothing new; still record the sync time
+                        writer.put(creator['id'], [])
+                        report['up_to_date'].append(creator)
+                        report['synced'] += 1
+                    else:
+                        report['empty'].append(creator)
+
+                    done += 1
+                    if progress:
+                        progress(done, len(creators), creator, error)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+            report['counts'] = writer.close()
+            for counts in self._streamed_counts:
+                for key, value in counts.items():
+                    report['counts'][key] += value
+
+        for creator_ids, error in writer.errors:
+            for creator in creators:
+                if creator['id'] in creator_ids:
+                    report['failed'].append((creator, error))
+        report['synced'] -= sum(len(ids) for ids, _ in writer.errors)
+
+        failed_ids = {creator['id'] for creator, _ in report['failed']}
+        reschedule([c['id'] for c in creators if c['id'] not in failed_ids], synced_at=started)
+        defer(failed_ids)
+        return report
@@ -0,0 +1,148 @@
+"""
+Persistent transcript cache.
+
+Transcripts are stored once per content hash (sha256 of the text) in the
+database and reached through any number of keys: the normalized platform
+video ID (youtube:<id>, instagram:<shortcode>) and the media URL the audio
+was read from. Re-transcribing a video through a different URL, or the same
+reel after its CDN link was re-signed, is a cache hit instead of another
+AssemblyAI bill. Entries expire after a TTL and the least recently used are
+evicted beyond an entry/byte limit.
+"""
+import hashlib
+import os
+import threading
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from database import (
+    get_cached_transcript, put_cached_transcript, purge_expired_transcripts,
+    get_transcript_cache_stats
+)
+
+DEFAULT_TTL_SECONDS = int(os.getenv("CONTENT_ENGINE_TRANSCRIPT_CACHE_TTL_DAYS", 90)) * 86400
+DEFAULT_MAX_BYTES = int(os.getenv("CONTENT_ENGINE_TRANSCRIPT_CACHE_MAX_MB", 64)) * 1024 * 1024
+DEFAULT_MAX_ENTRIES = int(os.getenv("CONTENT_ENGINE_TRANSCRIPT_CACHE_MAX_ENTRIES", 20000))
+
+# Messages returned in place of a transcript; never cached. The permanent
+# ones won't change on a retry.
+PERMANENT_ERRORS = ("Transcripts are disabled", "No transcript found", "No speech detected")
+ERROR_PREFIXES = (
+    "Error fetching transcript", "Error transcribing", "Error:", "Transcription error"
+) + PERMANENT_ERRORS
+
+YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com")
+# Signed CDN links: the query string (expiry, signature) changes, the path doesn't
+SIGNED_MEDIA_HOSTS = ("cdninstagram.com", "fbcdn.net")
+
+
+def is_transcript_error(text: str) -> bool:
+    """True if get_transcript/transcribe_url returned an error message instead of text."""
+    return not text or text.startswith(ERROR_PREFIXES)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def normalize_key(url: str) -> str:
+    """
+    Cache key for a video page or media URL.
+
+    youtube.com/watch?v=ID, youtu.be/ID, /shorts/ID, /embed/ID -> youtube:ID
+    instagram.com/reel/CODE, /p/CODE                           -> instagram:CODE
+    anything else                                              -> media:host/path?sorted-query
+
+    Returns None for empty or non-URL input.
+    """
+    if not url or "://" not in url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    segments = [s for s in parts.path.split('/') if s]
+
+    if host in YOUTUBE_HOSTS:
+        video_id = dict(parse_qsl(parts.query)).get('v')
+        if not video_id and len(segments) >= 2 and segments[0] in ('shorts', 'embed', 'live'):
+            video_id = segments[1]
+        if video_id:
+            return f"youtube:{video_id}"
+    if host == "youtu.be" and segments:
+        return f"youtube:{segments[0]}"
+    if host.endswith("instagram.com") and len(segments) >= 2 and segments[-2] in ('reel', 'reels', 'p', 'tv'):
+        return f"instagram:{segments[-1]}"
+
+    if host.endswith(SIGNED_MEDIA_HOSTS):
+        query = ""
+    else:
+        query = urlencode(sorted(
+            (k, v) for k, v in parse_qsl(parts.query) if not k.startswith('utm_')
+        ))
+    return f"media:{host}{parts.path}" + (f"?{query}" if query else "")
+
+
+class TranscriptCache:
+    """
+    Database-backed transcript cache with hit/miss counters for this process.
+
+    Args:
+        ttl_seconds: Entries older than this are misses (and deleted)
+        max_bytes: Total transcript text kept before LRU eviction
+        max_entries: Transcripts kept before LRU eviction
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def keys_for(*urls) -> list:
+        """Normalized, de-duplicated keys for the given URLs."""
+        keys = []
+        for url in urls:
+            key = normalize_key(url)
+            if key and key not in keys:
+                keys.append(key)
+        return keys
+
+    def get(self, *urls) -> str:
+        """Cached transcript for any of the URLs, or None."""
+        keys = self.keys_for(*urls)
+        if not keys:
+            return None
+        transcript = get_cached_transcript(keys, self.ttl_seconds)
+        with self._lock:
+            if transcript is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return transcript
+
+    def put(self, transcript: str, *urls) -> bool:
+        """Cache a transcript under every URL's key. Error messages are not cached."""
+        keys = self.keys_for(*urls)
+        if not keys or is_transcript_error(transcript):
+            return False
+        evicted = put_cached_transcript(
+            keys, content_hash(transcript), transcript, self.max_bytes, self.max_entries
+        )
+        with self._lock:
+            self.evictions += evicted
+        return True
+
+    def purge_expired(self) -> int:
+        return purge_expired_transcripts(self.ttl_seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+        stats.update(get_transcript_cache_stats())
+        return stats
+
+
+transcript_cache = TranscriptCache()
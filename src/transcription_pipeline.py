@@ -0,0 +1,140 @@
+"""
+Background pre-transcription.
+
+After a sync, videos at or above a score threshold are queued in the
+transcription_jobs table and worked through highest score first, so a
+transcript is usually ready before anyone opens the video in Remix Studio.
+YouTube uses free captions (youtube_transcript_api); Instagram reels go to
+AssemblyAI, capped by a per-run cost budget. Job state lives in the
+database, so a restart picks up where the last run stopped.
+"""
+import os
+
+from background import BackgroundRun
+from database import (
+    enqueue_transcription_jobs, claim_transcription_jobs, release_transcription_jobs,
+    finish_transcription_job
+)
+from transcript_cache import PERMANENT_ERRORS, is_transcript_error
+
+DEFAULT_MIN_SCORE = float(os.getenv("CONTENT_ENGINE_PRETRANSCRIBE_MIN_SCORE", 3.0))
+DEFAULT_BUDGET_USD = float(os.getenv("CONTENT_ENGINE_PRETRANSCRIBE_BUDGET_USD", 1.0))
+
+# AssemblyAI pricing (~$0.01-0.02/min); reels without a duration count as a minute
+ASSEMBLYAI_COST_PER_MINUTE = 0.015
+DEFAULT_DURATION_SECONDS = 60
+
+
+def estimate_cost(job: dict) -> float:
+    """Estimated AssemblyAI cost for one job, from the video duration."""
+    seconds = job.get('duration') or DEFAULT_DURATION_SECONDS
+    return round(seconds / 60 * ASSEMBLYAI_COST_PER_MINUTE, 4)
+
+
+class TranscriptionPipeline:
+    """
+    Works through the transcription job queue.
+
+    Args:
+        youtube_scraper: YouTubeScraper (get_transcript) for YouTube videos
+        transcriber: AssemblyAITranscriber for Instagram reels, None to leave them queued
+        min_score: Queue videos with an outlier score at or above this
+        budget_usd: Maximum estimated AssemblyAI spend per run
+        batch_size: Jobs claimed at a time (Instagram jobs in a claim share one poller)
+        max_attempts: Attempts before a job is marked failed
+    """
+
+    def __init__(self, youtube_scraper, transcriber=None, min_score: float = DEFAULT_MIN_SCORE,
+                 budget_usd: float = DEFAULT_BUDGET_USD, batch_size: int = 10, max_attempts: int = 3):
+        self.youtube_scraper = youtube_scraper
+        self.transcriber = transcriber
+        self.min_score = min_score
+        self.budget_usd = budget_usd
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+    def run(self, max_jobs: int = None) -> dict:
+        """
+        Queue new outliers, then transcribe queued jobs by priority until the
+        queue is empty, max_jobs have run, or only over-budget Instagram
+        jobs remain (those stay queued for the next run).
+
+        Returns:
+            {'queued', 'done', 'failed', 'retrying', 'deferred', 'cost_usd'}
+        """
+        report = {'queued': enqueue_transcription_jobs(self.min_score),
+                  'done': 0, 'failed': 0, 'retrying': 0, 'deferred': 0, 'cost_usd': 0.0}
+        # Once Instagram can't be afforded (or has no transcriber) only YouTube is claimed
+        platform = None if self.transcriber else 'youtube'
+        processed = 0
+
+        while max_jobs is None or processed < max_jobs:
+            limit = self.batch_size if max_jobs is None else min(self.batch_size, max_jobs - processed)
+            jobs = claim_transcription_jobs(limit=limit, platform=platform)
+            if not jobs:
+                break
+
+            youtube, instagram, deferred = [], [], []
+            for job in jobs:
+                if job['platform'] != 'instagram':
+                    youtube.append(job)
+                elif platform is None and report['cost_usd'] + estimate_cost(job) <= self.budget_usd:
+                    report['cost_usd'] += estimate_cost(job)
+                    instagram.append(job)
+                else:
+                    platform = 'youtube'
+                    deferred.append(job)
+
+            if deferred:
+                release_transcription_jobs([job['video_id'] for job in deferred])
+                report['deferred'] += len(deferred)
+
+            for job in youtube:
+                self._record(job, self.youtube_scraper.get_transcript(job['url']), report)
+            if instagram:
+                self._transcribe_instagram(instagram, report)
+            processed += len(youtube) + len(instagram)
+
+        report['cost_usd'] = round(report['cost_usd'], 4)
+        return report
+
+    def _transcribe_instagram(self, jobs: list, report: dict):
+        by_id = {job['video_id']: job for job in jobs}
+        # Reels synced without a media link fall back to the post URL, as in the worker
+        self.transcriber.transcribe_batch(
+            {job['video_id']: job['video_url'] or job['url'] for job in jobs},
+            on_complete=lambda video_id, text: self._record(
+                by_id[video_id], text, report, cost_usd=estimate_cost(by_id[video_id])
+            )
+        )
+
+    def _record(self, job: dict, text: str, report: dict, cost_usd: float = 0.0):
+        if not is_transcript_error(text):
+            finish_transcription_job(job['video_id'], transcript=text, cost_usd=cost_usd)
+            report['done'] += 1
+            return
+
+        retry = not text or not text.startswith(PERMANENT_ERRORS)
+        finish_transcription_job(job['video_id'], error=text or "Empty transcript", cost_usd=cost_usd,
+                                 retry=retry, max_attempts=self.max_attempts)
+        if retry and job['attempts'] < self.max_attempts:
+            report['retrying'] += 1
+        else:
+            report['failed'] += 1
+
+
+# One background run per process; background.last_report is kept for the UI
+background = BackgroundRun("Pre-transcription", thread_name="pretranscribe")
+
+
+def start_background(pipeline: TranscriptionPipeline, max_jobs: int = None) -> bool:
+    """
+    Run the pipeline on a daemon thread. Returns False (and does nothing)
+    if a background run is already in progress.
+    """
+    return background.start(pipeline.run, max_jobs=max_jobs)
+
+
+def is_running() -> bool:
+    """True while a background run is in progress."""
+    return background.is_running()
@@ -0,0 +1,347 @@
+"""
+Background job worker.
+
+The app only enqueues jobs (database.enqueue_job) and shows their status;
+this worker claims them from the jobs table and runs them, so syncing,
+transcription and remixing never block a browser session and survive a
+page refresh.
+
+Job kinds:
+
+    sync_creators   {'creator_ids': [...], 'limit': 30}   SyncEngine run
+    sync_due        {'budget': n}                         scheduler.run_due
+    transcribe      {'video_ids': [...]}                  transcripts for videos that lack one
+    remix           {'video_id': n}                       Claude remix of a stored transcript
+
+Each claimed job holds a lease that a heartbeat extends while it runs; if
+the worker dies the lease lapses and another worker picks the job up.
+Failures are retried with exponential backoff up to the job's
+max_attempts, then dead-lettered (status 'dead') for a manual retry.
+Handlers raise ValueError for jobs that can never succeed (missing video,
+no transcript), which dead-letters them straight away.
+
+Run standalone:  python src/worker.py [--once] [--kinds sync_creators,sync_due]
+Keys come from the environment / .env (APIFY_API_TOKEN, ASSEMBLYAI_API_KEY,
+ANTHROPIC_API_KEY). The app also runs an embedded worker thread unless
+CONTENT_ENGINE_EMBEDDED_WORKER=0, so it works without a second process.
+"""
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+
+import enrichment
+import scheduler
+import transcription_pipeline
+from background import BackgroundRun
+from channel_cache import channel_cache
+from database import (
+    backfill_velocity, claim_jobs, compact_video_metrics, extend_job_lease, finish_job, get_creator_by_id,
+    get_video_by_id, purge_jobs, rescore_stale_creators, save_remix, save_transcript, set_job_progress
+)
+from enrichment import VideoEnricher
+from remix_engine import Remixer
+from scraper import AssemblyAITranscriber, InstagramScraper, YouTubeScraper
+from sync_engine import SyncEngine
+from transcript_cache import PERMANENT_ERRORS, is_transcript_error, transcript_cache
+from transcription_pipeline import TranscriptionPipeline
+
+JOB_KINDS = ('sync_creators', 'sync_due', 'transcribe', 'remix')
+# Seconds a claim lasts without a heartbeat; the heartbeat renews it every third of that
+LEASE_SECONDS = int(os.getenv("CONTENT_ENGINE_JOB_LEASE_SECONDS", 300))
+POLL_SECONDS = float(os.getenv("CONTENT_ENGINE_JOB_POLL_SECONDS", 2.0))
+# First retry delay; doubles with each attempt
+RETRY_BACKOFF = int(os.getenv("CONTENT_ENGINE_JOB_BACKOFF_SECONDS", 60))
+# Finished jobs are kept this long for the status panel
+PURGE_AFTER = 7 * 86400
+# Seconds between Worker.maintain() runs (the first is at start-up)
+MAINTENANCE_INTERVAL = 3600
+
+
+class Worker:
+    """
+    Claims and runs jobs.
+
+    Args:
+        youtube_scraper: YouTubeScraper for YouTube syncs and captions
+        instagram_scraper: InstagramScraper, None if there is no Apify token
+        transcriber: AssemblyAITranscriber for reels, None if there is no key
+        remixer: Remixer, None if there is no Anthropic key
+        kinds: Job kinds to claim (default: all)
+        lease: Lease length in seconds
+        post_sync: Start enrichment and pre-transcription after each sync
+    """
+
+    def __init__(self, youtube_scraper=None, instagram_scraper=None, transcriber=None, remixer=None,
+                 kinds: list = None, lease: int = LEASE_SECONDS, backoff: int = RETRY_BACKOFF,
+                 worker_id: str = None, post_sync: bool = True):
+        self.youtube_scraper = youtube_scraper
+        self.instagram_scraper = instagram_scraper
+        self.transcriber = transcriber
+        self.remixer = remixer
+        self.kinds = list(kinds or JOB_KINDS)
+        self.lease = lease
+        self.backoff = backoff
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.post_sync = post_sync
+        self._enricher = None
+        self._pipeline = None
+        self._job = None
+        self.handlers = {
+            'sync_creators': self.sync_creators,
+            'sync_due': self.sync_due,
+            'transcribe': self.transcribe,
+            'remix': self.remix,
+        }
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'Worker':
+        """A worker with scrapers and clients for whichever API keys are set."""
+        services = {'youtube_scraper': YouTubeScraper(transcript_cache=transcript_cache,
+                                                      channel_cache=channel_cache)}
+        if os.getenv("APIFY_API_TOKEN"):
+            services['instagram_scraper'] = InstagramScraper(os.getenv("APIFY_API_TOKEN"))
+        if os.getenv("ASSEMBLYAI_API_KEY"):
+            services['transcriber'] = AssemblyAITranscriber(os.getenv("ASSEMBLYAI_API_KEY"),
+                                                            transcript_cache=transcript_cache)
+        if os.getenv("ANTHROPIC_API_KEY"):
+            services['remixer'] = Remixer(os.getenv("ANTHROPIC_API_KEY"))
+        return cls(**services, **kwargs)
+
+    def provide(self, **services):
+        """Fill in services that were unavailable at start (e.g. a key entered later)."""
+        for name, service in services.items():
+            if service is not None and getattr(self, name) is None:
+                setattr(self, name, service)
+
+    # ---- handlers: payload -> result dict ----
+
+    def _sync_report(self, report: dict) -> dict:
+        """JSON-safe summary of a SyncEngine report; raises if nothing could be synced."""
+        failed = [f"{creator['display_name']}: {error}" for creator, error in report['failed']]
+        if failed and not report['synced']:
+            raise RuntimeError("; ".join(failed))
+        if report['synced'] and self.post_sync:
+            self._start_post_sync_jobs()
+        return {
+            'synced': report['synced'],
+            'up_to_date': len(report['up_to_date']),
+            'empty': [creator['display_name'] for creator in report['empty']],
+            'failed': failed,
+            'counts': report['counts'],
+        }
+
+    def _sync_progress(self, done: int, total: int, creator: dict, error):
+        """SyncEngine progress callback: shown by the app while the job runs."""
+        if self._job is None:
+            return
+        set_job_progress(self._job['id'], self.worker_id, {
+            'done': done, 'total': total, 'creator': creator['display_name'], 'error': error is not None
+        })
+
+    def _engine(self) -> SyncEngine:
+        return SyncEngine(youtube_scraper=self.youtube_scraper, instagram_scraper=self.instagram_scraper)
+
+    def sync_creators(self, payload: dict) -> dict:
+        creators = [get_creator_by_id(creator_id) for creator_id in payload['creator_ids']]
+        creators = [creator for creator in creators if creator]
+        if not creators:
+            raise ValueError("None of the creators are in the watchlist any more")
+        report = self._engine().run(creators, limit=payload.get('limit', 30), progress=self._sync_progress)
+        return self._sync_report(report)
+
+    def sync_due(self, payload: dict) -> dict:
+        report = scheduler.run_due(self._engine(), budget=payload.get('budget', scheduler.DEFAULT_BUDGET),
+                                   progress=self._sync_progress)
+        if report is None:
+            return {'synced': 0, 'due': 0}
+        return dict(self._sync_report(report), due=report['due'], deferred=report['deferred'])
+
+    def transcribe(self, payload: dict) -> dict:
+        """Transcribe the videos still missing a transcript; reels share one AssemblyAI poller."""
+        videos = [get_video_by_id(video_id) for video_id in payload['video_ids']]
+        pending = [v for v in videos if v and (not v.get('transcript') or is_transcript_error(v['transcript']))]
+        saved, failed, permanent = 0, [], []
+
+        def record(video_id, text):
+            # Saved as each one completes, so a crash mid-batch keeps what was paid for
+            nonlocal saved
+            if is_transcript_error(text):
+                (permanent if text.startswith(PERMANENT_ERRORS) else failed).append(f"{video_id}: {text}")
+            else:
+                save_transcript(video_id, text)
+                saved += 1
+
+        reels = {v['id']: v.get('video_url') or v.get('url') for v in pending if v['platform'] == 'instagram'}
+        if reels:
+            if self.transcriber is None:
+                raise ValueError("AssemblyAI key required to transcribe Instagram reels")
+            self.transcriber.transcribe_batch(reels, on_complete=record)
+        for video in pending:
+            if video['id'] not in reels:
+                record(video['id'], self.youtube_scraper.get_transcript(video['url']))
+
+        if failed:
+            # Saved transcripts are skipped on the retry
+            raise RuntimeError("; ".join(failed))
+        if permanent and not saved:
+            raise ValueError("; ".join(permanent))
+        return {'transcribed': saved, 'skipped': len(videos) - len(pending), 'unavailable': permanent}
+
+    def remix(self, payload: dict) -> dict:
+        video = get_video_by_id(payload['video_id'])
+        if not video or not video.get('transcript') or is_transcript_error(video['transcript']):
+            raise ValueError("Video has no transcript to remix")
+        if self.remixer is None:
+            raise ValueError("Anthropic API key required to remix")
+        return {'remix_id': save_remix(video['id'], self.remixer.remix_content(video['transcript']))}
+
+    def _start_post_sync_jobs(self):
+        """Engagement enrichment and pre-transcription of new top outliers, in the background."""
+        if self.youtube_scraper is None:
+            return
+        # Built once per worker; the transcriber may have been provided since
+        if self._enricher is None:
+            self._enricher = VideoEnricher(self.youtube_scraper)
+            self._pipeline = TranscriptionPipeline(youtube_scraper=self.youtube_scraper)
+        self._pipeline.transcriber = self.transcriber
+        enrichment.start_background(self._enricher)
+        transcription_pipeline.start_background(self._pipeline)
+
+    # ---- job loop ----
+
+    def _heartbeat(self, job_id: int, done: threading.Event):
+        while not done.wait(self.lease / 3):
+            if not extend_job_lease(job_id, self.worker_id, self.lease):
+                print(f"Lost the lease on job {job_id}")
+                return
+
+    def run_job(self, job: dict) -> str:
+        """Run one claimed job and record the outcome. Returns the job's new status."""
+        handler = self.handlers.get(job['kind'])
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job['id'], done),
+                                     name=f"job-{job['id']}-lease", daemon=True)
+        heartbeat.start()
+        self._job = job
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            result = handler(job['payload'])
+        except ValueError as e:
+            status = finish_job(job['id'], self.worker_id, error=str(e), retry=False)
+        except Exception as e:
+            status = finish_job(job['id'], self.worker_id, error=f"{type(e).__name__}: {e}",
+                                backoff=self.backoff)
+        else:
+            status = finish_job(job['id'], self.worker_id, result=result)
+        finally:
+            self._job = None
+            done.set()
+            heartbeat.join()
+        print(f"Job {job['id']} ({job['kind']}, attempt {job['attempts']}): {status}")
+        return status
+
+    def run_once(self) -> int:
+        """Claim and run at most one job. Returns the number run (0 when idle)."""
+        jobs = claim_jobs(self.worker_id, kinds=self.kinds, limit=1, lease=self.lease)
+        for job in jobs:
+            self.run_job(job)
+        return len(jobs)
+
+    def maintain(self) -> dict:
+        """
+        Periodic upkeep: drop old finished jobs, thin out video_metrics,
+        rescore creators scored with another baseline method (or none yet)
+        and fill in velocities that the schema migrations leave to be
+        computed lazily.
+        """
+        report = {
+            'purged': purge_jobs(PURGE_AFTER),
+            'metrics_compacted': compact_video_metrics(),
+            'rescored': rescore_stale_creators(),
+            'velocity': backfill_velocity(),
+        }
+        if report['metrics_compacted'] or report['rescored'] or report['velocity']:
+            print(f"Maintenance: {report}")
+        return report
+
+    def run(self, stop: threading.Event = None, poll_interval: float = POLL_SECONDS):
+        """Work through jobs until stop is set, polling every poll_interval seconds when idle."""
+        stop = stop or threading.Event()
+        maintained_at = None
+        while not stop.is_set():
+            try:
+                if maintained_at is None or time.monotonic() - maintained_at > MAINTENANCE_INTERVAL:
+                    maintained_at = time.monotonic()
+                    self.maintain()
+                if self.run_once():
+                    continue
+            except Exception as e:
+                # e.g. the database was locked past busy_timeout; try again next poll
+                print(f"Worker error: {e}")
+            stop.wait(poll_interval)
+
+
+# One embedded worker thread per process (the app's fallback when no
+# standalone worker runs)
+background = BackgroundRun("Job worker", thread_name="job-worker")
+background_worker = None
+_stop = threading.Event()
+
+
+def start_background(worker: Worker) -> bool:
+    """
+    Run worker.run() on a daemon thread. Returns False (and does nothing)
+    if the embedded worker is already running.
+    """
+    global background_worker, _stop
+    stop = threading.Event()
+    if not background.start(worker.run, stop):
+        return False
+    background_worker, _stop = worker, stop
+    return True
+
+
+def stop_background():
+    """Ask the embedded worker to stop after its current job."""
+    _stop.set()
+
+
+def is_running() -> bool:
+    """True while the embedded worker thread is alive."""
+    return background.is_running()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Content Engine background jobs")
+    parser.add_argument("--once", action="store_true", help="Run due jobs until the queue is empty, then exit")
+    parser.add_argument("--kinds", help=f"Comma-separated job kinds to run (default: {','.join(JOB_KINDS)})")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="Idle poll interval in seconds")
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.kinds.split(",")] if args.kinds else None
+    unknown = set(kinds or ()) - set(JOB_KINDS)
+    if unknown:
+        parser.error(f"Unknown job kinds: {', '.join(sorted(unknown))}")
+
+    worker = Worker.from_env(kinds=kinds, post_sync=not args.once)
+    print(f"Worker {worker.worker_id} running {', '.join(worker.kinds)}")
+    if args.once:
+        worker.maintain()
+        while worker.run_once():
+            pass
+        return
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        worker.run(stop, poll_interval=args.poll)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
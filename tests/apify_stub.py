@@ -0,0 +1,112 @@
+"""
+Local stand-in for the Apify API endpoints used by InstagramScraper's async
+mode: start run, get run, and paged dataset items. Runs on a background
+thread so tests (or a developer) can exercise the client offline:
+
+    with ApifyStub(items, statuses=["RUNNING", "SUCCEEDED"]) as stub:
+        scraper.APIFY_API_BASE = stub.base_url
+
+Like the actor, a run only returns the items of the profiles it was given.
+skip_once leaves profiles out of the first run that asks for them;
+fail_offsets answers a 500 for a dataset page offset once per time it is listed.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class ApifyStub:
+    def __init__(self, items: list, statuses=("RUNNING", "SUCCEEDED"), skip_once=(), fail_offsets=()):
+        self.items = items
+        self.statuses = list(statuses)
+        self.skip_once = set(skip_once)
+        self.fail_offsets = list(fail_offsets)
+        self.dataset = []
+        self.requests = []  # (method, path, query) in arrival order
+        self.run_inputs = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v2"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def run_count(self) -> int:
+        return sum(1 for method, path, q in self.requests if path.endswith("/runs"))
+
+    def _start(self, run_input: dict) -> list:
+        """Items of the requested profiles, less those skipped this once."""
+        usernames = set(run_input.get('username', []))
+        skipped = usernames & self.skip_once
+        self.skip_once -= skipped
+        return [item for item in self.items
+                if item.get('ownerUsername') in usernames - skipped]
+
+    def dataset_page_requests(self) -> list:
+        return [
+            (int(q['offset'][0]), int(q['limit'][0]))
+            for method, path, q in self.requests if path.endswith("/items")
+        ]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _record(self, method):
+                url = urlparse(self.path)
+                stub.requests.append((method, url.path, parse_qs(url.query)))
+                return url.path, parse_qs(url.query)
+
+            def do_POST(self):
+                path, _ = self._record("POST")
+                length = int(self.headers.get("Content-Length", 0))
+                run_input = json.loads(self.rfile.read(length) or b"{}")
+                stub.run_inputs.append(run_input)
+                if path.endswith("/runs"):
+                    stub.dataset = stub._start(run_input)
+                    self._send({'data': {'id': "run1", 'status': "READY", 'defaultDatasetId': "ds1"}}, 201)
+                elif path.endswith("/run-sync-get-dataset-items"):
+                    self._send(stub._start(run_input))
+                else:
+                    self._send({'error': "not found"}, 404)
+
+            def do_GET(self):
+                path, query = self._record("GET")
+                if path.endswith("/actor-runs/run1"):
+                    status = stub.statuses.pop(0) if len(stub.statuses) > 1 else stub.statuses[0]
+                    self._send({'data': {'id': "run1", 'status': status, 'defaultDatasetId': "ds1"}})
+                elif path.endswith("/datasets/ds1/items"):
+                    offset = int(query.get('offset', ["0"])[0])
+                    limit = int(query.get('limit', ["100"])[0])
+                    if offset in stub.fail_offsets:
+                        stub.fail_offsets.remove(offset)
+                        self._send({'error': "internal"}, 500)
+                    else:
+                        self._send(stub.dataset[offset:offset + limit])
+                else:
+                    self._send({'error': "not found"}, 404)
+
+        return Handler
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# App modules import each other top-level (e.g. `from database import ...`),
+# so tests import them the same way to share one copy of module state.
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,125 @@
+import unittest
+
+import database
+from apify_stub import ApifyStub
+from http_client import ProviderClient
+from scraper import InstagramScraper
+from sync_engine import SyncEngine, stream_instagram_reels
+from test_database import DatabaseTestCase
+
+FAST_POLL = {'initial_delay': 0.01, 'max_delay': 0.02}
+
+
+def reel_items(owner: str, count: int, start: int = 0) -> list:
+    return [
+        {'shortCode': f"{owner}{i}", 'ownerUsername': owner, 'videoPlayCount': (i + 1) * 100}
+        for i in range(start, start + count)
+    ]
+
+
+class StubScraperMixin:
+    def make_scraper(self, stub: ApifyStub) -> InstagramScraper:
+        # No client-level retries, so failed pages reach the scraper
+        scraper = InstagramScraper(api_token="test", http=ProviderClient("apify", retries=0))
+        scraper.APIFY_API_BASE = stub.base_url
+        scraper.PAGE_RETRY_DELAY = 0
+        return scraper
+
+
+class TestAsyncRun(StubScraperMixin, unittest.TestCase):
+    def test_pages_through_dataset_after_run_succeeds(self):
+        items = reel_items('alice', 150) + reel_items('bob', 100)
+        with ApifyStub(items, statuses=["READY", "RUNNING", "SUCCEEDED"]) as stub:
+            scraper = self.make_scraper(stub)
+            pages = list(scraper.iter_reels_async(['alice', 'bob'], limit=150, page_size=100, **FAST_POLL))
+
+        self.assertEqual([len(p) for p in pages], [100, 100, 50])
+        self.assertEqual(stub.dataset_page_requests(), [(0, 100), (100, 100), (200, 100)])
+        self.assertEqual(stub.run_inputs, [{'username': ['alice', 'bob'], 'resultsLimit': 150}])
+        polls = [r for r in stub.requests if r[1].endswith("/actor-runs/run1")]
+        self.assertEqual(len(polls), 3)
+        self.assertEqual(pages[0][0]['id'], 'alice0')
+        self.assertEqual(pages[2][-1]['owner_username'], 'bob')
+
+    def test_failed_run_raises(self):
+        with ApifyStub([], statuses=["RUNNING", "FAILED"]) as stub:
+            scraper = self.make_scraper(stub)
+            with self.assertRaises(RuntimeError):
+                list(scraper.iter_reels_async(['alice'], **FAST_POLL))
+
+    def test_run_that_never_finishes_times_out(self):
+        with ApifyStub([], statuses=["RUNNING"]) as stub:
+            scraper = self.make_scraper(stub)
+            with self.assertRaises(TimeoutError):
+                list(scraper.iter_reels_async(['alice'], timeout=0.05, **FAST_POLL))
+
+
+class TestStreamedIngestion(StubScraperMixin, DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ('alice', 'bob'):
+            database.add_creator('instagram', name, f"https://instagram.com/{name}")
+        self.creators = database.get_all_creators()
+        self.by_name = {c['username']: c['id'] for c in self.creators}
+
+    def test_pages_are_written_and_creators_rescored(self):
+        items = reel_items('alice', 3) + reel_items('bob', 2)
+        with ApifyStub(items, statuses=["SUCCEEDED"]) as stub:
+            result = stream_instagram_reels(self.make_scraper(stub), self.creators, page_size=2)
+
+        self.assertEqual(len(stub.dataset_page_requests()), 3)
+        self.assertEqual(result['written'], {self.by_name['alice']: 3, self.by_name['bob']: 2})
+        self.assertEqual(result['counts']['inserted'], 5)
+
+        # Rescored against all stored reels: alice views 100/200/300, mean 200
+        alice = database.get_videos_for_creator(self.by_name['alice'])
+        self.assertEqual([v['outlier_score'] for v in alice], [1.5, 1.0, 0.5])
+
+    def test_sync_engine_streaming_mode(self):
+        items = reel_items('alice', 4)
+        with ApifyStub(items, statuses=["SUCCEEDED"]) as stub:
+            engine = SyncEngine(instagram_scraper=self.make_scraper(stub), instagram_streaming=True)
+            report = engine.run(self.creators)
+
+        self.assertEqual(report['synced'], 1)
+        self.assertEqual([c['username'] for c in report['empty']], ['bob'])
+        self.assertEqual(report['counts']['inserted'], 4)
+
+    def test_failed_async_run_falls_back_to_run_sync(self):
+        items = reel_items('alice', 4)
+        with ApifyStub(items, statuses=["FAILED"]) as stub:
+            report = SyncEngine(instagram_scraper=self.make_scraper(stub)).run(self.creators)
+
+        self.assertTrue(any(path.endswith("/run-sync-get-dataset-items") for _, path, _ in stub.requests))
+        self.assertEqual(report['synced'], 1)
+        self.assertEqual(report['counts']['inserted'], 4)
+
+    def test_missing_profiles_retried_in_a_new_run(self):
+        items = reel_items('alice', 3) + reel_items('bob', 2)
+        with ApifyStub(items, statuses=["SUCCEEDED"], skip_once={'bob'}) as stub:
+            result = stream_instagram_reels(self.make_scraper(stub), self.creators)
+
+        self.assertEqual(stub.run_inputs[1], {'username': ['bob'], 'resultsLimit': 30})
+        self.assertEqual(result['written'], {self.by_name['alice']: 3, self.by_name['bob']: 2})
+
+    def test_failed_page_is_reread_from_the_same_run(self):
+        items = reel_items('alice', 3) + reel_items('bob', 2)
+        with ApifyStub(items, statuses=["SUCCEEDED"], fail_offsets=[2]) as stub:
+            result = stream_instagram_reels(self.make_scraper(stub), self.creators, page_size=2)
+
+        self.assertEqual(stub.run_count(), 1)
+        self.assertEqual(stub.dataset_page_requests(), [(0, 2), (2, 2), (2, 2), (4, 2)])
+        self.assertEqual(result['counts']['inserted'], 5)
+
+    def test_unreadable_dataset_fails_without_another_run(self):
+        items = reel_items('alice', 4)
+        with ApifyStub(items, statuses=["SUCCEEDED"], fail_offsets=[0, 0, 0]) as stub:
+            report = SyncEngine(instagram_scraper=self.make_scraper(stub)).run(self.creators)
+
+        self.assertEqual(stub.run_count(), 1)
+        self.assertFalse(any(path.endswith("/run-sync-get-dataset-items") for _, path, _ in stub.requests))
+        self.assertEqual(len(report['failed']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
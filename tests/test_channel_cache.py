@@ -0,0 +1,121 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import database
+from channel_cache import ChannelCache, channel_alias
+from scraper import YouTubeScraper
+from test_database import DatabaseTestCase
+
+CHANNEL_ID = "UCtestchannel000000000000"
+VIDEO_URL = "https://www.youtube.com/watch?v=vid00000001"
+
+
+class FakeYoutubeDL:
+    """Counts instances and extractions; answers video and channel-tab URLs."""
+
+    created = []
+
+    def __init__(self, opts):
+        self.params = dict(opts)
+        self.extracted = []
+        FakeYoutubeDL.created.append(self)
+
+    def extract_info(self, url, download=False, process=True):
+        self.extracted.append(url)
+        if 'watch?v=' in url:
+            return {'id': "vid00000001", 'channel_id': CHANNEL_ID,
+                    'uploader_url': "https://www.youtube.com/@TestChannel"}
+        entries = [{'id': f"vid0000000{i}", 'title': "t", 'view_count': 10} for i in (2, 1)]
+        return {'_type': 'playlist', 'channel_id': CHANNEL_ID, 'entries': entries}
+
+
+class TestChannelAlias(unittest.TestCase):
+    def test_aliases(self):
+        self.assertEqual(channel_alias(f"https://www.youtube.com/channel/{CHANNEL_ID}/videos"), f"channel:{CHANNEL_ID}")
+        self.assertEqual(channel_alias("https://www.youtube.com/@TestChannel/videos"), "@testchannel")
+        self.assertEqual(channel_alias("https://www.youtube.com/c/TestChannel"), "c:testchannel")
+        self.assertEqual(channel_alias("https://youtu.be/vid00000001"), "video:vid00000001")
+        self.assertEqual(channel_alias(VIDEO_URL + "&t=10s"), "video:vid00000001")
+        self.assertIsNone(channel_alias("https://example.com/page"))
+        self.assertIsNone(channel_alias(None))
+
+    def test_creator_urls_keep_id_case(self):
+        self.assertEqual(database.parse_creator_url(f" https://www.YouTube.com/channel/{CHANNEL_ID} "),
+                         ('youtube', CHANNEL_ID, f"https://www.YouTube.com/channel/{CHANNEL_ID}"))
+        self.assertEqual(database.parse_creator_url("https://youtube.com/watch?v=dQw4w9WgXcQ"),
+                         ('youtube', 'unknown', "https://youtube.com/watch?v=dQw4w9WgXcQ"))
+        self.assertEqual(database.parse_creator_url("https://www.youtube.com/@TestChannel/videos")[1], "testchannel")
+        self.assertEqual(database.parse_creator_url("https://Instagram.com/Bob/"),
+                         ('instagram', 'bob', "https://www.instagram.com/bob"))
+
+
+class TestChannelCache(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        FakeYoutubeDL.created = []
+
+    def extractions(self):
+        return [url for ydl in FakeYoutubeDL.created for url in ydl.extracted]
+
+    def test_put_and_get(self):
+        cache = ChannelCache()
+        cache.put(CHANNEL_ID, VIDEO_URL, "https://www.youtube.com/@TestChannel")
+        self.assertEqual(cache.get("https://youtu.be/vid00000001"), CHANNEL_ID)
+        self.assertEqual(cache.get("https://www.youtube.com/@testchannel/shorts"), CHANNEL_ID)
+        self.assertIsNone(cache.get("https://www.youtube.com/@someoneelse"))
+        # /channel/ URLs need no lookup at all
+        self.assertEqual(cache.get(f"https://www.youtube.com/channel/{CHANNEL_ID}"), CHANNEL_ID)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1})
+
+    def test_video_url_resolved_once_across_restarts(self):
+        with patch('yt_dlp.YoutubeDL', FakeYoutubeDL):
+            scraper = YouTubeScraper(channel_cache=ChannelCache())
+            self.assertEqual(scraper.resolve_channel_id(VIDEO_URL), CHANNEL_ID)
+            self.assertEqual(scraper.resolve_channel_id(VIDEO_URL), CHANNEL_ID)
+            database.close_all_connections()
+            restarted = YouTubeScraper(channel_cache=ChannelCache())
+            self.assertEqual(restarted.resolve_channel_id("https://youtu.be/vid00000001"), CHANNEL_ID)
+            self.assertEqual(restarted.cached_channel_id("https://www.youtube.com/@TestChannel"), CHANNEL_ID)
+
+        self.assertEqual(self.extractions(), [VIDEO_URL])
+
+    def test_sync_of_video_url_creator_skips_resolution(self):
+        with patch('yt_dlp.YoutubeDL', FakeYoutubeDL):
+            scraper = YouTubeScraper(channel_cache=ChannelCache())
+            first = scraper.get_channel_videos(VIDEO_URL, limit=5)
+            second = scraper.get_channel_videos(VIDEO_URL, limit=5)
+
+        self.assertEqual([v['id'] for v in first], [v['id'] for v in second])
+        tab = f"https://www.youtube.com/channel/{CHANNEL_ID}/videos"
+        self.assertEqual(self.extractions(), [VIDEO_URL, tab, tab])
+
+    def test_listing_caches_handle(self):
+        with patch('yt_dlp.YoutubeDL', FakeYoutubeDL):
+            scraper = YouTubeScraper(channel_cache=ChannelCache())
+            scraper.get_channel_videos("https://www.youtube.com/@TestChannel", limit=5)
+            self.assertEqual(scraper.cached_channel_id("https://www.youtube.com/@TestChannel"), CHANNEL_ID)
+
+
+class TestExtractorReuse(unittest.TestCase):
+    def setUp(self):
+        FakeYoutubeDL.created = []
+
+    def test_one_extractor_per_thread(self):
+        with patch('yt_dlp.YoutubeDL', FakeYoutubeDL):
+            scraper = YouTubeScraper()
+            for limit in (5, 10):
+                scraper.get_channel_videos("https://www.youtube.com/@TestChannel", limit=limit)
+            self.assertEqual(len(FakeYoutubeDL.created), 1)
+            self.assertEqual(FakeYoutubeDL.created[0].params['playlistend'], 10)
+
+            worker = threading.Thread(
+                target=scraper.get_channel_videos, args=("https://www.youtube.com/@TestChannel",)
+            )
+            worker.start()
+            worker.join()
+        self.assertEqual(len(FakeYoutubeDL.created), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,354 @@
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import database
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Points database.DB_PATH at a throwaway file for each test."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = database.DB_PATH
+        database.close_all_connections()
+        database.DB_PATH = Path(self._tmp.name) / "test.db"
+
+    def tearDown(self):
+        database.close_all_connections()
+        database.DB_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def add_videos(self, creator_id, scores, prefix="v"):
+        videos = [
+            {'id': f"{prefix}{i}", 'title': f"Video {i}", 'view_count': int(s * 100), 'outlier_score': s}
+            for i, s in enumerate(scores)
+        ]
+        database.upsert_videos(creator_id, videos)
+
+
+class TestConnectionPool(DatabaseTestCase):
+    def test_schema_runs_once_per_process(self):
+        database.get_all_creators()
+        pool = database._get_pool()
+        database.get_all_creators()
+        self.assertIs(database._get_pool(), pool)
+
+    def test_connections_are_reused(self):
+        with database.transaction() as first:
+            pass
+        with database.transaction() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_nested_transactions_share_connection(self):
+        with database.transaction() as outer:
+            with database.transaction() as inner:
+                self.assertIs(outer, inner)
+
+    def test_rollback_on_error(self):
+        creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        with self.assertRaises(RuntimeError):
+            with database.transaction() as conn:
+                conn.execute("DELETE FROM creators WHERE id = ?", (creator_id,))
+                raise RuntimeError("boom")
+        self.assertIsNotNone(database.get_creator_by_id(creator_id))
+
+    def test_upsert_updates_sync_time_in_same_transaction(self):
+        creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.add_videos(creator_id, [1.0, 3.0])
+        self.assertIsNotNone(database.get_creator_by_id(creator_id)['last_synced'])
+        top = database.get_videos_for_creator(creator_id, limit=1)
+        self.assertEqual(top[0]['outlier_score'], 3.0)
+
+    def test_duplicate_creator_returns_existing_id(self):
+        first = database.add_creator('youtube', 'Alice', 'https://youtube.com/@alice')
+        second = database.add_creator('YouTube', 'alice', 'https://youtube.com/@alice')
+        self.assertEqual(first, second)
+
+    def test_pool_shared_across_threads(self):
+        database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        results = []
+
+        def read():
+            results.append(len(database.get_all_creators()))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [1] * 8)
+
+
+class TestMigrations(DatabaseTestCase):
+    def user_version(self) -> int:
+        with database.transaction() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def test_new_database_is_fully_migrated(self):
+        database.get_all_creators()
+        self.assertEqual(self.user_version(), database.MIGRATIONS[-1][0])
+
+    def test_legacy_database_is_upgraded(self):
+        # Schema as it was before video_url and user_version existed
+        conn = sqlite3.connect(str(database.DB_PATH))
+        conn.execute("""
+            CREATE TABLE videos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                creator_id INTEGER NOT NULL,
+                platform_video_id TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
+                view_count INTEGER DEFAULT 0,
+                like_count INTEGER DEFAULT 0,
+                comment_count INTEGER DEFAULT 0,
+                duration INTEGER,
+                upload_date TEXT,
+                thumbnail TEXT,
+                outlier_score REAL DEFAULT 0,
+                transcript TEXT,
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(creator_id, platform_video_id)
+            )
+        """)
+        conn.execute("INSERT INTO videos (creator_id, platform_video_id) VALUES (1, 'old')")
+        conn.commit()
+        conn.close()
+
+        with database.transaction() as conn:
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(videos)")]
+        self.assertIn('video_url', columns)
+        self.assertEqual(self.user_version(), database.MIGRATIONS[-1][0])
+        self.assertEqual(len(database.get_videos_for_creator(1)), 1)
+
+    def test_current_database_skips_introspection(self):
+        database.get_all_creators()
+        database.close_all_connections()
+
+        statements = []
+        conn = database._open_connection(str(database.DB_PATH))
+        conn.set_trace_callback(statements.append)
+        database.migrate_database(conn)
+        conn.close()
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_failed_migration_rolls_back(self):
+        def broken(conn):
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        database.get_all_creators()
+        version = self.user_version()
+        database.MIGRATIONS.append((version + 1, "broken", broken))
+        try:
+            database.close_all_connections()
+            with self.assertRaises(RuntimeError):
+                database.get_all_creators()
+        finally:
+            database.MIGRATIONS.pop()
+
+        database.close_all_connections()
+        with database.transaction() as conn:
+            tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        self.assertNotIn('half_done', tables)
+        self.assertEqual(self.user_version(), version)
+
+
+class TestBulkUpsert(DatabaseTestCase):
+    def test_counts_inserted_updated_unchanged(self):
+        alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        bob = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+
+        counts = database.bulk_upsert_videos({
+            alice: [{'id': 'a1', 'view_count': 10, 'outlier_score': 1.0}],
+            bob: [{'id': 'b1', 'view_count': 20, 'outlier_score': 2.0},
+                  {'id': 'b2', 'view_count': 30, 'outlier_score': 3.0}],
+        })
+        self.assertEqual(counts, {'inserted': 3, 'updated': 0, 'unchanged': 0})
+
+        counts = database.bulk_upsert_videos([
+            (alice, [{'id': 'a1', 'view_count': 10, 'outlier_score': 1.0}]),
+            (bob, [{'id': 'b1', 'view_count': 25, 'outlier_score': 2.5},
+                   {'id': 'b3', 'view_count': 5, 'outlier_score': 0.5}]),
+        ])
+        self.assertEqual(counts, {'inserted': 1, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(len(database.get_videos_for_creator(bob)), 3)
+
+    def test_sync_time_updated_for_every_creator(self):
+        alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        bob = database.add_creator('youtube', 'bob', 'https://youtube.com/@bob')
+        database.bulk_upsert_videos({alice: [], bob: [{'id': 'b1'}]})
+        for creator_id in (alice, bob):
+            self.assertIsNotNone(database.get_creator_by_id(creator_id)['last_synced'])
+
+    def test_failed_batch_writes_nothing(self):
+        alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        with self.assertRaises(Exception):
+            database.bulk_upsert_videos({alice: [{'id': 'a1'}, {'id': None}]})
+        self.assertEqual(database.get_videos_for_creator(alice), [])
+        self.assertIsNone(database.get_creator_by_id(alice)['last_synced'])
+
+
+class TestFeedQueries(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.bob = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        self.add_videos(self.alice, [0.5, 1.0, 2.0, 3.0, 4.0], prefix="a")
+        self.add_videos(self.bob, [1.5, 2.5, 3.5, 5.0], prefix="b")
+
+    def test_platform_filter_returns_full_page(self):
+        rows = database.get_all_outliers(min_score=1.0, limit=3, platform='Instagram')
+        self.assertEqual([r['outlier_score'] for r in rows], [5.0, 3.5, 2.5])
+        self.assertEqual({r['platform'] for r in rows}, {'instagram'})
+
+    def test_all_platform_is_unfiltered(self):
+        rows = database.get_all_outliers(min_score=3.0, limit=10, platform='All')
+        self.assertEqual([r['outlier_score'] for r in rows], [5.0, 4.0, 3.5, 3.0])
+
+    def test_cursor_continues_after_last_row(self):
+        first = database.get_all_outliers(min_score=1.0, limit=4)
+        last = first[-1]
+        rest = database.get_all_outliers(min_score=1.0, limit=10, cursor=(last['outlier_score'], last['id']))
+        self.assertEqual(
+            [r['outlier_score'] for r in first + rest],
+            [5.0, 4.0, 3.5, 3.0, 2.5, 2.0, 1.5, 1.0]
+        )
+
+    def test_outlier_pages_cover_feed_once(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = database.get_outlier_page(min_score=1.0, page_size=3, cursor=cursor)
+            seen.extend(r['id'] for r in rows)
+            pages += 1
+            if cursor is None:
+                break
+        expected = [r['id'] for r in database.get_all_outliers(min_score=1.0, limit=100)]
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+    def test_top_videos_by_creator(self):
+        top = database.get_top_videos_by_creator(per_creator=2)
+        self.assertEqual(set(top), {self.alice, self.bob})
+        self.assertEqual([v['outlier_score'] for v in top[self.alice]], [4.0, 3.0])
+        self.assertEqual([v['outlier_score'] for v in top[self.bob]], [5.0, 3.5])
+        self.assertNotIn('creator_rank', top[self.alice][0])
+
+    def test_top_videos_for_selected_creators(self):
+        self.assertEqual(list(database.get_top_videos_by_creator(creator_ids=[self.bob])), [self.bob])
+        self.assertEqual(database.get_top_videos_by_creator(creator_ids=[]), {})
+        # More IDs than fit in one statement's parameters
+        many = [self.alice] + list(range(10_000, 310_000)) + [self.bob]
+        self.assertEqual(set(database.get_top_videos_by_creator(per_creator=1, creator_ids=many)),
+                         {self.alice, self.bob})
+
+    def test_feed_stats(self):
+        stats = database.get_feed_stats(min_score=1.0, hot_score=3.0)
+        self.assertEqual(stats, {
+            'creators': 2,
+            'videos': 8,
+            'hot_outliers': 4,
+            'platforms': {'youtube': 4, 'instagram': 4},
+        })
+
+    def test_feed_stats_empty_library(self):
+        database.remove_creator(self.alice)
+        database.remove_creator(self.bob)
+        self.assertEqual(database.get_feed_stats(), {
+            'creators': 0, 'videos': 0, 'hot_outliers': 0, 'platforms': {}
+        })
+
+    def test_videos_needing_transcripts(self):
+        top = database.get_videos_needing_transcripts(platform='instagram', min_score=2.0)
+        self.assertEqual([r['outlier_score'] for r in top], [5.0, 3.5, 2.5])
+        database.save_transcript(top[0]['id'], "already done")
+        rows = database.get_videos_needing_transcripts(platform='instagram', min_score=2.0, limit=1)
+        self.assertEqual([r['outlier_score'] for r in rows], [3.5])
+
+
+class TestConcurrency(DatabaseTestCase):
+    def test_storage_profile_applied(self):
+        with database.transaction() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(
+                conn.execute("PRAGMA busy_timeout").fetchone()[0],
+                database.STORAGE_PROFILE['busy_timeout']
+            )
+
+    def test_configure_storage_rejects_unknown_settings(self):
+        with self.assertRaises(ValueError):
+            database.configure_storage(journal='wal')
+
+    def test_write_inside_read_transaction_is_rejected(self):
+        with database.transaction():
+            with self.assertRaises(RuntimeError):
+                database.save_transcript(1, "text")
+
+    def test_write_queue_is_fifo(self):
+        queue = database.WriteQueue()
+        order = []
+
+        def writer(n):
+            with queue.slot():
+                order.append(n)
+
+        with queue.slot():
+            threads = []
+            for n in range(5):
+                t = threading.Thread(target=writer, args=(n,))
+                t.start()
+                threads.append(t)
+                # Let each writer take its ticket before starting the next
+                while queue._next_ticket < n + 2:
+                    time.sleep(0.001)
+        for t in threads:
+            t.join()
+        self.assertEqual(order, list(range(5)))
+
+    def test_many_readers_and_writers(self):
+        creators = [
+            database.add_creator('youtube', f"creator{i}", f"https://youtube.com/@creator{i}")
+            for i in range(4)
+        ]
+        errors = []
+        writes_per_thread = 25
+
+        def write(n):
+            try:
+                creator_id = creators[n % len(creators)]
+                for i in range(writes_per_thread):
+                    database.upsert_videos(creator_id, [
+                        {'id': f"w{n}-{i}", 'view_count': i, 'outlier_score': i / 10}
+                    ])
+                    video = database.get_videos_for_creator(creator_id, limit=1)[0]
+                    database.save_transcript(video['id'], f"transcript {n}-{i}")
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(writes_per_thread * 2):
+                    database.get_all_outliers(min_score=0, limit=50)
+                    database.get_all_creators()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        threads += [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        total = sum(c['video_count'] for c in database.get_all_creators())
+        self.assertEqual(total, 8 * writes_per_thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import database
+import enrichment
+from enrichment import VideoEnricher
+from test_database import DatabaseTestCase
+
+
+class FakeScraper:
+    def __init__(self, likes=None, fail_for=(), delay=0.02):
+        self.likes = likes or {}
+        self.fail_for = set(fail_for)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_video_metadata(self, url):
+        video_id = url.split('v=')[-1]
+        with self._lock:
+            self.calls.append(video_id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if video_id in self.fail_for:
+                raise RuntimeError("Video unavailable")
+            return {'id': video_id, 'view_count': 1, 'like_count': self.likes.get(video_id, 10),
+                    'comment_count': 2}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestEnrichment(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        database.upsert_videos(self.creator_id, [
+            {'id': f"v{i}", 'url': f"https://www.youtube.com/watch?v=v{i}", 'view_count': 100,
+             'outlier_score': score}
+            for i, score in enumerate([0.5, 1.0, 2.5, 3.0, 4.0, 5.0])
+        ])
+        ig = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        database.upsert_videos(ig, [{'id': 'reel', 'like_count': 7, 'outlier_score': 9.0}])
+
+    def counts(self):
+        return {v['platform_video_id']: (v['like_count'], v['comment_count'])
+                for v in database.get_videos_for_creator(self.creator_id)}
+
+    def age(self, table, column, hours):
+        with database.transaction(write=True) as conn:
+            conn.execute(f"UPDATE {table} SET {column} = datetime('now', '-{hours} hours')")
+
+    def test_enriches_new_youtube_videos_concurrently(self):
+        scraper = FakeScraper()
+        report = VideoEnricher(scraper, max_workers=3).run()
+
+        self.assertEqual(report, {'candidates': 6, 'fetched': 6, 'failed': 0, 'updated': 6})
+        self.assertEqual(scraper.max_active, 3)
+        self.assertNotIn('reel', scraper.calls)
+        self.assertEqual(self.counts()['v0'], (10, 2))
+
+    def test_old_videos_only_when_high_scoring(self):
+        self.age('videos', 'synced_at', 72)
+        scraper = FakeScraper()
+        VideoEnricher(scraper, min_score=3.0).run()
+        self.assertEqual(sorted(scraper.calls), ['v3', 'v4', 'v5'])
+        self.assertIsNone(self.counts()['v0'][0])
+
+    def test_refresh_only_writes_changed_counters(self):
+        VideoEnricher(FakeScraper(likes={'v5': 10})).run()
+        self.age('video_enrichment', 'enriched_at', 48)
+
+        report = VideoEnricher(FakeScraper(likes={'v5': 99})).run()
+        self.assertEqual(report['fetched'], 4)
+        self.assertEqual(report['updated'], 1)
+        self.assertEqual(self.counts()['v5'], (99, 2))
+
+    def test_enriched_videos_skipped_until_refresh_due(self):
+        VideoEnricher(FakeScraper()).run()
+        # Another process (or a restart) doesn't fetch them again
+        scraper = FakeScraper()
+        self.assertEqual(VideoEnricher(scraper).run()['candidates'], 0)
+        self.assertEqual(scraper.calls, [])
+
+        self.age('video_enrichment', 'enriched_at', 48)
+        self.assertEqual(VideoEnricher(scraper).run()['fetched'], 4)
+
+    def test_failures_are_retried_next_run(self):
+        report = VideoEnricher(FakeScraper(fail_for={'v5'})).run()
+        self.assertEqual(report['failed'], 1)
+        self.assertEqual(VideoEnricher(FakeScraper()).run()['candidates'], 1)
+
+    def test_resync_keeps_enriched_counts(self):
+        VideoEnricher(FakeScraper()).run()
+        # Flat listings carry no likes/comments
+        database.upsert_videos(self.creator_id, [{'id': 'v5', 'view_count': 500, 'outlier_score': 5.0}])
+        self.assertEqual(self.counts()['v5'], (10, 2))
+
+    def test_background_run(self):
+        self.assertTrue(enrichment.start_background(VideoEnricher(FakeScraper())))
+        self.assertTrue(enrichment.background.wait(10))
+        self.assertEqual(enrichment.background.last_report['updated'], 6)
@@ -0,0 +1,199 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+
+from http_client import CircuitBreaker, CircuitOpenError, LatencyHistogram, ProviderClient
+
+
+class ScriptedServer:
+    """Answers each request with the next (status, headers) from a script; 200 once it runs out."""
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.requests = []  # (method, client port)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests.append((self.command, self.client_address[1]))
+                status, headers = server.script.pop(0) if server.script else (200, {})
+                body = b'{"ok": true}'
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _reply
+
+        return Handler
+
+
+def client(**kwargs) -> ProviderClient:
+    kwargs.setdefault('backoff', 0.01)
+    return ProviderClient("test", timeout=5, **kwargs)
+
+
+class TestProviderClient(unittest.TestCase):
+    def test_connections_are_reused(self):
+        http = client()
+        with ScriptedServer() as server:
+            for _ in range(3):
+                http.get(server.url).raise_for_status()
+        self.assertEqual(len({port for _, port in server.requests}), 1)
+
+    def test_retries_5xx_with_backoff(self):
+        http = client(retries=3)
+        with ScriptedServer([(503, {}), (502, {})]) as server:
+            response = http.get(server.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.requests), 3)
+        stats = http.stats()
+        self.assertEqual((stats['requests'], stats['retries'], stats['failures']), (3, 2, 2))
+        self.assertEqual(stats['latency']['count'], 3)
+
+    def test_gives_up_and_returns_last_response(self):
+        http = client(retries=1)
+        with ScriptedServer([(500, {})] * 3) as server:
+            response = http.get(server.url)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(server.requests), 2)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            response.raise_for_status()
+
+    def test_honours_retry_after(self):
+        http = client(backoff=10)
+        with ScriptedServer([(429, {'Retry-After': "0"})]) as server:
+            start = time.monotonic()
+            self.assertEqual(http.get(server.url).status_code, 200)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_post_only_retried_when_not_processed(self):
+        http = client()
+        with ScriptedServer([(500, {})]) as server:
+            self.assertEqual(http.post(server.url, json={}).status_code, 500)
+        self.assertEqual(len(server.requests), 1)
+
+        with ScriptedServer([(429, {}), (503, {})]) as server:
+            self.assertEqual(http.post(server.url, json={}).status_code, 200)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        http = client()
+        with ScriptedServer([(404, {})]) as server:
+            self.assertEqual(http.get(server.url).status_code, 404)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(http.breaker.failures, 0)
+
+    def test_circuit_opens_and_fails_fast(self):
+        http = client(retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        with ScriptedServer([(500, {})] * 2) as server:
+            http.get(server.url)
+            http.get(server.url)
+            with self.assertRaises(CircuitOpenError):
+                http.get(server.url)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(http.stats()['circuit'], 'open')
+        self.assertTrue(issubclass(CircuitOpenError, requests.exceptions.RequestException))
+
+    def test_connection_errors_raise(self):
+        http = client(retries=1)
+        with ScriptedServer() as server:
+            url = server.url
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            http.get(url)
+        self.assertEqual(http.stats()['requests'], 2)
+
+    def test_any_request_error_settles_the_trial(self):
+        http = client(retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.01))
+        http.breaker.record_failure()
+        time.sleep(0.02)
+        with patch.object(http.session, 'request', side_effect=requests.exceptions.TooManyRedirects("loop")):
+            with self.assertRaises(requests.exceptions.TooManyRedirects):
+                http.get("http://example.invalid/")
+        self.assertEqual((http.breaker.state, http.stats()['failures']), ('open', 1))
+
+        time.sleep(0.02)
+        with ScriptedServer() as server:
+            self.assertEqual(http.get(server.url).status_code, 200)
+        self.assertEqual(http.breaker.state, 'closed')
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        # Only one trial request while half-open
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, 'closed')
+        self.assertTrue(breaker.allow())
+
+    def test_lost_trial_is_replaced(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        # The trial never records a result: another is let through later
+        self.assertFalse(breaker.allow())
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, 'half_open')
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for seconds in [0.02] * 90 + [0.7] * 9 + [3.0]:
+            histogram.observe(seconds)
+        stats = histogram.snapshot()
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['p50'], 0.05)
+        self.assertEqual(stats['p95'], 1)
+        self.assertEqual(stats['max'], 3.0)
+        self.assertEqual(stats['buckets'], {0.05: 90, 1: 9, 5: 1})
+
+    def test_empty(self):
+        self.assertIsNone(LatencyHistogram().snapshot()['p50'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import subprocess
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+import database
+from query_cache import QueryCache
+from test_database import DatabaseTestCase
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_hit_after_miss(self):
+        cache = QueryCache()
+        calls = []
+        loader = lambda: calls.append(1) or "value"
+        self.assertEqual(cache.get_or_load("k", loader), "value")
+        self.assertEqual(cache.get_or_load("k", loader), "value")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_bump_invalidates(self):
+        cache = QueryCache()
+        cache.get_or_load("k", lambda: 1)
+        cache.bump()
+        self.assertEqual(cache.get_or_load("k", lambda: 2), 2)
+
+    def test_bounded_lru(self):
+        cache = QueryCache(max_entries=2)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+        cache.get_or_load("a", lambda: 1)  # a is now most recent
+        cache.get_or_load("c", lambda: 3)  # evicts b
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.get_or_load("a", lambda: "reloaded"), 1)
+        self.assertEqual(cache.get_or_load("b", lambda: "reloaded"), "reloaded")
+
+    def test_result_loaded_across_a_write_is_not_stored(self):
+        cache = QueryCache()
+
+        def loader():
+            cache.bump()  # a write commits while this read is running
+            return "stale"
+
+        cache.get_or_load("k", loader)
+        self.assertEqual(cache.get_or_load("k", lambda: "fresh"), "fresh")
+
+    def test_external_version_change_invalidates(self):
+        cache = QueryCache()
+        cache.observe(1)
+        cache.get_or_load("k", lambda: "old")
+        cache.observe(1)
+        self.assertEqual(cache.get_or_load("k", lambda: "new"), "old")
+        cache.observe(2)
+        self.assertEqual(cache.get_or_load("k", lambda: "new"), "new")
+
+    def test_version_checked_at_most_once_per_interval(self):
+        cache = QueryCache(version_interval=60)
+        versions = iter([1, 2])
+        cache.check_version(lambda: next(versions))
+        cache.get_or_load("k", lambda: "old")
+        cache.check_version(lambda: next(versions))
+        self.assertEqual(cache.get_or_load("k", lambda: "new"), "old")
+
+        cache.version_interval = 0
+        cache.check_version(lambda: next(versions))
+        self.assertEqual(cache.get_or_load("k", lambda: "new"), "new")
+
+
+class TestCachedReads(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.add_videos(self.creator_id, [1.0, 2.0])
+
+    def test_repeat_reads_skip_sqlite(self):
+        first = database.get_all_outliers(min_score=1.0)
+        with patch.object(database, 'transaction', side_effect=AssertionError("hit SQLite")):
+            self.assertEqual(database.get_all_outliers(min_score=1.0), first)
+
+    def test_writes_invalidate(self):
+        self.assertEqual(len(database.get_videos_for_creator(self.creator_id)), 2)
+        self.add_videos(self.creator_id, [3.0], prefix="new")
+        self.assertEqual(len(database.get_videos_for_creator(self.creator_id)), 3)
+
+        video_id = database.get_videos_for_creator(self.creator_id)[0]['id']
+        self.assertIsNone(database.get_video_by_id(video_id)['transcript'])
+        database.save_transcript(video_id, "hello")
+        self.assertEqual(database.get_video_by_id(video_id)['transcript'], "hello")
+
+        self.assertEqual(database.get_remixes_for_video(video_id), [])
+        database.save_remix(video_id, "remixed")
+        self.assertEqual(len(database.get_remixes_for_video(video_id)), 1)
+
+        self.assertEqual(len(database.get_all_creators()), 1)
+        database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        self.assertEqual(len(database.get_all_creators()), 2)
+        database.remove_creator(self.creator_id)
+        self.assertEqual(len(database.get_all_creators()), 1)
+
+    def test_rolled_back_write_invalidates(self):
+        with self.assertRaises(RuntimeError):
+            with database.transaction(write=True) as conn:
+                conn.execute("DELETE FROM videos")
+                self.assertEqual(database.get_all_outliers(min_score=0), [])
+                raise RuntimeError("boom")
+        self.assertEqual(len(database.get_all_outliers(min_score=0)), 2)
+
+    def test_writes_from_another_process_invalidate(self):
+        self.assertEqual(len(database.get_all_creators()), 1)
+        subprocess.run([sys.executable, "-c", (
+            "import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); "
+            "conn.execute(\"INSERT INTO creators (platform, username, url) VALUES ('youtube', 'bob', 'u')\"); "
+            "conn.commit()"
+        ), str(database.DB_PATH)], check=True)
+        with patch.object(database.query_cache, 'version_interval', 0):
+            self.assertEqual(len(database.get_all_creators()), 2)
+
+    def test_cache_shared_across_threads(self):
+        database.get_all_creators()
+        hits_before = database.query_cache.hits
+        thread = threading.Thread(target=database.get_all_creators)
+        thread.start()
+        thread.join()
+        self.assertEqual(database.query_cache.hits, hits_before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+EXPLAIN QUERY PLAN regression tests for the feed queries.
+Each test traces the SQL a database function actually runs, so a query
+rewrite that stops using its index fails here instead of in production.
+"""
+import unittest
+
+import database
+from test_database import DatabaseTestCase
+
+
+class QueryPlanTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.add_videos(creator_id, [0.5, 1.0, 2.0, 4.0])
+        database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        self.creator_id = creator_id
+
+    def query_plans(self, fn, *args, **kwargs) -> list:
+        """Run fn and return the EXPLAIN QUERY PLAN details of each SELECT it issued."""
+        fn = getattr(fn, 'uncached', fn)  # a cache hit would issue no SQL
+        statements = []
+        with database.transaction() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                fn(*args, **kwargs)
+            finally:
+                conn.set_trace_callback(None)
+
+            plans = []
+            for sql in statements:
+                if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                    continue
+                rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+                plans.append([row['detail'] for row in rows])
+        self.assertTrue(plans, "function issued no SELECT statements")
+        return plans
+
+    def assertUsesIndex(self, plan: list, index: str):
+        self.assertTrue(any(index in step for step in plan), f"{index} not used: {plan}")
+
+    def assertNoSort(self, plan: list):
+        self.assertFalse(any("TEMP B-TREE" in step for step in plan), f"query sorts: {plan}")
+
+
+class TestFeedQueryPlans(QueryPlanTestCase):
+    def test_all_outliers_walks_score_index(self):
+        [plan] = self.query_plans(database.get_all_outliers, min_score=1.0, limit=10)
+        self.assertUsesIndex(plan, "idx_videos_outlier_score")
+        self.assertUsesIndex(plan, "SEARCH c USING INTEGER PRIMARY KEY")
+        self.assertNoSort(plan)
+
+    def test_platform_filter_keeps_score_order(self):
+        [plan] = self.query_plans(database.get_all_outliers, min_score=1.0, limit=10, platform='youtube')
+        self.assertUsesIndex(plan, "idx_videos_outlier_score")
+        self.assertNoSort(plan)
+
+    def test_cursor_seeks_into_score_index(self):
+        [plan] = self.query_plans(database.get_all_outliers, min_score=1.0, limit=10, cursor=(2.0, 3))
+        self.assertUsesIndex(plan, "idx_videos_outlier_score (outlier_score>? AND outlier_score<?)")
+        self.assertNoSort(plan)
+
+    def test_velocity_order_walks_velocity_index(self):
+        [plan] = self.query_plans(database.get_all_outliers, min_score=1.0, limit=10, order='velocity',
+                                  cursor=(12.5, 3))
+        self.assertUsesIndex(plan, "idx_videos_velocity")
+        self.assertNoSort(plan)
+
+    def test_feed_stats_aggregate_index_only(self):
+        plans = self.query_plans(database.get_feed_stats)
+        self.assertUsesIndex(plans[0], "COVERING INDEX idx_videos_creator_score")
+
+    def test_videos_for_creator_uses_creator_score_index(self):
+        [plan] = self.query_plans(database.get_videos_for_creator, self.creator_id, limit=5)
+        self.assertUsesIndex(plan, "idx_videos_creator_score (creator_id=?)")
+        self.assertNoSort(plan)
+
+    def test_top_videos_by_creator_ranks_from_index(self):
+        [plan] = self.query_plans(database.get_top_videos_by_creator, per_creator=5)
+        self.assertUsesIndex(plan, "idx_videos_creator_score")
+
+    def test_all_creators_aggregates_from_covering_index(self):
+        [plan] = self.query_plans(database.get_all_creators)
+        self.assertUsesIndex(plan, "COVERING INDEX idx_videos_creator_synced (creator_id=?)")
+
+    def test_video_by_id_is_a_point_lookup(self):
+        [plan] = self.query_plans(database.get_video_by_id, 1)
+        self.assertFalse(any(step.startswith("SCAN") for step in plan), plan)
+
+    def test_remixes_for_video_uses_index(self):
+        [plan] = self.query_plans(database.get_remixes_for_video, 1)
+        self.assertUsesIndex(plan, "idx_remixes_video (video_id=?)")
+        self.assertNoSort(plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import database
+import scheduler
+from scheduler import MAX_INTERVAL, MIN_INTERVAL, sync_interval
+from sync_engine import SyncEngine
+from test_database import DatabaseTestCase
+from test_sync_engine import FakeScraper
+
+NOW = 1_700_000_000
+DAY = 86400
+
+
+def signals(recent_uploads=0, latest_upload=None, top_velocity=0):
+    return {'recent_uploads': recent_uploads, 'latest_upload': latest_upload, 'top_velocity': top_velocity}
+
+
+class TestSyncInterval(unittest.TestCase):
+    def test_twice_per_upload_gap(self):
+        # Daily uploader: every 12 hours; weekly: every 3.5 days
+        self.assertEqual(sync_interval(signals(recent_uploads=30), NOW), DAY // 2)
+        self.assertEqual(sync_interval(signals(recent_uploads=4), NOW), int(3.75 * DAY))
+
+    def test_quiet_creators_back_off(self):
+        self.assertEqual(sync_interval(signals(latest_upload=NOW - 60 * DAY), NOW), MAX_INTERVAL)
+        self.assertEqual(sync_interval(signals(), NOW), scheduler.DEFAULT_INTERVAL)
+
+    def test_velocity_shortens_interval(self):
+        calm = sync_interval(signals(recent_uploads=4), NOW)
+        hot = sync_interval(signals(recent_uploads=4, top_velocity=10_000), NOW)
+        self.assertAlmostEqual(calm / hot, 2, delta=0.1)
+        self.assertEqual(sync_interval(signals(recent_uploads=1000, top_velocity=1e6), NOW), MIN_INTERVAL)
+
+
+class TestScheduler(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.daily = database.add_creator('youtube', 'daily', 'https://youtube.com/@daily')
+        self.quiet = database.add_creator('youtube', 'quiet', 'https://youtube.com/@quiet')
+        today = datetime.now(timezone.utc)
+        database.upsert_videos(self.daily, [
+            {'id': f"d{i}", 'view_count': 100, 'upload_date': (today - timedelta(days=i)).strftime('%Y%m%d')}
+            for i in range(30)
+        ])
+        database.upsert_videos(self.quiet, [
+            {'id': 'q0', 'view_count': 100, 'upload_date': (today - timedelta(days=400)).strftime('%Y-%m-%d')}
+        ])
+
+    def test_signals(self):
+        now = int(time.time())
+        found = database.get_sync_signals([self.daily, self.quiet], scheduler.UPLOAD_WINDOW, now)
+        self.assertEqual(found[self.daily]['recent_uploads'], 30)
+        self.assertEqual(found[self.quiet]['recent_uploads'], 0)
+        self.assertAlmostEqual(found[self.daily]['last_synced'], now, delta=5)
+        self.assertLess(found[self.quiet]['latest_upload'], now - 399 * DAY)
+
+    def test_reschedule_from_last_sync(self):
+        now = int(time.time())
+        schedule = scheduler.reschedule([self.daily, self.quiet])
+        # Twice a day, a little sooner for today's upload gathering views
+        self.assertLessEqual(schedule[self.daily] - now, DAY // 2)
+        self.assertGreater(schedule[self.daily] - now, DAY // 3)
+        self.assertAlmostEqual(schedule[self.quiet] - now, MAX_INTERVAL, delta=60)
+        self.assertEqual(scheduler.due_creators(), [])
+
+        # Never-synced creators stay due
+        new = database.add_creator('youtube', 'new', 'https://youtube.com/@new')
+        self.assertEqual(scheduler.reschedule([new]), {})
+        self.assertEqual([c['id'] for c in scheduler.due_creators()], [new])
+
+    def test_due_order_and_budget(self):
+        new = database.add_creator('youtube', 'new', 'https://youtube.com/@new')
+        now = int(time.time())
+        database.set_sync_schedule({
+            # Overdue by half its interval vs by a tenth of a much longer one
+            self.daily: (now - 3600, 7200),
+            self.quiet: (now - 3 * 3600, 30 * 3600),
+        })
+        due = [c['id'] for c in scheduler.due_creators(budget=10, now=now)]
+        self.assertEqual(due, [new, self.daily, self.quiet])
+        self.assertEqual(len(scheduler.due_creators(budget=2, now=now)), 2)
+        self.assertEqual(database.count_due_creators(now), 3)
+
+    def test_creator_without_interval_ranked_by_default_interval(self):
+        now = int(time.time())
+        database.set_sync_schedule({self.daily: (now - 3600, 7200)})
+        # Deferred before it ever had an interval: a full default interval overdue
+        scheduler.defer([self.quiet], retry_after=-scheduler.DEFAULT_INTERVAL, now=now)
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE creators SET sync_interval = NULL WHERE id = ?", (self.quiet,))
+        self.assertEqual([c['id'] for c in scheduler.due_creators(now=now)], [self.quiet, self.daily])
+
+    def test_run_due_syncs_within_budget_and_reschedules(self):
+        for i in range(3):
+            database.add_creator('youtube', f"new{i}", f"https://youtube.com/@new{i}")
+        scheduler.reschedule([self.daily, self.quiet])
+        youtube = FakeScraper(delay=0, fail_for={"https://youtube.com/@new0"})
+        engine = SyncEngine(youtube, None, limits={'youtube': {'workers': 2, 'rate': 1000, 'burst': 100}})
+
+        report = scheduler.run_due(engine, budget=2)
+        self.assertEqual((report['due'], report['deferred']), (3, 1))
+        self.assertEqual(youtube.calls, 2)
+        self.assertEqual(report['synced'] + len(report['failed']), 2)
+
+        # Synced and failed creators are both off the due list now
+        report = scheduler.run_due(engine, budget=2)
+        self.assertEqual((report['due'], report['deferred']), (1, 0))
+        self.assertIsNone(scheduler.run_due(engine, budget=2))
+
+        failed = database.get_creator_by_id(next(
+            c['id'] for c in database.get_all_creators() if c['username'] == 'new0'
+        ))
+        self.assertAlmostEqual(failed['next_sync_at'] - time.time(), MIN_INTERVAL, delta=60)
+
+    def test_migration_gives_synced_creators_a_daily_interval(self):
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE creators SET next_sync_at = NULL, sync_interval = NULL")
+            database._add_sync_schedule(conn)
+        creator = database.get_creator_by_id(self.daily)
+        self.assertEqual(creator['sync_interval'], DAY)
+        self.assertAlmostEqual(creator['next_sync_at'] - time.time(), DAY, delta=60)
+
+
+if __name__ == '__main__':
+    unittest.main()
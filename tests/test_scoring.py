@@ -0,0 +1,217 @@
+import statistics
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import database
+from scoring import METHODS, compute_scores, recent_in_group, score_videos
+from test_database import DatabaseTestCase
+
+VIRAL = [100, 120, 80, 110, 90, 100, 95, 105, 100, 100_000]
+
+
+class TestComputeScores(unittest.TestCase):
+    def test_mean_matches_original_score(self):
+        scores, baselines = compute_scores([100, 200, 300, None, 0])
+        self.assertEqual(scores.tolist(), [0.5, 1.0, 1.5, 0.0, 0.0])
+        self.assertEqual(baselines[0], 200)
+
+    def test_robust_baselines_ignore_one_viral_video(self):
+        mean, _ = compute_scores(VIRAL, method='mean')
+        self.assertLessEqual(mean[0], 0.01)
+        for method in ('median', 'trimmed_mean', 'percentile'):
+            scores, _ = compute_scores(VIRAL, method=method)
+            self.assertAlmostEqual(scores[0], 1.0, delta=0.1, msg=method)
+            self.assertGreater(scores[-1], 900, method)
+
+    def test_log_zscore(self):
+        scores, baselines = compute_scores(VIRAL, method='log_zscore')
+        self.assertGreater(scores[-1], 2.5)
+        self.assertTrue(all(abs(s) < 1 for s in scores[:-1]))
+        logs = np.log1p(VIRAL)
+        self.assertAlmostEqual(baselines[0], np.expm1(logs.mean()))
+
+    def test_groups_are_scored_separately(self):
+        scores, _ = compute_scores([10, 30, 1000, 3000], groups=[7, 7, 2, 2], method='median')
+        self.assertEqual(scores.tolist(), [0.5, 1.5, 0.5, 1.5])
+
+    def test_matches_per_group_reference(self):
+        rng = np.random.default_rng(7)
+        views = rng.lognormal(8, 2, 2000).round()
+        views[rng.random(2000) < 0.05] = 0
+        groups = rng.integers(0, 40, 2000)
+        for method, reference in (('mean', statistics.fmean), ('median', statistics.median)):
+            scores, _ = compute_scores(views, groups=groups, method=method)
+            for i in rng.integers(0, 2000, 50):
+                positive = [v for v, g in zip(views, groups) if g == groups[i] and v > 0]
+                expected = round(views[i] / reference(positive), 2) if views[i] > 0 else 0.0
+                self.assertAlmostEqual(scores[i], expected, places=6, msg=method)
+
+    def test_every_method_handles_degenerate_input(self):
+        for method in METHODS:
+            self.assertEqual(compute_scores([], method=method)[0].tolist(), [])
+            self.assertEqual(compute_scores([0, None], method=method)[0].tolist(), [0.0, 0.0])
+            self.assertEqual(compute_scores([5, 5], method=method)[0].tolist()[0],
+                             0.0 if method == 'log_zscore' else 1.0)
+
+    def test_recent_in_group(self):
+        views = [10, 0, 20, 30, 40, 50, 60]
+        groups = [1, 1, 1, 1, 2, 2, 2]
+        dates = [20240104, 20240105, 20240102, 20240101, 20240101, 20240101, 20240101]
+        mask = recent_in_group(views, groups, [dates, range(7)], window=2)
+        # Zero views don't take a place in the window; ties go to the higher id
+        self.assertEqual(mask.tolist(), [True, False, True, False, False, True, True])
+        self.assertEqual(recent_in_group(views, groups, [dates], window=0).tolist(),
+                         [True, False, True, True, True, True, True])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            compute_scores([1], method='mode')
+
+
+class TestScoreVideos(unittest.TestCase):
+    def test_sorted_with_benchmark(self):
+        videos = score_videos([{'view_count': 100}, {'view_count': 300}, {'view_count': None}])
+        self.assertEqual([v['outlier_score'] for v in videos], [1.5, 0.5, 0.0])
+        self.assertEqual(videos[0]['avg_views_benchmark'], 200)
+
+    def test_other_metric(self):
+        videos = score_videos([{'like_count': 10}, {'like_count': 30}], metric='like_count', method='median')
+        self.assertEqual(videos[0]['outlier_score'], 1.5)
+
+
+class TestRescore(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.bob = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        database.upsert_videos(self.alice, [{'id': f"a{i}", 'view_count': v} for i, v in enumerate(VIRAL)])
+        database.upsert_videos(self.bob, [{'id': f"b{i}", 'view_count': v} for i, v in enumerate((10, 30))])
+
+    def scores(self, creator_id):
+        return {v['platform_video_id']: v['outlier_score'] for v in database.get_videos_for_creator(creator_id)}
+
+    def test_whole_library(self):
+        self.assertEqual(database.rescore_creators(), 12)
+        self.assertEqual(self.scores(self.bob), {'b0': 0.5, 'b1': 1.5})
+        # Nothing changed: nothing written
+        self.assertEqual(database.rescore_creators(), 0)
+
+    def test_one_creator_with_robust_baseline(self):
+        database.rescore_creators([self.alice], method='median')
+        self.assertEqual(self.scores(self.alice)['a0'], 1.0)
+        self.assertEqual(self.scores(self.bob), {'b0': 0.0, 'b1': 0.0})
+        self.assertEqual(database.rescore_creators([]), 0)
+
+    def test_bulk_rescore_rebuilds_score_indexes(self):
+        with patch.object(database, 'BULK_RESCORE_ROWS', 1):
+            self.assertEqual(database.rescore_creators(), 12)
+        self.assertEqual(self.scores(self.bob), {'b0': 0.5, 'b1': 1.5})
+        with database.transaction() as conn:
+            names = {row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue(set(database.SCORE_INDEXES) <= names)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class TestHistoricalBaselines(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+
+    def write(self, views, creator_id=None, start=0):
+        videos = [{'id': f"v{start + i}", 'view_count': v, 'outlier_score': 99.0} for i, v in enumerate(views)]
+        return database.bulk_upsert_videos({creator_id or self.alice: videos}, rescore=True)
+
+    def scores(self, creator_id=None):
+        return {v['platform_video_id']: v['outlier_score']
+                for v in database.get_videos_for_creator(creator_id or self.alice)}
+
+    def stats(self, creator_id=None):
+        with database.transaction() as conn:
+            return dict(conn.execute(
+                "SELECT * FROM creator_baselines WHERE creator_id = ?", (creator_id or self.alice,)
+            ).fetchone())
+
+    def test_new_videos_scored_against_history(self):
+        self.write([100, 200, 300])
+        self.assertEqual(self.scores(), {'v0': 0.5, 'v1': 1.0, 'v2': 1.5})
+
+        # An incremental fetch with one new video: the batch alone would make it 1.0
+        self.write([400], start=3)
+        self.assertEqual(self.scores(), {'v0': 0.4, 'v1': 0.8, 'v2': 1.2, 'v3': 1.6})
+        stats = self.stats()
+        self.assertEqual((stats['video_count'], stats['view_sum'], stats['baseline']), (4, 1000, 250))
+
+    def test_view_updates_adjust_running_sums(self):
+        self.write([100, 200, 300, 0])
+        self.write([500], start=0)
+        stats = self.stats()
+        self.assertEqual((stats['video_count'], stats['view_sum']), (3, 1000))
+        self.write([0], start=1)
+        self.assertEqual(self.stats()['video_count'], 2)
+
+        running = self.stats()
+        database.rescore_creators([self.alice])
+        exact = self.stats()
+        for column in ('video_count', 'view_sum', 'log_sum', 'log_sq_sum'):
+            self.assertAlmostEqual(running[column], exact[column], places=6)
+
+    def test_baseline_rolls_over_recent_uploads(self):
+        videos = [{'id': f"v{i}", 'view_count': views, 'upload_date': f"2024010{i + 1}"}
+                  for i, views in enumerate([1000, 100, 200, 300])]
+        with patch.object(database, 'BASELINE_WINDOW', 3):
+            database.bulk_upsert_videos({self.alice: videos}, rescore=True)
+            # The oldest upload has left the window: baseline 200, not 400
+            stats = self.stats()
+            self.assertEqual((stats['video_count'], stats['baseline']), (3, 200))
+            self.assertEqual(self.scores(), {'v0': 5.0, 'v1': 0.5, 'v2': 1.0, 'v3': 1.5})
+
+            incremental = self.scores()
+            self.assertEqual(database.rescore_creators([self.alice], method='median'), 0)
+            self.assertEqual(database.rescore_creators([self.alice]), 0)
+            self.assertEqual(self.scores(), incremental)
+
+    def test_only_written_creators_are_rescored(self):
+        bob = database.add_creator('youtube', 'bob', 'https://youtube.com/@bob')
+        database.upsert_videos(bob, [{'id': 'b0', 'view_count': 10, 'outlier_score': 7.0}])
+        self.write([100, 200])
+        self.assertEqual(self.scores(bob), {'b0': 7.0})
+
+    def test_matches_full_recompute(self):
+        rng = np.random.default_rng(3)
+        views = rng.lognormal(8, 2, 60).round().tolist()
+        for method in ('mean', 'log_zscore', 'median'):
+            creator_id = database.add_creator('youtube', method, f"https://youtube.com/@{method}")
+            with patch.object(database, 'DEFAULT_METHOD', method):
+                for start in range(0, 60, 20):
+                    self.write(views[start:start + 20], creator_id, start=start)
+                incremental = self.scores(creator_id)
+                self.assertEqual(database.rescore_creators([creator_id], method=method), 0, method)
+                self.assertEqual(self.scores(creator_id), incremental)
+
+    def test_method_change_rescores_stored_videos(self):
+        self.write([100, 200, 300])
+        self.assertEqual(database.rescore_stale_creators(), 0)
+        with patch.object(database, 'DEFAULT_METHOD', 'log_zscore'):
+            self.assertEqual(database.rescore_stale_creators(), 3)
+            self.assertEqual(self.stats()['method'], 'log_zscore')
+            expected, _ = compute_scores([100, 200, 300], method='log_zscore')
+            self.assertEqual(list(self.scores().values()), sorted(expected.tolist(), reverse=True))
+            self.assertEqual(database.rescore_stale_creators(), 0)
+
+    def test_stale_creators_backfilled_after_migration(self):
+        database.upsert_videos(self.alice, [{'id': f"v{i}", 'view_count': v} for i, v in enumerate((10, 30))])
+        with database.transaction(write=True) as conn:
+            conn.execute("DROP TABLE creator_baselines")
+            database._create_creator_baselines(conn)
+        # The migration only creates the table
+        self.assertEqual(self.scores(), {'v0': 0, 'v1': 0})
+
+        self.assertEqual(database.rescore_stale_creators(), 2)
+        self.assertEqual(self.stats()['view_sum'], 40)
+        self.assertEqual(self.scores(), {'v0': 0.5, 'v1': 1.5})
+        self.assertEqual(database.rescore_stale_creators(), 0)
@@ -1,5 +1,9 @@
 import unittest
-from src.scraper import YouTubeScraper
+from unittest.mock import patch
+
+import requests
+
+from scraper import YouTubeScraper, InstagramScraper
 
 class TestScraper(unittest.TestCase):
     def setUp(self):
@@ -35,5 +39,109 @@ class TestScraper(unittest.TestCase):
         self.assertIsInstance(transcript, str)
         self.assertNotEqual(transcript, "Error fetching transcript")
 
+class TestInstagramBatch(unittest.TestCase):
+    def setUp(self):
+        self.scraper = InstagramScraper(api_token="test")
+
+    @staticmethod
+    def item(owner, code):
+        return {'shortCode': code, 'ownerUsername': owner, 'videoPlayCount': 100}
+
+    def test_splits_one_run_by_owner(self):
+        items = [self.item('Alice', 'a1'), self.item('bob', 'b1'), self.item('alice', 'a2')]
+        with patch.object(InstagramScraper, '_run_actor', return_value=items) as run:
+            reels = self.scraper.get_reels_batch(['alice', 'bob'], limit=5)
+
+        run.assert_called_once_with(['alice', 'bob'], 5)
+        self.assertEqual([r['id'] for r in reels['alice']], ['a1', 'a2'])
+        self.assertEqual([r['id'] for r in reels['bob']], ['b1'])
+
+    def test_runs_are_size_capped(self):
+        usernames = [f"user{i}" for i in range(5)]
+        with patch.object(InstagramScraper, 'MAX_PROFILES_PER_RUN', 2), \
+                patch.object(InstagramScraper, '_run_actor',
+                             side_effect=lambda chunk, limit: [self.item(u, u) for u in chunk]) as run:
+            reels = self.scraper.get_reels_batch(usernames)
+
+        self.assertEqual([len(call.args[0]) for call in run.call_args_list], [2, 2, 1])
+        self.assertTrue(all(len(reels[u]) == 1 for u in usernames))
+
+    def test_missing_profiles_are_retried(self):
+        responses = [
+            [self.item('alice', 'a1')],  # bob missing from the first run
+            requests.exceptions.ConnectionError("reset"),
+            [self.item('bob', 'b1')],
+        ]
+        with patch.object(InstagramScraper, '_run_actor', side_effect=responses) as run:
+            reels = self.scraper.get_reels_batch(['alice', 'bob'], max_retries=2)
+
+        self.assertEqual([call.args[0] for call in run.call_args_list], [['alice', 'bob'], ['bob'], ['bob']])
+        self.assertEqual([r['id'] for r in reels['bob']], ['b1'])
+
+    def test_gives_up_after_max_retries(self):
+        with patch.object(InstagramScraper, '_run_actor', return_value=[]) as run:
+            reels = self.scraper.get_reels_batch(['ghost'], max_retries=1)
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(reels, {'ghost': []})
+
+
+class FakeYoutubeDL:
+    """Serves a channel feed lazily and records how far it was read."""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.read = 0
+
+    def __call__(self, opts):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False, process=True):
+        def entries():
+            for entry in self.feed:
+                self.read += 1
+                yield entry
+        return {'_type': 'playlist', 'entries': entries()}
+
+
+class TestYouTubeIncremental(unittest.TestCase):
+    def setUp(self):
+        self.scraper = YouTubeScraper()
+        # Newest first: two uploads since the last sync, then 100 known videos
+        self.feed = [{'id': f"new{i}", 'title': f"New {i}", 'view_count': 10} for i in range(2)]
+        self.feed += [{'id': f"old{i}", 'title': f"Old {i}", 'view_count': 1000 + i} for i in range(100)]
+        self.known = [f"old{i}" for i in range(100)]
+        self.ydl = FakeYoutubeDL(self.feed)
+
+    def fetch(self, **kwargs):
+        with patch('yt_dlp.YoutubeDL', self.ydl):
+            return self.scraper.get_channel_videos("https://youtube.com/@alice", **kwargs)
+
+    def test_stops_at_known_videos(self):
+        videos = self.fetch(limit=30, known_ids=self.known)
+        self.assertEqual([v['id'] for v in videos], ['new0', 'new1'])
+        self.assertEqual(self.ydl.read, 3)
+
+    def test_refresh_window_rereads_recent_known_videos(self):
+        videos = self.fetch(limit=30, known_ids=self.known, refresh_window=5)
+        self.assertEqual([v['id'] for v in videos], ['new0', 'new1', 'old0', 'old1', 'old2', 'old3', 'old4'])
+        self.assertEqual(videos[2]['view_count'], 1000)
+        self.assertEqual(self.ydl.read, 8)
+
+    def test_new_videos_capped_at_limit(self):
+        videos = self.fetch(limit=1, known_ids=self.known)
+        self.assertEqual([v['id'] for v in videos], ['new0'])
+
+    def test_nothing_new(self):
+        videos = self.fetch(limit=30, known_ids=['new0', 'new1'] + self.known)
+        self.assertEqual(videos, [])
+        self.assertEqual(self.ydl.read, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
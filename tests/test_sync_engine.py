@@ -0,0 +1,149 @@
+import threading
+import time
+import unittest
+
+import database
+from sync_engine import BatchWriter, SyncEngine, TokenBucket
+from test_database import DatabaseTestCase
+
+
+class FakeScraper:
+    """Stands in for YouTubeScraper / InstagramScraper and records concurrency."""
+
+    MAX_PROFILES_PER_RUN = 2
+
+    def __init__(self, delay: float = 0.02, fail_for=()):
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.incremental_calls = 0
+        self._lock = threading.Lock()
+
+    def _fetch(self, key):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if key in self.fail_for:
+                raise RuntimeError(f"failed {key}")
+            return [{'id': f"{key}-{i}", 'view_count': (i + 1) * 100} for i in range(3)]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_channel_videos(self, url, limit=50, known_ids=None, refresh_window=0):
+        videos = self._fetch(url)
+        if known_ids is not None:
+            self.incremental_calls += 1
+            videos = [v for v in videos if v['id'] not in known_ids]
+        return videos
+
+    @staticmethod
+    def cached_channel_id(url):
+        return None
+
+    def get_reels(self, username, limit=10):
+        return self._fetch(username)
+
+    def get_reels_batch(self, usernames, limit=10):
+        videos = self._fetch(tuple(usernames))
+        return {u: [dict(v, id=f"{u}-{v['id']}") for v in videos] for u in usernames}
+
+    def calculate_outliers(self, videos):
+        for v in videos:
+            v['outlier_score'] = v['view_count'] / 200
+        return videos
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_rate_limited(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        # Two banked tokens are free; the next two take ~1/50 s each
+        self.assertGreaterEqual(time.monotonic() - start, 0.035)
+
+
+class TestSyncEngine(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            database.add_creator('youtube', f"yt{i}", f"https://youtube.com/@yt{i}")
+        for i in range(4):
+            database.add_creator('instagram', f"ig{i}", f"https://instagram.com/ig{i}")
+        self.creators = database.get_all_creators()
+        self.youtube = FakeScraper()
+        self.instagram = FakeScraper()
+        self.limits = {
+            'youtube': {'workers': 3, 'rate': 1000, 'burst': 100},
+            'instagram': {'workers': 1, 'rate': 1000, 'burst': 100},
+        }
+
+    def test_syncs_every_creator_with_per_platform_limits(self):
+        engine = SyncEngine(self.youtube, self.instagram, limits=self.limits, batch_size=4)
+        progress = []
+        report = engine.run(self.creators, progress=lambda done, total, c, e: progress.append(done))
+
+        self.assertEqual(report['synced'], 10)
+        self.assertEqual(report['failed'], [])
+        self.assertEqual(report['counts']['inserted'], 30)
+        self.assertEqual(progress, list(range(1, 11)))
+        self.assertEqual(self.youtube.max_active, 3)
+        self.assertEqual(self.instagram.max_active, 1)
+        # Four Instagram creators, two profiles per actor run
+        self.assertEqual(self.instagram.calls, 2)
+        self.assertTrue(all(c['video_count'] == 3 for c in database.get_all_creators()))
+
+    def test_failures_and_missing_scrapers_are_reported(self):
+        youtube = FakeScraper(fail_for={"https://youtube.com/@yt0"})
+        engine = SyncEngine(youtube, None, limits=self.limits)
+        report = engine.run(self.creators)
+
+        failed = {c['username'] for c, _ in report['failed']}
+        self.assertEqual(failed, {'yt0', 'ig0', 'ig1', 'ig2', 'ig3'})
+        self.assertEqual(report['synced'], 5)
+
+    def test_youtube_resync_is_incremental(self):
+        youtube = [c for c in self.creators if c['platform'] == 'youtube']
+        engine = SyncEngine(self.youtube, self.instagram, limits=self.limits)
+        engine.run(youtube)
+        self.assertEqual(self.youtube.incremental_calls, 0)
+
+        report = engine.run(youtube)
+        self.assertEqual(self.youtube.incremental_calls, 6)
+        self.assertEqual(len(report['up_to_date']), 6)
+        self.assertEqual(report['synced'], 6)
+        self.assertEqual(report['empty'], [])
+        # Scored against everything stored: views 100/200/300 over a mean of 200
+        scores = sorted(v['outlier_score'] for v in database.get_videos_for_creator(youtube[0]['id']))
+        self.assertEqual(scores, [0.5, 1.0, 1.5])
+
+
+class TestBatchWriter(DatabaseTestCase):
+    def test_flushes_in_batches(self):
+        creator_ids = [
+            database.add_creator('youtube', f"c{i}", f"https://youtube.com/@c{i}") for i in range(5)
+        ]
+        writer = BatchWriter(batch_size=2, flush_interval=60)
+        for creator_id in creator_ids:
+            writer.put(creator_id, [{'id': f"{creator_id}-v", 'outlier_score': 1.0}])
+        counts = writer.close()
+        self.assertEqual(counts['inserted'], 5)
+        self.assertEqual(writer.errors, [])
+
+    def test_flushes_after_interval(self):
+        creator_id = database.add_creator('youtube', 'c', 'https://youtube.com/@c')
+        writer = BatchWriter(batch_size=100, flush_interval=0.05)
+        writer.put(creator_id, [{'id': 'v', 'outlier_score': 1.0}])
+        time.sleep(0.3)
+        self.assertEqual(len(database.get_videos_for_creator(creator_id)), 1)
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
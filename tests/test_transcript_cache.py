@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import patch
+
+import database
+from scraper import AssemblyAITranscriber, YouTubeScraper
+from transcript_cache import TranscriptCache, normalize_key
+from test_database import DatabaseTestCase
+
+
+class TestNormalizeKey(unittest.TestCase):
+    def test_youtube_urls_share_a_key(self):
+        for url in ("https://www.youtube.com/watch?v=abc123&t=42s",
+                    "https://youtu.be/abc123",
+                    "https://youtube.com/shorts/abc123",
+                    "https://m.youtube.com/watch?feature=share&v=abc123"):
+            self.assertEqual(normalize_key(url), "youtube:abc123", url)
+
+    def test_instagram_reel(self):
+        self.assertEqual(normalize_key("https://www.instagram.com/reel/C1x2y3/?igsh=abc"), "instagram:C1x2y3")
+        self.assertEqual(normalize_key("https://instagram.com/p/C1x2y3/"), "instagram:C1x2y3")
+
+    def test_media_urls(self):
+        # Signed CDN links differ only in their expiring query string
+        first = normalize_key("https://scontent.cdninstagram.com/v/t50/reel.mp4?oe=1&oh=aa")
+        second = normalize_key("https://scontent.cdninstagram.com/v/t50/reel.mp4?oe=2&oh=bb")
+        self.assertEqual(first, second)
+        self.assertEqual(
+            normalize_key("https://Files.example.com/a.mp4?b=2&a=1&utm_source=x"),
+            "media:files.example.com/a.mp4?a=1&b=2"
+        )
+
+    def test_not_a_url(self):
+        self.assertIsNone(normalize_key(""))
+        self.assertIsNone(normalize_key(None))
+        self.assertIsNone(normalize_key("abc123"))
+
+
+class TestTranscriptCache(DatabaseTestCase):
+    def test_hit_through_any_alias(self):
+        cache = TranscriptCache()
+        cache.put("hello world", "https://www.instagram.com/reel/R1/", "https://cdn.example.com/r1.mp4")
+
+        self.assertEqual(cache.get("https://instagram.com/reel/R1"), "hello world")
+        self.assertEqual(cache.get("https://cdn.example.com/r1.mp4"), "hello world")
+        self.assertIsNone(cache.get("https://cdn.example.com/other.mp4"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_hit_links_new_keys(self):
+        cache = TranscriptCache()
+        cache.put("hello world", "https://youtu.be/abc")
+        self.assertEqual(cache.get("https://cdn.example.com/abc.mp4", "https://youtu.be/abc"), "hello world")
+        self.assertEqual(cache.get("https://cdn.example.com/abc.mp4"), "hello world")
+
+    def test_identical_transcripts_stored_once(self):
+        cache = TranscriptCache()
+        cache.put("same words", "https://youtu.be/one")
+        cache.put("same words", "https://youtu.be/two")
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['keys']), (1, 2))
+
+    def test_errors_are_not_cached(self):
+        cache = TranscriptCache()
+        self.assertFalse(cache.put("Error fetching transcript: timeout", "https://youtu.be/abc"))
+        self.assertFalse(cache.put("Transcripts are disabled for this video.", "https://youtu.be/abc"))
+        self.assertIsNone(cache.get("https://youtu.be/abc"))
+
+    def test_miss_does_not_write(self):
+        cache = TranscriptCache()
+        cache.put("hello world", "https://youtu.be/abc")
+        generation = database.query_cache.generation
+        self.assertIsNone(cache.get("https://youtu.be/other"))
+        self.assertEqual(database.query_cache.generation, generation)
+
+        self.assertEqual(cache.get("https://youtu.be/abc"), "hello world")
+        self.assertGreater(database.query_cache.generation, generation)
+
+    def test_expired_entries_miss(self):
+        cache = TranscriptCache(ttl_seconds=3600)
+        cache.put("old words", "https://youtu.be/abc")
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE transcript_blobs SET created_at = datetime('now', '-2 hours')")
+        self.assertIsNone(cache.get("https://youtu.be/abc"))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_purge_expired(self):
+        cache = TranscriptCache(ttl_seconds=3600)
+        cache.put("old words", "https://youtu.be/old")
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE transcript_blobs SET created_at = datetime('now', '-2 hours')")
+        cache.put("new words", "https://youtu.be/new")
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(cache.get("https://youtu.be/new"), "new words")
+
+    def test_lru_eviction_by_entries(self):
+        cache = TranscriptCache(max_entries=2)
+        cache.put("first", "https://youtu.be/1")
+        cache.put("second", "https://youtu.be/2")
+        cache.put("third", "https://youtu.be/3")
+        self.assertIsNone(cache.get("https://youtu.be/1"))
+        self.assertEqual(cache.get("https://youtu.be/3"), "third")
+        self.assertEqual(cache.evictions, 1)
+
+    def test_eviction_by_bytes(self):
+        cache = TranscriptCache(max_bytes=25)
+        cache.put("a" * 10, "https://youtu.be/1")
+        cache.put("b" * 10, "https://youtu.be/2")
+        cache.put("c" * 10, "https://youtu.be/3")
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes']), (2, 20))
+        self.assertIsNone(cache.get("https://youtu.be/1"))
+
+
+class FakeSnippet:
+    def __init__(self, text):
+        self.text = text
+
+
+class TestScrapersUseCache(DatabaseTestCase):
+    def test_youtube_transcript_fetched_once(self):
+        scraper = YouTubeScraper(transcript_cache=TranscriptCache())
+        with patch('scraper.YouTubeTranscriptApi') as api:
+            api.return_value.fetch.return_value = [FakeSnippet("hello"), FakeSnippet("there")]
+            first = scraper.get_transcript("https://www.youtube.com/watch?v=abc")
+            second = scraper.get_transcript("https://youtu.be/abc")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, "hello there")
+        self.assertEqual(api.return_value.fetch.call_count, 1)
+
+    def test_assemblyai_skips_cached_urls(self):
+        cache = TranscriptCache()
+        cache.put("already paid for", "https://cdn.example.com/a.mp4")
+        transcriber = AssemblyAITranscriber(api_key="test", transcript_cache=cache)
+        completed = []
+
+        with patch.object(transcriber, 'submit', return_value="t-b") as submit, \
+                patch.object(transcriber, 'get_status', return_value={'status': 'completed', 'text': "new"}):
+            results = transcriber.transcribe_batch(
+                {1: "https://cdn.example.com/a.mp4", 2: "https://cdn.example.com/b.mp4"},
+                on_complete=lambda key, text: completed.append(key), initial_delay=0
+            )
+
+        submit.assert_called_once_with("https://cdn.example.com/b.mp4")
+        self.assertEqual(results, {1: "already paid for", 2: "new"})
+        self.assertEqual(sorted(completed), [1, 2])
+        self.assertEqual(cache.get("https://cdn.example.com/b.mp4"), "new")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from scraper import AssemblyAITranscriber
+
+FAST_POLL = {'initial_delay': 0.01, 'max_delay': 0.04}
+
+
+class FakeAssemblyAI:
+    """Jobs complete `durations[url]` seconds after submission."""
+
+    def __init__(self, durations: dict, errors=(), unreachable=()):
+        self.durations = durations
+        self.errors = set(errors)
+        self.unreachable = set(unreachable)
+        self.jobs = {}
+        self.polls = 0
+
+    def submit(self, url):
+        if url in self.unreachable:
+            raise requests.exceptions.ConnectionError("refused")
+        transcript_id = f"t-{url}"
+        self.jobs[transcript_id] = (url, time.monotonic())
+        return transcript_id
+
+    def get_status(self, transcript_id):
+        self.polls += 1
+        url, started = self.jobs[transcript_id]
+        if time.monotonic() - started < self.durations[url]:
+            return {'status': 'processing'}
+        if url in self.errors:
+            return {'status': 'error', 'error': 'bad audio'}
+        return {'status': 'completed', 'text': f"text of {url}"}
+
+
+class TestTranscribeBatch(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = AssemblyAITranscriber(api_key="test")
+
+    def run_batch(self, fake, jobs, **kwargs):
+        with patch.object(self.transcriber, 'submit', side_effect=fake.submit), \
+                patch.object(self.transcriber, 'get_status', side_effect=fake.get_status):
+            return self.transcriber.transcribe_batch(jobs, **FAST_POLL, **kwargs)
+
+    def test_batch_takes_about_as_long_as_slowest_job(self):
+        durations = {f"url{i}": 0.1 + i * 0.01 for i in range(10)}
+        fake = FakeAssemblyAI(durations)
+        completed = []
+
+        start = time.monotonic()
+        results = self.run_batch(
+            fake, {i: f"url{i}" for i in range(10)},
+            on_complete=lambda key, text: completed.append(key)
+        )
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {i: f"text of url{i}" for i in range(10)})
+        self.assertEqual(sorted(completed), list(range(10)))
+        self.assertLess(elapsed, sum(durations.values()) / 2)
+
+    def test_errors_are_reported_per_job(self):
+        fake = FakeAssemblyAI({'ok': 0, 'bad': 0, 'down': 0}, errors={'bad'}, unreachable={'down'})
+        results = self.run_batch(fake, {1: 'ok', 2: 'bad', 3: 'down', 4: None})
+        self.assertEqual(results[1], "text of ok")
+        self.assertEqual(results[2], "Transcription error: bad audio")
+        self.assertTrue(results[3].startswith("Error transcribing"))
+        self.assertEqual(results[4], "Error: No video URL provided")
+
+    def test_deadline_stops_polling(self):
+        fake = FakeAssemblyAI({'fast': 0, 'stuck': 60})
+        start = time.monotonic()
+        results = self.run_batch(fake, {'a': 'fast', 'b': 'stuck'}, timeout=0.2)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(results['a'], "text of fast")
+        self.assertIn("timed out", results['b'])
+
+    def test_polls_back_off(self):
+        fake = FakeAssemblyAI({'slow': 0.3})
+        self.run_batch(fake, {1: 'slow'})
+        # Fixed 10 ms polling would take ~30 polls
+        self.assertLess(fake.polls, 15)
+
+    def test_transcribe_url_uses_batch_poller(self):
+        fake = FakeAssemblyAI({'one': 0})
+        with patch.object(self.transcriber, 'submit', side_effect=fake.submit), \
+                patch.object(self.transcriber, 'get_status', side_effect=fake.get_status):
+            self.assertEqual(self.transcriber.transcribe_url('one'), "text of one")
+        self.assertEqual(self.transcriber.transcribe_url(''), "Error: No video URL provided")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+
+import database
+import transcription_pipeline
+from transcription_pipeline import TranscriptionPipeline, is_transcript_error
+from test_database import DatabaseTestCase
+
+
+class FakeYouTube:
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.calls = []
+
+    def get_transcript(self, url):
+        self.calls.append(url)
+        return self.responses.get(url, f"captions for {url}")
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.batches = []
+
+    def transcribe_batch(self, jobs, on_complete=None, **kwargs):
+        self.batches.append(dict(jobs))
+        results = {key: f"speech from {url}" for key, url in jobs.items()}
+        for key, text in results.items():
+            on_complete(key, text)
+        return results
+
+
+class TestTranscriptionPipeline(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.yt = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+        self.ig = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        database.upsert_videos(self.yt, [
+            {'id': f"y{s}", 'url': f"https://youtube.com/watch?v=y{s}", 'outlier_score': s}
+            for s in (1.0, 3.0, 4.0, 6.0)
+        ])
+        database.upsert_videos(self.ig, [
+            {'id': f"i{s}", 'video_url': f"https://cdn/i{s}.mp4", 'duration': 120, 'outlier_score': s}
+            for s in (2.0, 3.5, 5.0)
+        ])
+
+    def transcript(self, platform_video_id):
+        with database.transaction() as conn:
+            return conn.execute(
+                "SELECT transcript FROM videos WHERE platform_video_id = ?", (platform_video_id,)
+            ).fetchone()[0]
+
+    def test_transcribes_outliers_above_threshold(self):
+        yt, transcriber = FakeYouTube(), FakeTranscriber()
+        report = TranscriptionPipeline(yt, transcriber, min_score=3.0, budget_usd=1.0).run()
+
+        self.assertEqual(report['queued'], 5)
+        self.assertEqual(report['done'], 5)
+        self.assertAlmostEqual(report['cost_usd'], 0.06)
+        self.assertEqual(self.transcript('y6.0'), "captions for https://youtube.com/watch?v=y6.0")
+        self.assertEqual(self.transcript('i5.0'), "speech from https://cdn/i5.0.mp4")
+        self.assertIsNone(self.transcript('y1.0'))
+        self.assertIsNone(self.transcript('i2.0'))
+        self.assertEqual(database.get_transcription_job_stats()['done'], 5)
+
+    def test_highest_scores_first(self):
+        yt = FakeYouTube()
+        TranscriptionPipeline(yt, min_score=3.0, batch_size=1).run()
+        self.assertEqual([url[-4:] for url in yt.calls], ["y6.0", "y4.0", "y3.0"])
+
+    def test_budget_defers_instagram(self):
+        transcriber = FakeTranscriber()
+        # Each 2 minute reel is ~$0.03: only the top one fits
+        report = TranscriptionPipeline(FakeYouTube(), transcriber, min_score=3.0, budget_usd=0.04).run()
+
+        self.assertEqual([list(b.values()) for b in transcriber.batches], [["https://cdn/i5.0.mp4"]])
+        self.assertEqual(report['deferred'], 1)
+        stats = database.get_transcription_job_stats()
+        self.assertEqual((stats['done'], stats['queued']), (4, 1))
+
+        # Next run has a fresh budget and picks up the deferred reel
+        report = TranscriptionPipeline(FakeYouTube(), transcriber, min_score=3.0, budget_usd=0.04).run()
+        self.assertEqual(report['done'], 1)
+        self.assertEqual(self.transcript('i3.5'), "speech from https://cdn/i3.5.mp4")
+
+    def test_reel_without_media_url_uses_post_url(self):
+        database.upsert_videos(self.ig, [
+            {'id': 'i9.0', 'url': "https://instagram.com/reel/i9/", 'duration': 120, 'outlier_score': 9.0}
+        ])
+        transcriber = FakeTranscriber()
+        TranscriptionPipeline(FakeYouTube(), transcriber, min_score=9.0).run()
+        self.assertEqual([list(b.values()) for b in transcriber.batches], [["https://instagram.com/reel/i9/"]])
+        self.assertEqual(self.transcript('i9.0'), "speech from https://instagram.com/reel/i9/")
+
+    def test_instagram_waits_without_transcriber(self):
+        report = TranscriptionPipeline(FakeYouTube(), None, min_score=3.0).run()
+        self.assertEqual(report['done'], 3)
+        self.assertEqual(database.get_transcription_job_stats()['queued'], 2)
+
+    def test_errors_retry_then_fail(self):
+        yt = FakeYouTube({
+            "https://youtube.com/watch?v=y6.0": "Error fetching transcript: timeout",
+            "https://youtube.com/watch?v=y4.0": "Transcripts are disabled for this video.",
+        })
+        report = TranscriptionPipeline(yt, min_score=4.0, max_attempts=3).run()
+
+        self.assertEqual(yt.calls.count("https://youtube.com/watch?v=y6.0"), 3)
+        self.assertEqual(yt.calls.count("https://youtube.com/watch?v=y4.0"), 1)
+        self.assertEqual(report['failed'], 2)
+        self.assertIsNone(self.transcript('y6.0'))
+        self.assertEqual(database.get_transcription_job_stats()['failed'], 2)
+
+    def test_manual_transcript_completes_job(self):
+        database.enqueue_transcription_jobs(min_score=6.0)
+        video = database.get_videos_needing_transcripts(min_score=6.0)[0]
+        database.save_transcript(video['id'], "typed in Remix Studio")
+        yt = FakeYouTube()
+        TranscriptionPipeline(yt, min_score=6.0).run()
+        self.assertEqual(yt.calls, [])
+
+    def test_stale_running_jobs_are_reclaimed(self):
+        database.enqueue_transcription_jobs(min_score=6.0)
+        self.assertEqual(len(database.claim_transcription_jobs()), 1)
+        self.assertEqual(database.claim_transcription_jobs(), [])
+        # Simulates a restart mid-run
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE transcription_jobs SET updated_at = datetime('now', '-1 hour')")
+        self.assertEqual(len(database.claim_transcription_jobs(stale_after=1800)), 1)
+
+    def test_background_run(self):
+        with transcription_pipeline.background._lock:
+            # Already running: nothing is started
+            self.assertFalse(transcription_pipeline.start_background(TranscriptionPipeline(FakeYouTube())))
+        self.assertTrue(transcription_pipeline.start_background(TranscriptionPipeline(FakeYouTube(), min_score=6.0)))
+        self.assertTrue(transcription_pipeline.background.wait(10))
+        self.assertEqual(transcription_pipeline.background.last_report['done'], 1)
+
+
+class TestTranscriptErrors(unittest.TestCase):
+    def test_error_messages(self):
+        for text in ("", None, "Error fetching transcript: x", "Transcription error: bad audio",
+                     "No transcript found for this video.", "Error: No video URL provided"):
+            self.assertTrue(is_transcript_error(text), text)
+        self.assertFalse(is_transcript_error("Errors are how we learn. Today..."))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import database
+from test_database import DatabaseTestCase
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class TestVideoMetrics(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+
+    def write(self, *videos):
+        database.upsert_videos(self.creator_id, list(videos))
+
+    def video(self, platform_video_id='v1'):
+        return next(v for v in database.get_videos_for_creator(self.creator_id)
+                    if v['platform_video_id'] == platform_video_id)
+
+    def history(self, platform_video_id='v1'):
+        return [(m['views'], m['likes']) for m in database.get_video_metrics(self.video(platform_video_id)['id'])]
+
+    def age_snapshots(self, seconds):
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE video_metrics SET ts = ts - ?", (seconds,))
+
+    def test_snapshots_only_on_change(self):
+        self.write({'id': 'v1', 'view_count': 100, 'like_count': 5})
+        self.age_snapshots(HOUR)
+        self.write({'id': 'v1', 'view_count': 100, 'like_count': 5})
+        self.assertEqual(self.history(), [(100, 5)])
+
+        # Flat listing: no likes, same views -> nothing new
+        self.write({'id': 'v1', 'view_count': 100})
+        self.assertEqual(self.history(), [(100, 5)])
+
+        self.write({'id': 'v1', 'view_count': 150})
+        self.assertEqual(self.history(), [(100, 5), (150, 5)])
+
+    def test_engagement_updates_are_snapshotted(self):
+        self.write({'id': 'v1', 'view_count': 100})
+        self.age_snapshots(HOUR)
+        video = self.video()
+        database.save_video_engagement({video['id']: {'platform_video_id': 'v1', 'like_count': 9}})
+        self.assertEqual(self.history(), [(100, None), (100, 9)])
+
+    def test_velocity_from_recent_growth(self):
+        self.write({'id': 'v1', 'view_count': 1000})
+        self.assertEqual(self.video()['views_per_hour'], 0)
+        self.age_snapshots(2 * HOUR)
+        self.write({'id': 'v1', 'view_count': 3000})
+        self.assertAlmostEqual(self.video()['views_per_hour'], 1000, delta=1)
+
+        # Snapshots older than the window don't count
+        self.age_snapshots(database.VELOCITY_WINDOW + HOUR)
+        self.write({'id': 'v1', 'view_count': 3100})
+        self.assertEqual(self.video()['views_per_hour'], 0)
+
+    def test_velocity_since_upload(self):
+        ten_days_ago = datetime.now(timezone.utc) - timedelta(days=10)
+        self.write({'id': 'v1', 'view_count': 24_000, 'upload_date': ten_days_ago.strftime('%Y%m%d')},
+                   {'id': 'v2', 'view_count': 24_000, 'upload_date': ten_days_ago.strftime('%Y-%m-%d')})
+        for video_id in ('v1', 'v2'):
+            self.assertAlmostEqual(self.video(video_id)['views_per_hour'], 100, delta=10)
+
+    def test_velocity_backfilled_after_migration(self):
+        ten_days_ago = datetime.now(timezone.utc) - timedelta(days=10)
+        self.write({'id': 'v1', 'view_count': 24_000, 'upload_date': ten_days_ago.strftime('%Y%m%d')},
+                   {'id': 'v2', 'view_count': 5})
+        with database.transaction(write=True) as conn:
+            conn.execute("DROP TABLE video_metrics")
+            conn.execute("UPDATE videos SET views_per_hour = 0")
+            database._create_video_metrics(conn)
+            database._add_velocity_backfill_flag(conn)
+        self.assertEqual(self.video()['views_per_hour'], 0)
+        self.assertEqual(len(self.history()), 1)
+
+        # Only videos with views and an upload date can have a velocity
+        self.assertEqual(database.backfill_velocity(), 1)
+        self.assertAlmostEqual(self.video()['views_per_hour'], 100, delta=10)
+        self.assertEqual(database.backfill_velocity(), 0)
+
+    def test_zero_velocity_backfilled_once(self):
+        years_ago = datetime.now(timezone.utc) - timedelta(days=3000)
+        self.write({'id': 'v1', 'view_count': 5, 'upload_date': years_ago.strftime('%Y%m%d')})
+        with database.transaction(write=True) as conn:
+            database._add_velocity_backfill_flag(conn)
+
+        self.assertEqual(database.backfill_velocity(), 1)
+        self.assertEqual(self.video()['views_per_hour'], 0)
+        generation = database.query_cache.generation
+        self.assertEqual(database.backfill_velocity(), 0)
+        self.assertEqual(database.query_cache.generation, generation)
+
+    def test_feed_ranked_by_velocity(self):
+        today = datetime.now(timezone.utc)
+        self.write(*[
+            {'id': f"v{i}", 'view_count': views, 'outlier_score': 3.0,
+             'upload_date': (today - timedelta(days=age)).strftime('%Y-%m-%d')}
+            for i, (views, age) in enumerate([(1_000_000, 1000), (50_000, 2), (10_000, 1)])
+        ])
+        rows, cursor = database.get_outlier_page(min_score=1.0, page_size=2, order='velocity')
+        self.assertEqual([r['platform_video_id'] for r in rows], ['v1', 'v2'])
+        rest, _ = database.get_outlier_page(min_score=1.0, page_size=2, order='velocity', cursor=cursor)
+        self.assertEqual([r['platform_video_id'] for r in rest], ['v0'])
+        with self.assertRaises(ValueError):
+            database.get_all_outliers(order='likes')
+
+    def test_compaction(self):
+        self.write({'id': 'v1', 'view_count': 1})
+        video_id = self.video()['id']
+        now = int(time.time())
+        hour = (now - 50 * HOUR) // HOUR * HOUR
+        day = (now - 40 * DAY) // DAY * DAY
+        stamps = ([hour + m * 600 for m in range(6)]      # six in one hour, 2+ days old
+                  + [day + h * HOUR for h in range(5)]    # five in one day, 40 days old
+                  + [now - 400 * DAY, now - 401 * DAY])   # past retention
+        with database.transaction(write=True) as conn:
+            conn.executemany("INSERT INTO video_metrics (video_id, ts, views) VALUES (?, ?, ?)",
+                             [(video_id, ts, i) for i, ts in enumerate(stamps)])
+
+        # 6 -> 1, 5 -> 1, both past retention dropped; the current snapshot stays
+        self.assertEqual(database.compact_video_metrics(), 11)
+        self.assertEqual(len(database.get_video_metrics(video_id)), 3)
+
+    def test_retention_keeps_latest_snapshot(self):
+        self.write({'id': 'v1', 'view_count': 1})
+        self.age_snapshots(DAY * 400)
+        database.compact_video_metrics()
+        self.assertEqual(self.history(), [(1, None)])
+
+    def test_remove_creator_drops_history(self):
+        self.write({'id': 'v1', 'view_count': 1})
+        database.remove_creator(self.creator_id)
+        with database.transaction() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM video_metrics").fetchone()[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import threading
+import time
+import unittest
+
+import database
+from test_database import DatabaseTestCase
+from test_sync_engine import FakeScraper
+from worker import Worker
+
+
+class FakeTranscripts(FakeScraper):
+    def __init__(self, transcripts):
+        super().__init__(delay=0)
+        self.transcripts = transcripts
+
+    def get_transcript(self, url):
+        return self.transcripts[url]
+
+
+class FakeRemixer:
+    def remix_content(self, transcript):
+        return f"remixed: {transcript}"
+
+
+class TestJobQueue(DatabaseTestCase):
+    def age(self, seconds):
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE jobs SET run_after = run_after - ?, lease_until = lease_until - ?",
+                         (seconds, seconds))
+
+    def test_enqueue_dedupes_active_jobs(self):
+        first = database.enqueue_job('sync_creators', {'creator_ids': [1]}, dedupe_key="sync:1")
+        self.assertEqual(database.enqueue_job('sync_creators', {'creator_ids': [1]}, dedupe_key="sync:1"), first)
+        self.assertNotEqual(database.enqueue_job('sync_creators', {'creator_ids': [1]}), first)
+
+        [job] = database.claim_jobs("w1", limit=1)
+        database.finish_job(job['id'], "w1", result={'synced': 1})
+        self.assertNotEqual(database.enqueue_job('sync_creators', {}, dedupe_key="sync:1"), first)
+
+    def test_claim_leases_and_filters_by_kind(self):
+        database.enqueue_job('remix', {'video_id': 1})
+        database.enqueue_job('sync_due')
+        [job] = database.claim_jobs("w1", kinds=['sync_due'], limit=5)
+        self.assertEqual((job['kind'], job['status'], job['attempts'], job['payload']), ('sync_due', 'running', 1, {}))
+        self.assertEqual(database.claim_jobs("w2", kinds=['sync_due']), [])
+
+        # A not-yet-due job isn't claimed
+        database.enqueue_job('sync_due', delay=60)
+        self.assertEqual(database.claim_jobs("w2", kinds=['sync_due']), [])
+
+    def test_lapsed_lease_is_reclaimed_then_dead_lettered(self):
+        job_id = database.enqueue_job('remix', {'video_id': 1}, max_attempts=2)
+        database.claim_jobs("w1", lease=60)
+        self.assertTrue(database.extend_job_lease(job_id, "w1", lease=60))
+
+        self.age(120)
+        [job] = database.claim_jobs("w2", lease=60)
+        self.assertEqual((job['id'], job['worker'], job['attempts']), (job_id, "w2", 2))
+        # w1 lost the lease: its late result is ignored
+        self.assertIsNone(database.finish_job(job_id, "w1", result={}))
+        self.assertFalse(database.extend_job_lease(job_id, "w1"))
+
+        self.age(120)
+        self.assertEqual(database.claim_jobs("w3"), [])
+        job = database.get_job(job_id)
+        self.assertEqual(job['status'], 'dead')
+        self.assertIn("lease expired", job['error'])
+
+    def test_retries_with_backoff_then_dead_letters(self):
+        job_id = database.enqueue_job('sync_due', max_attempts=2)
+        database.claim_jobs("w1")
+        self.assertEqual(database.finish_job(job_id, "w1", error="boom", backoff=30), 'queued')
+        self.assertEqual(database.claim_jobs("w1"), [])
+        self.assertAlmostEqual(database.get_job(job_id)['run_after'] - time.time(), 30, delta=5)
+
+        self.age(30)
+        database.claim_jobs("w1")
+        self.assertEqual(database.finish_job(job_id, "w1", error="boom again"), 'dead')
+        self.assertEqual(database.get_job_stats()['dead'], 1)
+
+        self.assertTrue(database.retry_job(job_id))
+        [job] = database.claim_jobs("w1")
+        self.assertEqual((job['attempts'], job['error']), (1, None))
+
+    def test_purge_keeps_unfinished_jobs(self):
+        done = database.enqueue_job('sync_due')
+        database.claim_jobs("w1")
+        database.finish_job(done, "w1", result={})
+        database.enqueue_job('remix', {'video_id': 1})
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE jobs SET updated_at = datetime('now', '-8 days')")
+        self.assertEqual(database.purge_jobs(7 * 86400), 1)
+        self.assertEqual(database.get_job_stats()['queued'], 1)
+
+
+class TestWorker(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator_id = database.add_creator('youtube', 'alice', 'https://youtube.com/@alice')
+
+    def worker(self, **kwargs):
+        kwargs.setdefault('youtube_scraper', FakeScraper(delay=0))
+        return Worker(worker_id="test", post_sync=False, backoff=0, **kwargs)
+
+    def test_sync_job(self):
+        job_id = database.enqueue_job('sync_creators', {'creator_ids': [self.creator_id]})
+        self.assertEqual(self.worker().run_once(), 1)
+        job = database.get_job(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual((job['result']['synced'], job['result']['counts']['inserted']), (1, 3))
+        self.assertEqual(len(database.get_videos_for_creator(self.creator_id)), 3)
+        self.assertEqual(self.worker().run_once(), 0)
+
+    def test_sync_progress_recorded_on_job(self):
+        bob = database.add_creator('youtube', 'bob', 'https://youtube.com/@bob')
+        scraper = FakeScraper(delay=0, fail_for={"https://youtube.com/@bob"})
+        job_id = database.enqueue_job('sync_creators', {'creator_ids': [self.creator_id, bob]})
+        self.worker(youtube_scraper=scraper).run_once()
+        job = database.get_job(job_id)
+        self.assertEqual((job['progress']['done'], job['progress']['total']), (2, 2))
+        self.assertEqual(job['result']['synced'], 1)
+        self.assertIn("bob", job['result']['failed'][0])
+        # Only the worker holding the lease can report progress
+        self.assertFalse(database.set_job_progress(job_id, "test", {'done': 0, 'total': 2}))
+
+    def test_failed_sync_is_retried(self):
+        scraper = FakeScraper(delay=0, fail_for={"https://youtube.com/@alice"})
+        job_id = database.enqueue_job('sync_creators', {'creator_ids': [self.creator_id]})
+        self.worker(youtube_scraper=scraper).run_once()
+        job = database.get_job(job_id)
+        self.assertEqual((job['status'], job['attempts']), ('queued', 1))
+        self.assertIn("failed https://youtube.com/@alice", job['error'])
+
+    def test_permanent_errors_dead_letter_immediately(self):
+        gone = database.enqueue_job('sync_creators', {'creator_ids': [999]})
+        unknown = database.enqueue_job('export')
+        worker = self.worker()
+        worker.kinds.append('export')
+        while worker.run_once():
+            pass
+        self.assertEqual(database.get_job(gone)['status'], 'dead')
+        self.assertEqual(database.get_job(unknown)['error'], "Unknown job kind: export")
+
+    def test_transcribe_and_remix(self):
+        database.upsert_videos(self.creator_id, [
+            {'id': 'v1', 'url': "https://youtu.be/v1"}, {'id': 'v2', 'url': "https://youtu.be/v2"}
+        ])
+        videos = {v['platform_video_id']: v['id'] for v in database.get_videos_for_creator(self.creator_id)}
+        worker = self.worker(
+            youtube_scraper=FakeTranscripts({"https://youtu.be/v1": "hello world",
+                                             "https://youtu.be/v2": "Transcripts are disabled for this video"}),
+            remixer=FakeRemixer()
+        )
+
+        job_id = database.enqueue_job('transcribe', {'video_ids': list(videos.values())})
+        worker.run_once()
+        job = database.get_job(job_id)
+        self.assertEqual((job['status'], job['result']['transcribed']), ('done', 1))
+        self.assertEqual(len(job['result']['unavailable']), 1)
+        self.assertEqual(database.get_video_by_id(videos['v1'])['transcript'], "hello world")
+
+        remix = database.enqueue_job('remix', {'video_id': videos['v1']})
+        no_transcript = database.enqueue_job('remix', {'video_id': videos['v2']})
+        worker.run_once()
+        worker.run_once()
+        [saved] = database.get_remixes_for_video(videos['v1'])
+        self.assertEqual(database.get_job(remix)['result'], {'remix_id': saved['id']})
+        self.assertEqual(saved['remixed_content'], "remixed: hello world")
+        self.assertEqual(database.get_job(no_transcript)['status'], 'dead')
+
+    def test_reel_transcripts_saved_as_they_complete(self):
+        class CrashingTranscriber:
+            def transcribe_batch(self, jobs, on_complete=None):
+                first, *_ = jobs
+                on_complete(first, "first reel")
+                raise RuntimeError("poller died")
+
+        reels = database.add_creator('instagram', 'bob', 'https://instagram.com/bob')
+        database.upsert_videos(reels, [{'id': f"r{i}", 'url': f"https://instagram.com/reel/r{i}/"}
+                                       for i in range(2)])
+        video_ids = sorted(v['id'] for v in database.get_videos_for_creator(reels))
+        job_id = database.enqueue_job('transcribe', {'video_ids': video_ids})
+        self.worker(transcriber=CrashingTranscriber()).run_once()
+
+        self.assertEqual(database.get_job(job_id)['status'], 'queued')
+        self.assertEqual(database.get_video_by_id(video_ids[0])['transcript'], "first reel")
+        self.assertIsNone(database.get_video_by_id(video_ids[1])['transcript'])
+
+    def test_maintenance_rescores_creators_without_baselines(self):
+        database.upsert_videos(self.creator_id, [{'id': 'v1', 'view_count': 10}, {'id': 'v2', 'view_count': 30}])
+        with database.transaction(write=True) as conn:
+            conn.execute("DELETE FROM creator_baselines")
+        report = self.worker().maintain()
+        self.assertEqual((report['rescored'], report['metrics_compacted']), (2, 0))
+        self.assertEqual(self.worker().maintain()['rescored'], 0)
+
+    def test_heartbeat_keeps_long_jobs_leased(self):
+        started = threading.Event()
+
+        class SlowRemixer:
+            def remix_content(self, transcript):
+                started.set()
+                time.sleep(1.5)
+                return "done"
+
+        database.upsert_videos(self.creator_id, [{'id': 'v1'}])
+        video_id = database.get_videos_for_creator(self.creator_id)[0]['id']
+        database.save_transcript(video_id, "hello")
+        job_id = database.enqueue_job('remix', {'video_id': video_id})
+        worker = self.worker(remixer=SlowRemixer(), lease=1)
+        thread = threading.Thread(target=worker.run_once)
+        thread.start()
+        started.wait(5)
+        time.sleep(1.1)
+        # Past the original one-second lease, but renewed by the heartbeat
+        self.assertEqual(database.claim_jobs("other"), [])
+        thread.join()
+        self.assertEqual(database.get_job(job_id)['status'], 'done')
+
+
+if __name__ == '__main__':
+    unittest.main()
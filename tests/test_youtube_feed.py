@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+
+import database
+from channel_cache import ChannelCache
+from scraper import YouTubeScraper, parse_upload_feed
+from sync_engine import fetch_youtube_videos
+from test_database import DatabaseTestCase
+from youtube_feed_stub import RECORDED_FEED, FeedStub
+
+CHANNEL_ID = "UCtestchannel000000000000"
+NEW_UPLOAD = b"""
+ <entry>
+  <id>yt:video:vid00000004</id>
+  <yt:videoId>vid00000004</yt:videoId>
+  <title>Brand New</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=vid00000004"/>
+  <published>2026-10-17T15:00:00+00:00</published>
+ </entry>
+ <entry>"""
+
+
+class TestParseUploadFeed(unittest.TestCase):
+    def test_recorded_feed(self):
+        feed = parse_upload_feed(RECORDED_FEED.read_bytes())
+        self.assertEqual(feed['channel_id'], CHANNEL_ID)
+        self.assertEqual([v['id'] for v in feed['videos']], ['vid00000003', 'vid00000002', 'vid00000001'])
+        first = feed['videos'][0]
+        self.assertEqual(first['title'], "How I Automated My Whole Agency")
+        self.assertEqual(first['url'], "https://www.youtube.com/watch?v=vid00000003")
+        self.assertEqual(first['view_count'], 48213)
+        self.assertEqual(first['published'], "2026-10-14T15:00:06+00:00")
+        self.assertEqual(first['thumbnail'], "https://i2.ytimg.com/vi/vid00000003/hqdefault.jpg")
+
+    def test_entry_without_statistics(self):
+        xml = RECORDED_FEED.read_bytes().replace(b"\n <entry>", NEW_UPLOAD, 1)
+        video = parse_upload_feed(xml)['videos'][0]
+        self.assertEqual((video['id'], video['view_count'], video['thumbnail']), ('vid00000004', None, None))
+
+    def test_rejects_other_documents(self):
+        with self.assertRaises(ValueError):
+            parse_upload_feed(b"<html><body>Consent required</body></html>")
+        with self.assertRaises(ValueError):
+            parse_upload_feed(b"<feed")
+
+    def test_channel_id_from_url(self):
+        self.assertEqual(YouTubeScraper.channel_id_from_url(f"https://www.youtube.com/channel/{CHANNEL_ID}/videos"),
+                         CHANNEL_ID)
+        self.assertIsNone(YouTubeScraper.channel_id_from_url("https://www.youtube.com/@handle"))
+
+
+class TestCheckFeed(unittest.TestCase):
+    def test_conditional_requests(self):
+        scraper = YouTubeScraper()
+        with FeedStub() as stub:
+            scraper.FEED_URL = stub.feed_url
+            first = scraper.check_feed(CHANNEL_ID)
+            second = scraper.check_feed(CHANNEL_ID, first['etag'], first['last_modified'])
+
+        self.assertTrue(first['modified'])
+        self.assertEqual(len(first['feed']['videos']), 3)
+        self.assertEqual(second, {'modified': False, 'etag': first['etag'],
+                                  'last_modified': FeedStub.LAST_MODIFIED, 'feed': None})
+        self.assertEqual(stub.requests[0][0], {'channel_id': [CHANNEL_ID]})
+        self.assertEqual(stub.requests[1][1:], (first['etag'], FeedStub.LAST_MODIFIED))
+
+
+class TestFeedPrecheck(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.creator_id = database.add_creator('youtube', 'test', 'https://www.youtube.com/@test')
+        self.creator = database.get_creator_by_id(self.creator_id)
+        database.upsert_videos(self.creator_id, [
+            {'id': f"vid0000000{i}", 'view_count': 100 * i, 'outlier_score': 1.0} for i in (1, 2, 3)
+        ])
+        database.update_youtube_feed(self.creator_id, channel_id=CHANNEL_ID, refreshed=True)
+        self.scraper = YouTubeScraper()
+
+    def fetch(self, stub, **kwargs):
+        self.scraper.FEED_URL = stub.feed_url
+        with patch.object(self.scraper, 'get_channel_videos', return_value=[]) as extract:
+            videos = fetch_youtube_videos(self.scraper, self.creator, **kwargs)
+        return videos, extract
+
+    def test_unchanged_feed_skips_yt_dlp(self):
+        with FeedStub() as stub:
+            first, extract_first = self.fetch(stub)
+            second, extract_second = self.fetch(stub)
+
+        self.assertEqual((first, second), ([], []))
+        extract_first.assert_not_called()
+        extract_second.assert_not_called()
+        # The second check is conditional and comes back 304
+        self.assertEqual(stub.requests[1][1], stub.etag)
+        self.assertEqual(database.get_youtube_feed(self.creator_id, 3600)['etag'], stub.etag)
+
+    def test_new_upload_runs_incremental_extraction(self):
+        with FeedStub() as stub:
+            self.fetch(stub)
+            stub.set_feed(RECORDED_FEED.read_bytes().replace(b"\n <entry>", NEW_UPLOAD, 1))
+            _, extract = self.fetch(stub)
+
+        extract.assert_called_once()
+        self.assertEqual(set(extract.call_args.kwargs['known_ids']),
+                         {'vid00000001', 'vid00000002', 'vid00000003'})
+
+    def test_refresh_due_runs_extraction(self):
+        with database.transaction(write=True) as conn:
+            conn.execute("UPDATE youtube_feeds SET refreshed_at = datetime('now', '-7 hours')")
+        with FeedStub() as stub:
+            _, extract = self.fetch(stub, refresh_interval=6 * 3600)
+        extract.assert_called_once()
+        self.assertEqual(stub.requests, [])
+        self.assertFalse(database.get_youtube_feed(self.creator_id, 6 * 3600)['refresh_due'])
+
+    def test_feed_errors_fall_back_to_yt_dlp(self):
+        with FeedStub(status=500) as stub:
+            _, extract = self.fetch(stub)
+        extract.assert_called_once()
+
+    def test_first_sync_records_channel_id(self):
+        creator_id = database.add_creator('youtube', 'fresh', 'https://www.youtube.com/@fresh')
+        videos = [{'id': 'x1', 'view_count': 10, 'channel_id': "UCfresh"}]
+        with patch.object(self.scraper, 'get_channel_videos', return_value=videos) as extract:
+            fetch_youtube_videos(self.scraper, database.get_creator_by_id(creator_id))
+        extract.assert_called_once_with('https://www.youtube.com/@fresh', limit=30)
+        self.assertEqual(database.get_youtube_feed(creator_id, 3600)['channel_id'], "UCfresh")
+
+    def test_channel_url_added_from_ui_keeps_its_id(self):
+        platform, username, url = database.parse_creator_url(f" https://www.YouTube.com/channel/{CHANNEL_ID} ")
+        creator = database.get_creator_by_id(database.add_creator(platform, username, url))
+        scraper = YouTubeScraper(channel_cache=ChannelCache())
+        videos = [{'id': f"vid0000000{i}", 'view_count': 10, 'channel_id': CHANNEL_ID} for i in (1, 2, 3)]
+        with patch.object(scraper, 'get_channel_videos', return_value=videos):
+            fetch_youtube_videos(scraper, creator)
+        database.upsert_videos(creator['id'], videos)
+        with FeedStub() as stub:
+            scraper.FEED_URL = stub.feed_url
+            with patch.object(scraper, 'get_channel_videos', return_value=[]) as extract:
+                fetch_youtube_videos(scraper, creator)
+
+        extract.assert_not_called()
+        self.assertEqual(stub.requests[0][0], {'channel_id': [CHANNEL_ID]})
+
+    def test_listing_replaces_case_folded_channel_id(self):
+        url = f"https://www.youtube.com/channel/{CHANNEL_ID.lower()}"
+        self.assertIsNone(ChannelCache().get(url))
+        creator = database.get_creator_by_id(database.add_creator('youtube', CHANNEL_ID, url))
+        database.update_youtube_feed(creator['id'], channel_id=CHANNEL_ID.lower(), refreshed=True)
+        videos = [{'id': 'x1', 'view_count': 10, 'channel_id': CHANNEL_ID}]
+        with patch.object(self.scraper, 'get_channel_videos', return_value=videos):
+            fetch_youtube_videos(self.scraper, creator)
+        self.assertEqual(database.get_youtube_feed(creator['id'], 3600)['channel_id'], CHANNEL_ID)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Local stand-in for YouTube's channel upload feed (feeds/videos.xml). Serves
+a recorded feed with ETag/Last-Modified validators and answers matching
+conditional requests with 304, like the real endpoint:
+
+    with FeedStub(xml) as stub:
+        scraper.FEED_URL = stub.feed_url
+"""
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+RECORDED_FEED = Path(__file__).parent / "fixtures" / "youtube_feed.xml"
+
+
+class FeedStub:
+    LAST_MODIFIED = "Fri, 16 Oct 2026 09:12:40 GMT"
+
+    def __init__(self, xml: bytes = None, status: int = 200):
+        self.status = status
+        self.requests = []  # (query, If-None-Match, If-Modified-Since) in arrival order
+        self.set_feed(xml if xml is not None else RECORDED_FEED.read_bytes())
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def set_feed(self, xml: bytes):
+        """Publish a new feed version (new validators)."""
+        self.xml = xml
+        self.etag = f'"{zlib.crc32(xml):08x}"'
+
+    @property
+    def feed_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/feeds/videos.xml"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                etag = self.headers.get("If-None-Match")
+                stub.requests.append((parse_qs(url.query), etag, self.headers.get("If-Modified-Since")))
+
+                if stub.status != 200:
+                    self.send_response(stub.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if etag == stub.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml; charset=UTF-8")
+                self.send_header("ETag", stub.etag)
+                self.send_header("Last-Modified", stub.LAST_MODIFIED)
+                self.send_header("Content-Length", str(len(stub.xml)))
+                self.end_headers()
+                self.wfile.write(stub.xml)
+
+        return Handler